@@ -0,0 +1,51 @@
+"""add Contact.similarity, Contact.distance
+
+Revision ID: 5c1e7a93d2f4
+Revises: bdd19ec56eb8
+Create Date: 2026-10-19 10:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.crud.sql import refresh_contacts_similarity_and_distance
+
+revision: str = '5c1e7a93d2f4'
+down_revision: Union[str, Sequence[str], None] = 'bdd19ec56eb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'contacts',
+        sa.Column(
+            'similarity', sa.Float(), server_default='0', nullable=False
+        ),
+    )
+    op.add_column('contacts', sa.Column('distance', sa.Float(), nullable=True))
+    # backfill, reads come from these columns; moral_profiles and
+    # compare_moral_profiles are created outside migrations (prepare.py)
+    connection = op.get_bind()
+    if connection.scalar(
+        sa.text(
+            "SELECT to_regclass('public.moral_profiles') IS NOT NULL "
+            'AND EXISTS (SELECT FROM pg_proc '
+            "WHERE proname = 'compare_moral_profiles')"
+        )
+    ):
+        connection.execute(
+            refresh_contacts_similarity_and_distance.bindparams(
+                sa.bindparam('user_id', value=None, type_=sa.UUID)
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contacts', 'distance')
+    op.drop_column('contacts', 'similarity')
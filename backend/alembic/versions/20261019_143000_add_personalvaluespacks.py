@@ -0,0 +1,90 @@
+"""add PersonalValuesPack
+
+Revision ID: 9a4f0c6e2b71
+Revises: 5c1e7a93d2f4
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = '9a4f0c6e2b71'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a93d2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'personalvaluespacks',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('attitude_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'value_ids', postgresql.ARRAY(sa.SmallInteger()), nullable=False
+        ),
+        sa.Column(
+            'unique_value_ids', postgresql.ARRAY(sa.Integer()), nullable=False
+        ),
+        sa.Column('positive_count', sa.SmallInteger(), nullable=False),
+        sa.Column('neutral_count', sa.SmallInteger(), nullable=False),
+        sa.Column('aspect_mask', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ['attitude_id'], ['attitudes.id'], ondelete='CASCADE'
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    # aspect bits follow aspect id order, as in crud.read_cached_definitions
+    op.execute("""
+WITH aspect_bits AS (
+    SELECT id, (row_number() OVER (ORDER BY id) - 1)::int AS bit
+    FROM aspects
+)
+INSERT INTO personalvaluespacks (
+    user_id, attitude_id, value_ids, unique_value_ids,
+    positive_count, neutral_count, aspect_mask
+)
+SELECT
+    pv.user_id,
+    p.attitude_id,
+    array_agg(pv.value_id ORDER BY pv.user_order)::smallint[],
+    array_agg(pv.unique_value_id ORDER BY pv.user_order),
+    count(*) FILTER (WHERE pv.polarity = 'positive'),
+    count(*) FILTER (WHERE pv.polarity = 'neutral'),
+    COALESCE(
+        (
+            SELECT bit_or(1::bigint << ab.bit)
+            FROM personalaspects pa
+            JOIN aspect_bits ab ON ab.id = pa.aspect_id
+            WHERE pa.user_id = pv.user_id AND pa.included
+        ),
+        0
+    )
+FROM personalvalues pv
+JOIN profiles p ON p.user_id = pv.user_id
+WHERE p.attitude_id IS NOT NULL
+GROUP BY pv.user_id, p.attitude_id;
+""")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('personalvaluespacks')
@@ -0,0 +1,35 @@
+"""index RefreshToken.token_hash
+
+Revision ID: 3e8d51b7c0a9
+Revises: 9a4f0c6e2b71
+Create Date: 2026-10-19 17:00:00.000000
+
+Existing Argon2 hashes stay as they are: they are verified by jti
+on their next use and replaced with HMAC-SHA256 ones then.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '3e8d51b7c0a9'
+down_revision: Union[str, Sequence[str], None] = '9a4f0c6e2b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f('ix_refreshtokens_token_hash'),
+        'refreshtokens',
+        ['token_hash'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_refreshtokens_token_hash'), table_name='refreshtokens'
+    )
@@ -0,0 +1,117 @@
+import json
+import os
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPORTS_DIR = Path(__file__).parent / 'reports'
+
+
+def git_revision() -> dict:
+    """
+    Commit the benchmark ran at, dirty if the tree had changes.
+    GIT_SHA and GIT_DIRTY env vars, if set, are used instead of git:
+    the container has no .git (see make bench).
+    """
+    if os.environ.get('GIT_SHA'):
+        return {
+            'sha': os.environ['GIT_SHA'],
+            'dirty': os.environ.get('GIT_DIRTY') == '1',
+        }
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ('git', *args), capture_output=True, text=True, check=False
+        ).stdout.strip()
+
+    return {
+        'sha': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def summarize(durations_ms: list[float]) -> dict:
+    ordered = sorted(durations_ms)
+    last = len(ordered) - 1
+    return {
+        'runs': len(ordered),
+        'min_ms': round(ordered[0], 3),
+        'median_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[min(last, len(ordered) * 95 // 100)], 3),
+        'p99_ms': round(ordered[min(last, len(ordered) * 99 // 100)], 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def new_report(*, benchmark: str, parameters: dict) -> dict:
+    return {
+        'benchmark': benchmark,
+        'git': git_revision(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'parameters': parameters,
+        'environment': {},
+        'dataset': {},
+        'results': {},
+        'details': {},
+    }
+
+
+def write_report(report: dict, path: Path | None = None) -> Path:
+    """
+    Writes report to path or to reports/<benchmark>-<sha>.json.
+    Without sha, named by creation time not to overwrite another report.
+    """
+    if path is None:
+        sha = report['git']['sha'][:12] or (
+            'unknown-' + report['created_at'][:19].replace(':', '')
+        )
+        suffix = '-dirty' if report['git']['dirty'] else ''
+        path = REPORTS_DIR / f'{report["benchmark"]}-{sha}{suffix}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, default=str))
+    return path
+
+
+def load_report(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def compare_reports(
+    *, baseline: dict, current: dict, threshold: float
+) -> list[str]:
+    """
+    Prints median changes of results present in both reports.
+    Returns names of results slower than baseline by more than threshold
+    (share, 0.2 == 20%).
+    """
+    if baseline['dataset'] != current['dataset']:
+        print(
+            'Warning: datasets differ, timings are not comparable.\n'
+            f'  baseline: {baseline["dataset"]}\n'
+            f'  current:  {current["dataset"]}'
+        )
+    print(
+        f'{"result":<45}{"baseline":>12}{"current":>12}{"change":>10}'
+        f'  ({baseline["git"]["sha"][:12]} -> {current["git"]["sha"][:12]})'
+    )
+    regressions = []
+    for name, result in current['results'].items():
+        baseline_result = baseline['results'].get(name)
+        if baseline_result is None:
+            print(f'{name:<45}{"-":>12}{result["median_ms"]:>12.2f}')
+            continue
+        change = (
+            result['median_ms'] / baseline_result['median_ms'] - 1
+            if baseline_result['median_ms']
+            else 0
+        )
+        mark = ''
+        if change > threshold:
+            regressions.append(name)
+            mark = '  REGRESSION'
+        print(
+            f'{name:<45}{baseline_result["median_ms"]:>12.2f}'
+            f'{result["median_ms"]:>12.2f}{change:>+10.1%}{mark}'
+        )
+    return regressions
@@ -0,0 +1,385 @@
+"""
+Chat load test: opens authenticated /ws connections to an in-process app
+(uvicorn in this event loop), pairs users as ongoing contacts and drives
+CREATE_MSG traffic within pairs. Reports acknowledgement and delivery
+latency, throughput, process memory per connection and ChatManager lock
+waits.
+
+    python -m benchmarks.chat_load run --connections 2000 --duration 60
+
+Needs Postgres prepared with basic data. Redis is a spawned redis-server
+(must be on PATH) unless --redis-port is given. Keep --interval at or above
+CHAT.RATE_PERIOD_SECONDS / CHAT.RATE_NUMBER, or senders get disconnected.
+src is imported inside functions: config reads Redis location from env
+on import, after --redis-port is resolved.
+"""
+
+import asyncio
+import json
+import os
+import random
+import resource
+import shutil
+import socket
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import typer
+import uvicorn
+from sqlalchemy import func, select
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from benchmarks import _report
+
+BENCHMARK = 'chat_load'
+EMAIL_PREFIX = 'chatload'
+
+app = typer.Typer()
+
+
+# keeps run a subcommand: typer makes a single command the root one
+@app.callback()
+def main():
+    """Chat load benchmark."""
+
+
+@dataclass
+class Traffic:
+    """
+    Shared client-side bookkeeping.
+    sent_at: by client_id (ack) and by message text (delivery).
+    """
+
+    stop_at: float = float('inf')
+    sent_at: dict[str, float] = field(default_factory=dict)
+    ack_ms: list[float] = field(default_factory=list)
+    delivery_ms: list[float] = field(default_factory=list)
+    sent: int = 0
+    errors: int = 0
+    disconnects: int = 0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (Linux), falls back to peak RSS."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _spawn_redis(port: int) -> subprocess.Popen:
+    if shutil.which('redis-server') is None:
+        raise typer.BadParameter(
+            'redis-server not found, pass --redis-port of a running Redis.'
+        )
+    process = subprocess.Popen(
+        (
+            'redis-server',
+            '--port',
+            str(port),
+            '--save',
+            '',
+            '--appendonly',
+            'no',
+        ),
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(50):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('redis-server did not start.')
+
+
+async def _prepare_pairs(connections: int) -> list[tuple[UUID, UUID]]:
+    """Adds synthetic users and makes consecutive ones ongoing contacts."""
+    from src import containers as cnt
+    from src import crud, db
+    from src.config import ENM
+    from src.services import _population as population_srv
+    from src.sessions import asession_factory
+
+    async with asession_factory() as asession:
+        first_index = await asession.scalar(
+            select(func.count()).select_from(db.User)
+        )
+    population_config = cnt.PopulationConfig(
+        users=connections - connections % 2,
+        first_index=first_index,
+        email_prefix=EMAIL_PREFIX,
+    )
+    await population_srv.populate_db(config=population_config)
+    emails = [
+        f'{EMAIL_PREFIX}{i}@{population_config.email_domain}'
+        for i in range(first_index, first_index + population_config.users)
+    ]
+    async with asession_factory() as asession:
+        results = await asession.execute(
+            select(db.User.email, db.User.id).where(db.User.email.in_(emails))
+        )
+        user_ids = dict(results.tuples().all())
+        pairs = []
+        for my_email, other_email in zip(emails[::2], emails[1::2]):
+            pair = (user_ids[my_email], user_ids[other_email])
+            await crud.create_contact_pair(
+                my_user_id=pair[0],
+                other_user_id=pair[1],
+                my_contact_status=ENM.ContactStatus.ONGOING.value,
+                other_user_contact_status=ENM.ContactStatus.ONGOING.value,
+                similarity=0,
+                distance=None,
+                asession=asession,
+            )
+            pairs.append(pair)
+        await asession.commit()
+    return pairs
+
+
+async def _client(
+    *,
+    url: str,
+    user_id: UUID,
+    partner_id: UUID,
+    interval: float,
+    traffic: Traffic,
+    connected: asyncio.Event,
+    start: asyncio.Event,
+) -> None:
+    from src.config import ENM
+    from src.services.utils import create_access_token
+
+    token = create_access_token(user_id, is_active=True, is_verified=True)
+    try:
+        websocket = await connect(f'{url}?token={token}', max_size=None)
+    except Exception:
+        traffic.disconnects += 1
+        connected.set()
+        return
+    connected.set()
+
+    async def receive():
+        async for raw in websocket:
+            received_at = time.perf_counter()
+            payload = json.loads(raw)
+            content = payload.get('related_content') or {}
+            match payload.get('payload_type'):
+                case ENM.ChatPayloadType.NEW_MSG:
+                    sent_at = traffic.sent_at.pop(content['text'], None)
+                    if sent_at is not None:
+                        traffic.delivery_ms.append(
+                            (received_at - sent_at) * 1000
+                        )
+                case ENM.ChatPayloadType.MSG_SENT:
+                    sent_at = traffic.sent_at.pop(content['client_id'], None)
+                    if sent_at is not None:
+                        traffic.ack_ms.append((received_at - sent_at) * 1000)
+                case ENM.ChatPayloadType.MSG_ERROR:
+                    traffic.errors += 1
+
+    receive_task = asyncio.create_task(receive())
+    await start.wait()
+    # spread senders over the interval
+    await asyncio.sleep(random.uniform(0, interval))
+    try:
+        while time.perf_counter() < traffic.stop_at:
+            client_id = str(uuid4())
+            text = f'{client_id}:{user_id}'
+            now = time.perf_counter()
+            traffic.sent_at[client_id] = now
+            traffic.sent_at[text] = now
+            await websocket.send(
+                json.dumps(
+                    {
+                        'payload_type': ENM.ChatPayloadType.CREATE_MSG,
+                        'related_content': {
+                            'receiver_id': str(partner_id),
+                            'text': text,
+                            'client_id': client_id,
+                        },
+                    }
+                )
+            )
+            traffic.sent += 1
+            await asyncio.sleep(interval)
+        # wait for the last deliveries
+        await asyncio.sleep(min(interval, 5))
+    except ConnectionClosed:
+        traffic.disconnects += 1
+    finally:
+        receive_task.cancel()
+        await websocket.close()
+
+
+async def _run(
+    *, connections: int, duration: float, interval: float, connect_rate: int
+) -> dict:
+    from src import containers as cnt
+    from src.config import CFG
+    from src.main import app as fastapi_app
+    from src.services.chat import chat_manager
+
+    pairs = await _prepare_pairs(connections)
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            fastapi_app,
+            host='127.0.0.1',
+            port=port,
+            log_level='warning',
+            ws='websockets',
+        )
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    url = f'ws://127.0.0.1:{port}{CFG.PATHS.PRIVATE.CHAT}'
+
+    traffic = Traffic()
+    start = asyncio.Event()
+    rss_before = _rss_bytes()
+    connect_started = time.perf_counter()
+    client_tasks = []
+    for my_user_id, other_user_id in pairs:
+        for user_id, partner_id in (
+            (my_user_id, other_user_id),
+            (other_user_id, my_user_id),
+        ):
+            connected = asyncio.Event()
+            client_tasks.append(
+                asyncio.create_task(
+                    _client(
+                        url=url,
+                        user_id=user_id,
+                        partner_id=partner_id,
+                        interval=interval,
+                        traffic=traffic,
+                        connected=connected,
+                        start=start,
+                    )
+                )
+            )
+            await connected.wait()
+            if connect_rate:
+                await asyncio.sleep(1 / connect_rate)
+    connect_seconds = time.perf_counter() - connect_started
+    open_connections = len(chat_manager.connections)
+    rss_connected = _rss_bytes()
+    connect_lock_stats = asdict(chat_manager._lock.wait_stats)
+    chat_manager._lock.wait_stats = cnt.LockWaitStats()
+
+    traffic.stop_at = time.perf_counter() + duration
+    start.set()
+    await asyncio.gather(*client_tasks, return_exceptions=True)
+    traffic_lock_stats = asdict(chat_manager._lock.wait_stats)
+
+    server.should_exit = True
+    await server_task
+
+    report = _report.new_report(
+        benchmark=BENCHMARK,
+        parameters={
+            'connections': len(client_tasks),
+            'duration': duration,
+            'interval': interval,
+            'connect_rate': connect_rate,
+            'max_connections': CFG.CHAT.MAX_CONNECTIONS,
+        },
+    )
+    report['dataset'] = {'connections': len(client_tasks)}
+    if traffic.ack_ms:
+        report['results']['chat.ack'] = _report.summarize(traffic.ack_ms)
+    if traffic.delivery_ms:
+        report['results']['chat.delivery'] = _report.summarize(
+            traffic.delivery_ms
+        )
+    report['details'] = {
+        'open_connections': open_connections,
+        'connect_seconds': round(connect_seconds, 3),
+        'memory_per_connection_bytes': (
+            (rss_connected - rss_before) // max(open_connections, 1)
+        ),
+        'sent': traffic.sent,
+        'delivered': len(traffic.delivery_ms),
+        'throughput_msg_per_second': round(
+            len(traffic.delivery_ms) / duration, 1
+        ),
+        'errors': traffic.errors,
+        'disconnects': traffic.disconnects,
+        'lock_wait': {
+            'connect': connect_lock_stats,
+            'traffic': traffic_lock_stats,
+        },
+    }
+    return report
+
+
+@app.command()
+def run(
+    connections: int = typer.Option(1000, help='Client connections.'),
+    duration: float = typer.Option(30, help='Traffic seconds.'),
+    interval: float = typer.Option(
+        1.0, help='Seconds between messages of one client.'
+    ),
+    connect_rate: int = typer.Option(
+        500, help='New connections per second, 0 - unlimited.'
+    ),
+    redis_port: int | None = typer.Option(
+        None, help='Running Redis port, default - spawn redis-server.'
+    ),
+    output: Path | None = typer.Option(
+        None, help='Report path, default reports/<benchmark>-<sha>.json.'
+    ),
+    compare: Path | None = typer.Option(
+        None, help='Baseline report to compare with.'
+    ),
+    threshold: float = typer.Option(0.2, help='Allowed median slowdown.'),
+):
+    """Runs chat load test and writes report."""
+    redis_process = None
+    if redis_port is None:
+        redis_port = _free_port()
+        redis_process = _spawn_redis(redis_port)
+    os.environ['REDIS_HOST'] = '127.0.0.1'
+    os.environ['REDIS_PORT'] = str(redis_port)
+    try:
+        report = asyncio.run(
+            _run(
+                connections=connections,
+                duration=duration,
+                interval=interval,
+                connect_rate=connect_rate,
+            )
+        )
+    finally:
+        if redis_process is not None:
+            redis_process.terminate()
+            redis_process.wait()
+    path = _report.write_report(report, output)
+    print(json.dumps(report['details'], indent=2))
+    print(f'Report written to {path}')
+    if compare is not None:
+        regressions = _report.compare_reports(
+            baseline=_report.load_report(compare),
+            current=report,
+            threshold=threshold,
+        )
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == '__main__':
+    app()
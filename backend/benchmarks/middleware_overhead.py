@@ -0,0 +1,217 @@
+"""
+Per-request cost of the middleware stack: calls a FastAPI app directly
+over ASGI (no server, no client) with a trivial endpoint and with one
+raising a mapped exception, for each stack:
+
+    bare       - no middleware, error mapped by an exception handler
+    base_http  - the former BaseHTTPMiddleware implementations
+    asgi       - src.middleware (pure ASGI)
+
+    python -m benchmarks.middleware_overhead run --requests 20000
+
+Overhead of a stack is its median minus the bare median, in details.
+No database or Redis needed.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import typer
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from benchmarks import _report
+from src import exceptions as exc
+from src import middleware as mdw
+from src.config import CFG
+from src.context import set_current_language
+
+BENCHMARK = 'middleware_overhead'
+ROUTES = {'ok': '/ok', 'not_found': '/not-found'}
+
+app = typer.Typer()
+
+
+# keeps run a subcommand: typer makes a single command the root one
+@app.callback()
+def main():
+    """Middleware overhead benchmark."""
+
+
+class BaseHTTPExceptionsMiddleware(BaseHTTPMiddleware):
+    """Baseline, as ExceptionsMiddleware was (without INFO logging)."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        try:
+            return await call_next(request)
+        except exc.NotFound as e:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={'detail': exc.get_error_msg(e)},
+            )
+        except Exception:
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={'detail': 'Something went wrong.'},
+            )
+
+
+class BaseHTTPLanguageMiddleware(BaseHTTPMiddleware):
+    """Baseline, as LanguageMiddleware was (without INFO logging)."""
+
+    async def dispatch(self, request: Request, call_next):
+        accept_language_header = request.headers.get('accept-language')
+        language = CFG.DEFAULT_LANGUAGE
+        if accept_language_header:
+            lan_code = accept_language_header.split(',')[0][:2].lower()
+            if lan_code in CFG.SUPPORTED_LANGUAGES:
+                language = lan_code
+        set_current_language(language)
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    fastapi_app = FastAPI()
+
+    @fastapi_app.get(ROUTES['ok'])
+    async def ok():
+        return {'detail': 'ok'}
+
+    @fastapi_app.get(ROUTES['not_found'])
+    async def not_found():
+        raise exc.NotFound()
+
+    match stack:
+        case 'bare':
+
+            async def not_found_handler(request: Request, e: exc.NotFound):
+                return JSONResponse(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    content={'detail': exc.get_error_msg(e)},
+                )
+
+            fastapi_app.add_exception_handler(exc.NotFound, not_found_handler)
+        case 'base_http':
+            fastapi_app.add_middleware(BaseHTTPLanguageMiddleware)
+            fastapi_app.add_middleware(BaseHTTPExceptionsMiddleware)
+        case 'asgi':
+            fastapi_app.add_middleware(mdw.LanguageMiddleware)
+            fastapi_app.add_middleware(mdw.ExceptionsMiddleware)
+    return fastapi_app
+
+
+async def _request(fastapi_app: FastAPI, path: str) -> int:
+    """One GET over ASGI, returns response status."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'accept-language', b'en-US,en;q=0.9')],
+        'client': ('127.0.0.1', 50000),
+        'server': ('127.0.0.1', 80),
+    }
+    request_sent = False
+    response_status = 0
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # client stays connected, as a server would report
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal response_status
+        if message['type'] == 'http.response.start':
+            response_status = message['status']
+
+    await fastapi_app(scope, receive, send)
+    return response_status
+
+
+async def time_stack(
+    *, stack: str, requests: int, warmup: int
+) -> dict[str, list[float]]:
+    fastapi_app = build_app(stack)
+    # lifespan is not run, FastAPI builds the middleware stack lazily
+    durations = {}
+    for name, path in ROUTES.items():
+        for _ in range(warmup):
+            await _request(fastapi_app, path)
+        durations[name] = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response_status = await _request(fastapi_app, path)
+            durations[name].append((time.perf_counter() - start) * 1000)
+        expected = 200 if name == 'ok' else 404
+        if response_status != expected:
+            raise RuntimeError(f'{stack} {path}: {response_status}.')
+    return durations
+
+
+async def _run(*, requests: int, warmup: int) -> dict:
+    report = _report.new_report(
+        benchmark=BENCHMARK,
+        parameters={'requests': requests, 'warmup': warmup},
+    )
+    report['dataset'] = {'routes': list(ROUTES)}
+    for stack in ('bare', 'base_http', 'asgi'):
+        durations = await time_stack(
+            stack=stack, requests=requests, warmup=warmup
+        )
+        for name, stack_durations in durations.items():
+            report['results'][f'{stack}.{name}'] = _report.summarize(
+                stack_durations
+            )
+    for stack in ('base_http', 'asgi'):
+        for name in ROUTES:
+            report['details'][f'overhead_us.{stack}.{name}'] = round(
+                (
+                    report['results'][f'{stack}.{name}']['median_ms']
+                    - report['results'][f'bare.{name}']['median_ms']
+                )
+                * 1000,
+                1,
+            )
+    return report
+
+
+@app.command()
+def run(
+    requests: int = typer.Option(20_000, help='Requests per stack and route.'),
+    warmup: int = typer.Option(1_000, help='Untimed requests before.'),
+    output: Path | None = typer.Option(
+        None, help='Report path, default reports/<benchmark>-<sha>.json.'
+    ),
+    compare: Path | None = typer.Option(
+        None, help='Baseline report to compare with.'
+    ),
+    threshold: float = typer.Option(0.2, help='Allowed median slowdown.'),
+):
+    """Measures middleware stacks and writes report."""
+    report = asyncio.run(_run(requests=requests, warmup=warmup))
+    path = _report.write_report(report, output)
+    for name, overhead in report['details'].items():
+        print(f'{name:<40}{overhead:>10.1f}')
+    print(f'Report written to {path}')
+    if compare is not None:
+        regressions = _report.compare_reports(
+            baseline=_report.load_report(compare),
+            current=report,
+            threshold=threshold,
+        )
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == '__main__':
+    app()
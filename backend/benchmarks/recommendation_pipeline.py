@@ -0,0 +1,282 @@
+"""
+Times refresh_materialized_views stages and the recommendation/contact
+reads on a local Postgres, writes a JSON report tagged with the git commit.
+
+    python -m benchmarks.recommendation_pipeline run --seed-users 100000
+    python -m benchmarks.recommendation_pipeline compare BASELINE CURRENT
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from uuid import UUID
+
+import typer
+from sqlalchemy import TextClause, bindparam, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks import _report
+from src import containers as cnt
+from src import crud, db
+from src.services import _population as population_srv
+from src.sessions import asession_factory, sync_engine
+from src.tasks import MATERIALIZED_VIEWS_REFRESH_STAGES
+
+BENCHMARK = 'recommendation_pipeline'
+EXPLAINED_SAMPLES = 10
+COUNTED_TABLES = (
+    'users',
+    'personalvaluespacks',
+    'contacts',
+    'moral_profiles',
+    'all_recommendations',
+    'limited_recommendations',
+)
+
+app = typer.Typer()
+
+
+def time_refresh_stages(*, repeat: int) -> dict[str, list[float]]:
+    """Runs the whole refresh repeat times, timing each stage."""
+    durations = {name: [] for name, _, _ in MATERIALIZED_VIEWS_REFRESH_STAGES}
+    with sync_engine.connect().execution_options(
+        isolation_level='AUTOCOMMIT'
+    ) as connection:
+        for _ in range(repeat):
+            for (
+                name,
+                statement,
+                parameters,
+            ) in MATERIALIZED_VIEWS_REFRESH_STAGES:
+                start = time.perf_counter()
+                connection.execute(statement, parameters)
+                durations[name].append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+async def _count_rows(*, asession: AsyncSession) -> dict[str, int]:
+    return {
+        table_name: await asession.scalar(
+            text(f'SELECT count(*) FROM {table_name}')
+        )
+        for table_name in COUNTED_TABLES
+    }
+
+
+async def _sample_pairs(
+    *, statement: str, sample_size: int, asession: AsyncSession
+) -> list[tuple[UUID, UUID]]:
+    results = await asession.execute(text(statement), {'n': sample_size})
+    return [(r[0], r[1]) for r in results.all()]
+
+
+async def _explain(
+    *,
+    statement: TextClause,
+    parameters: dict,
+    asession: AsyncSession,
+) -> dict:
+    """
+    EXPLAIN ANALYZE of statement (bound with its own parameter types);
+    returns timings, root rows and plan.
+    """
+    binds = statement.compile().binds
+    result = await asession.scalar(
+        text(
+            f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement.text}'
+        ).bindparams(
+            *(
+                bindparam(name, value=parameters.get(name), type_=bind.type)
+                for name, bind in binds.items()
+            )
+        )
+    )
+    # asyncpg returns json as str unless a codec is set
+    (explained,) = json.loads(result) if isinstance(result, str) else result
+    return {
+        'planning_ms': explained['Planning Time'],
+        'execution_ms': explained['Execution Time'],
+        'rows': explained['Plan']['Actual Rows'],
+        'plan': explained['Plan'],
+    }
+
+
+async def time_reads(
+    *, sample_size: int, asession: AsyncSession
+) -> tuple[dict[str, list[float]], dict[str, dict]]:
+    """
+    Times crud reads for sampled users (recommended pairs and contacts),
+    explains each query for the first EXPLAINED_SAMPLES samples.
+    Returns durations (including planning durations as plan.<name>)
+    and the first explained plan of each query.
+    """
+    recommended_pairs = await _sample_pairs(
+        statement="""
+SELECT user_ids[1], user_ids[2] FROM limited_recommendations
+ORDER BY random() LIMIT :n
+""",
+        sample_size=sample_size,
+        asession=asession,
+    )
+    contact_pairs = await _sample_pairs(
+        statement="""
+SELECT my_user_id, other_user_id FROM contacts
+ORDER BY random() LIMIT :n
+""",
+        sample_size=sample_size,
+        asession=asession,
+    )
+    durations = {}
+    explained = {}
+
+    async def measure(name, pairs, read, statement, make_parameters):
+        if not pairs:
+            return
+        durations[name] = []
+        for my_user_id, other_user_id in pairs:
+            start = time.perf_counter()
+            await read(my_user_id, other_user_id)
+            durations[name].append((time.perf_counter() - start) * 1000)
+        durations[f'plan.{name}'] = []
+        for pair in pairs[:EXPLAINED_SAMPLES]:
+            explained_sample = await _explain(
+                statement=statement,
+                parameters=make_parameters(*pair),
+                asession=asession,
+            )
+            durations[f'plan.{name}'].append(explained_sample['planning_ms'])
+            explained.setdefault(name, explained_sample)
+
+    await measure(
+        'read_user_recommendations',
+        recommended_pairs,
+        lambda my_id, _: crud.read_user_recommendations(
+            my_user_id=my_id, asession=asession
+        ),
+        crud.sql.read_user_recommendations,
+        lambda my_id, _: {'my_user_id': my_id},
+    )
+    await measure(
+        'read_contacts',
+        contact_pairs,
+        lambda my_id, _: crud.read_contacts(
+            my_user_id=my_id, asession=asession
+        ),
+        crud.sql.read_contacts,
+        lambda my_id, _: {'my_user_id': my_id},
+    )
+    await measure(
+        'read_other_profile',
+        recommended_pairs,
+        lambda my_id, other_id: crud.read_other_profile(
+            my_user_id=my_id, other_user_id=other_id, asession=asession
+        ),
+        crud.sql.read_other_profile,
+        lambda my_id, other_id: {
+            'my_user_id': my_id,
+            'other_user_id': other_id,
+        },
+    )
+    return durations, explained
+
+
+async def _seed(users: int) -> None:
+    async with asession_factory() as asession:
+        first_index = await asession.scalar(
+            select(func.count()).select_from(db.User)
+        )
+    await population_srv.populate_db(
+        config=cnt.PopulationConfig(
+            users=users,
+            first_index=first_index,
+            email_prefix='benchmark',
+            contacts_per_user=4,
+            seed=first_index,
+        )
+    )
+
+
+async def _run(*, repeat: int, sample_size: int) -> dict:
+    report = _report.new_report(
+        benchmark=BENCHMARK,
+        parameters={'repeat': repeat, 'sample_size': sample_size},
+    )
+    stage_durations = time_refresh_stages(repeat=repeat)
+    async with asession_factory() as asession:
+        report['environment']['postgres'] = await asession.scalar(
+            text('SHOW server_version')
+        )
+        report['dataset'] = await _count_rows(asession=asession)
+        read_durations, explained = await time_reads(
+            sample_size=sample_size, asession=asession
+        )
+    for name, durations in stage_durations.items():
+        report['results'][f'refresh.{name}'] = _report.summarize(durations)
+    report['results']['refresh.total'] = _report.summarize(
+        [sum(durations) for durations in zip(*stage_durations.values())]
+    )
+    for name, durations in read_durations.items():
+        report['results'][f'read.{name}'] = _report.summarize(durations)
+    for name, explained_read in explained.items():
+        report['details'][f'read.{name}'] = explained_read
+    return report
+
+
+@app.command()
+def run(
+    seed_users: int = typer.Option(
+        0, help='Synthetic users to add before measuring.'
+    ),
+    repeat: int = typer.Option(3, help='Full refresh runs.'),
+    sample_size: int = typer.Option(200, help='Users per read query.'),
+    output: Path | None = typer.Option(
+        None, help='Report path, default reports/<benchmark>-<sha>.json.'
+    ),
+    compare: Path | None = typer.Option(
+        None, help='Baseline report to compare with.'
+    ),
+    threshold: float = typer.Option(0.2, help='Allowed median slowdown.'),
+):
+    """Seeds (optionally), measures and writes report."""
+    if seed_users:
+        asyncio.run(_seed(seed_users))
+    report = asyncio.run(_run(repeat=repeat, sample_size=sample_size))
+    path = _report.write_report(report, output)
+    print(f'{"read":<45}{"median_ms":>12}{"plan_ms":>12}')
+    for name, result in report['results'].items():
+        if name.startswith('read.') and not name.startswith('read.plan.'):
+            plan = report['results'].get(f'read.plan.{name[5:]}')
+            print(
+                f'{name:<45}{result["median_ms"]:>12.2f}'
+                f'{plan["median_ms"] if plan else float("nan"):>12.2f}'
+            )
+    print(f'Report written to {path}')
+    if compare is not None:
+        regressions = _report.compare_reports(
+            baseline=_report.load_report(compare),
+            current=report,
+            threshold=threshold,
+        )
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+@app.command(name='compare')
+def compare_command(
+    baseline: Path,
+    current: Path,
+    threshold: float = typer.Option(0.2, help='Allowed median slowdown.'),
+):
+    """Compares two reports, exits with 1 on regressions."""
+    regressions = _report.compare_reports(
+        baseline=_report.load_report(baseline),
+        current=_report.load_report(current),
+        threshold=threshold,
+    )
+    if regressions:
+        raise typer.Exit(code=1)
+
+
+if __name__ == '__main__':
+    app()
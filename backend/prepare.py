@@ -1,8 +1,14 @@
 import asyncio
+from dataclasses import replace
+from pathlib import Path
 
 import typer
 
+from src import containers as cnt
+from src import tasks
 from src.dependencies import asession_factory
+from src.pwned_passwords import build_pwned_passwords_index
+from src.services import _population as population_srv
 from src.services import _prepare_db as prep_srv
 from src.services.utils.other import generate_random_personal_values
 
@@ -41,5 +47,90 @@ def randval():
     asyncio.run(gen_randval_with_asession())
 
 
+def _parse_location_center(raw: str) -> cnt.LocationCenter:
+    latitude, longitude, radius_km, *weight = (
+        float(part) for part in raw.split(',')
+    )
+    return cnt.LocationCenter(
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        weight=weight[0] if weight else 1,
+    )
+
+
+@app.command()
+def population(
+    users: int = typer.Argument(..., help='Number of users to add.'),
+    batch_size: int = 10_000,
+    first_index: int = typer.Option(
+        0, help='Index of the first user email, to add more users later.'
+    ),
+    attitude_weights: str | None = typer.Option(
+        None, help='Comma separated, per attitude id in ascending order.'
+    ),
+    best_values_skew: float = typer.Option(
+        1.0, help='Zipf exponent of value popularity, 0 - uniform.'
+    ),
+    aspect_inclusion: float = 0.5,
+    located_share: float = 0.9,
+    location: list[str] | None = typer.Option(
+        None, help='Repeatable "lat,lon,radius_km[,weight]".'
+    ),
+    contacts_per_user: int = 0,
+    seed: int | None = None,
+    refresh: bool = typer.Option(
+        True, help='Run refresh_materialized_views afterwards.'
+    ),
+):
+    """
+    Command to bulk-add synthetic users (password 'synthetic-password')
+    with profiles and personal values, for load tests.
+    """
+    config = cnt.PopulationConfig(
+        users=users,
+        batch_size=batch_size,
+        first_index=first_index,
+        attitude_weights=(
+            tuple(float(w) for w in attitude_weights.split(','))
+            if attitude_weights
+            else None
+        ),
+        best_values_skew=best_values_skew,
+        aspect_inclusion=aspect_inclusion,
+        located_share=located_share,
+        contacts_per_user=contacts_per_user,
+        seed=seed,
+    )
+    if location:
+        config = replace(
+            config,
+            location_centers=tuple(
+                _parse_location_center(raw) for raw in location
+            ),
+        )
+    asyncio.run(population_srv.populate_db(config=config))
+    if refresh:
+        tasks.refresh_materialized_views()
+
+
+@app.command(name='pwned-index')
+def pwned_index(
+    source: Path = typer.Argument(
+        ..., help='HIBP SHA-1 dataset, "HASH:COUNT" lines ordered by hash.'
+    ),
+    target: Path = typer.Argument(..., help='Index file to write.'),
+    min_count: int = typer.Option(1, help='Leave out hashes seen less times.'),
+):
+    """
+    Command to build local pwned passwords index,
+    used if PWNED_PASSWORDS_INDEX_PATH points to it.
+    """
+    written = build_pwned_passwords_index(
+        source=source, target=target, min_count=min_count
+    )
+    typer.echo(f'{written} hashes written to {target}.')
+
+
 if __name__ == '__main__':
     app()
@@ -39,6 +39,7 @@ class PrivatePaths:
     UNREAD_MESSAGES_COUNT: str = '/messages/unread-count'
     MESSAGES: str = '/messages'
     CHAT: str = '/ws'  # '/ws/{token}'
+    METRICS: str = '/metrics'
 
 
 @dataclass(frozen=True)
@@ -63,6 +64,17 @@ translate_to = get_env_var_or_raise('TRANSLATE_TO')
 supported_languages = f'{default_language}, {translate_to}'
 
 
+@dataclass(frozen=True)
+class PoolConfig:
+    """SQLAlchemy pool of one engine, per worker process."""
+
+    SIZE: int
+    MAX_OVERFLOW: int
+    TIMEOUT_SECONDS: float = 10
+    RECYCLE_SECONDS: int = 1800
+    PRE_PING: bool = False
+
+
 @dataclass(frozen=True)
 class Config:
     PATHS: Paths = Paths()
@@ -84,15 +96,42 @@ class Config:
     SUSPEND_AT_HOUR_MIN: tuple[int, int] = 23, 00
     END_COOLDOWNS_EVERY_HOURS: int = 24
     WS_PING_INTERVAL_SECONDS: int = 20
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    DEFINITIONS_VERSION_CHECK_SECONDS: int = 60
     RANDOM_PV_TEST_ATTEMPTS: int = 100
+    # Argon2 threads per worker, queued + running calls before 429
+    PASSWORD_HASHING_WORKERS: int = 2
+    PASSWORD_HASHING_MAX_PENDING: int = 32
+    # zxcvbn threads per worker, queued + running calls before 429
+    PASSWORD_STRENGTH_WORKERS: int = 1
+    PASSWORD_STRENGTH_MAX_PENDING: int = 16
+    # repeated scoring of the same password (form retries) is cached
+    PASSWORD_STRENGTH_CACHE_SIZE: int = 1024
+    PASSWORD_STRENGTH_CACHE_TTL_SECONDS: int = 60
+    # local HIBP index (prepare.py pwned-index), range API if not set
+    PWNED_PASSWORDS_INDEX_PATH: str | None = getenv(
+        'PWNED_PASSWORDS_INDEX_PATH'
+    )
+    PWNED_PASSWORDS_TIMEOUT_SECONDS: float = 5.0
+    PWNED_PASSWORDS_RANGE_CACHE_SIZE: int = 4096
+    PWNED_PASSWORDS_RANGE_CACHE_TTL_SECONDS: int = 3600
     POSTGRES_USER: str = get_env_var_or_raise('POSTGRES_USER')
     POSTGRES_PASSWORD: str = get_env_var_or_raise('POSTGRES_PASSWORD')
     POSTGRES_HOST: str = get_env_var_or_raise('POSTGRES_HOST')
     POSTGRES_PORT: int = int(get_env_var_or_raise('POSTGRES_PORT'))
     POSTGRES_DB: str = get_env_var_or_raise('POSTGRES_DB')
+    # optional streaming replica for read-only endpoints, same credentials
+    POSTGRES_REPLICA_HOST: str | None = getenv('POSTGRES_REPLICA_HOST')
+    POSTGRES_REPLICA_PORT: int = int(
+        getenv('POSTGRES_REPLICA_PORT') or POSTGRES_PORT
+    )
     CONFIRMATION_CODE_LIFETIME_SECONDS = 60
     CONFIRMATION_CODE_LENGTH = 6
     JWT_SECRET: str = get_env_var_or_raise('JWT_SECRET')
+    # HMAC key of stored refresh token hashes
+    REFRESH_TOKEN_HASH_SECRET: str = getenv(
+        'REFRESH_TOKEN_HASH_SECRET'
+    ) or get_env_var_or_raise('JWT_SECRET')
     JWT_ACCESS_LIFETIME_MINUTES: int = int(
         get_env_var_or_raise('JWT_ACCESS_LIFETIME_MINUTES')
     )
@@ -122,6 +161,15 @@ class Config:
         f'{POSTGRES_PORT}/{POSTGRES_DB}'
     )
 
+    ASYNC_REPLICA_DATABASE_URL: str | None = (
+        f'postgresql+asyncpg://{POSTGRES_USER}:'
+        f'{POSTGRES_PASSWORD}'
+        f'@{POSTGRES_REPLICA_HOST}:'
+        f'{POSTGRES_REPLICA_PORT}/{POSTGRES_DB}'
+        if POSTGRES_REPLICA_HOST
+        else None
+    )
+
     SYNC_DATABASE_URL: str = (
         f'postgresql+psycopg2://{POSTGRES_USER}:'
         f'{POSTGRES_PASSWORD}'
@@ -140,5 +188,25 @@ class Config:
 
     CHAT = ChatConfig()
 
+    # gunicorn workers * (request + chat) + Celery (background)
+    # must stay below Postgres max_connections
+    REQUEST_POOL: PoolConfig = PoolConfig(SIZE=8, MAX_OVERFLOW=4)
+    CHAT_POOL: PoolConfig = PoolConfig(SIZE=4, MAX_OVERFLOW=2)
+    BACKGROUND_POOL: PoolConfig = PoolConfig(
+        SIZE=2, MAX_OVERFLOW=2, PRE_PING=True
+    )
+    REPLICA_POOL: PoolConfig = PoolConfig(SIZE=8, MAX_OVERFLOW=4)
+    # extra connections bootstrap parts may take from the request
+    # (or replica) pool, beside each request's own; leaves
+    # SIZE + MAX_OVERFLOW - this for concurrent requests
+    BOOTSTRAP_EXTRA_CONNECTIONS: int = 4
+    # reads go to the primary while replica replay lags more
+    REPLICA_MAX_LAG_SECONDS: float = 5
+    REPLICA_LAG_CHECK_SECONDS: float = 2
+    # reads of a user go to the primary this long after their writes
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = 10
+    # asyncpg prepared statements kept per connection
+    PREPARED_STATEMENT_CACHE_SIZE: int = 500
+
 
 CFG = Config()
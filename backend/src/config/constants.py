@@ -43,6 +43,8 @@ USER_NAME_MAX_LENGTH = 100
 PASSWORD_MIN_LENGTH = 8
 PASSWORD_MAX_LENGTH = 128
 PASSWORD_MIN_SCORE = 3
+# longer passwords are scored by prefix, zxcvbn cost grows with length
+PASSWORD_STRENGTH_MAX_LENGTH = 64
 EMAIL_MAX_LENGTH = 320
 LOCATION_MAX_LENGTH = 29
 VALUE_NAME_MAX_LENGTH = 100
@@ -51,6 +53,11 @@ SUBDEF_STATEMENT_MAX_LENGTH = 500
 # how many top positive UVs should match to consider profiles alike
 NUMBER_OF_BEST_UVS = 2
 NUMBER_OF_WORST_UVS = 2
+# aspect masks are stored as BIGINT
+ASPECT_MASK_MAX_BITS = 63
+# access token claims, copies of User flags at token creation
+ACCESS_TOKEN_ACTIVE_CLAIM = 'act'
+ACCESS_TOKEN_VERIFIED_CLAIM = 'vrf'
 SMTP_SERVER = 'smtp.gmail.com'
 SMTP_PORT = 587
 APP_DOMAIN = 'yourfrontend.com'
@@ -80,6 +87,19 @@ BLOCKABLE_CONTACT_STATUSES = [
 MESSAGES_HISTORY_LENGTH_DEFAULT = 20
 MATCH_NOTIFIED_REDIS_KEY = 'match_notified'
 CONFIRM_EMAIL_REDIS_KEY = 'confirm:email:'
+# refresh token hashes written before HMAC-SHA256
+LEGACY_REFRESH_TOKEN_HASH_PREFIX = '$argon2'
+RESPONSE_CACHE_REDIS_KEY = 'response_cache:'
+# incremented on invalidation, a build started before is not cached
+RESPONSE_CACHE_GENERATION_REDIS_KEY = 'response_cache_generation:'
+RESPONSE_CACHE_GENERATION_ALL_REDIS_KEY = 'response_cache_generation_all'
+READ_FROM_PRIMARY_REDIS_KEY = 'read_from_primary:'
+# set after responses of all users are dropped
+READ_FROM_PRIMARY_ALL_REDIS_KEY = 'read_from_primary_all'
+INITIAL_PERSONAL_VALUES_MESSAGE = (
+    'Personal values have not been created yet. '
+    'This is initial data to create Personal Values.'
+)
 COOLDOWN_RESPONSE_MESSAGE = (
     'Search for new contact is temporarily unavailable.'
     ' It will be available again after a cooldown.'
@@ -78,3 +78,8 @@ class DecodedTokenStatus(str, Enum):
     OK = 'OK'
     ERROR = 'ERROR'
     EXPIRED = 'EXPIRED'
+
+
+class CachedResponse(str, Enum):
+    BOOTSTRAP = 'bootstrap'
+    CONTS_N_REQSTS_N_RECOMS = 'conts_n_reqsts_n_recoms'
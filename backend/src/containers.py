@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from types import MappingProxyType
 from datetime import datetime, time
 from uuid import UUID
 
@@ -52,6 +53,25 @@ class MessageRead:
     time: time
 
 
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user, as far as access checks need it."""
+
+    id: UUID
+    is_active: bool
+    is_verified: bool
+
+
+@dataclass
+class LockWaitStats:
+    """Time tasks spent waiting to acquire a lock."""
+
+    acquisitions: int = 0
+    contended: int = 0
+    wait_seconds: float = 0
+    max_wait_seconds: float = 0
+
+
 @dataclass
 class DecodedRefreshToken:
     subject: UUID
@@ -66,3 +86,127 @@ class MatchToNotify:
     email: str
     match_user_id: UUID
     match_name: str | None
+
+
+@dataclass(frozen=True)
+class AspectDefinition:
+    id: int
+    value_id: int
+    key_phrase: str
+    statement: str
+
+
+@dataclass(frozen=True)
+class ValueDefinition:
+    id: int
+    name: str
+    aspects: tuple[AspectDefinition, ...]
+
+
+@dataclass(frozen=True)
+class AttitudeDefinition:
+    id: int
+    statement: str
+
+
+@dataclass(frozen=True)
+class LanguageDefinitions:
+    """Values (with aspects) and attitudes, translated to one language."""
+
+    values: tuple[ValueDefinition, ...]
+    attitudes: tuple[AttitudeDefinition, ...]
+    values_by_id: MappingProxyType[int, ValueDefinition]
+    aspects_by_id: MappingProxyType[int, AspectDefinition]
+
+
+@dataclass(frozen=True)
+class Definitions:
+    """
+    Everything static after prepare_db.
+    version: stamp of definitions tables the data was read at.
+    by_language: per supported language code.
+    value_aspect_ids: value id -> its aspect ids.
+    unique_value_ids: (value_id, included aspect ids) -> UniqueValue.id.
+    aspect_bits: aspect id -> its bit in aspect masks (by aspect id order).
+    """
+
+    version: str
+    by_language: MappingProxyType[str, LanguageDefinitions]
+    attitude_ids: frozenset[int]
+    value_aspect_ids: MappingProxyType[int, frozenset[int]]
+    unique_value_ids: MappingProxyType[tuple[int, frozenset[int]], int]
+    aspect_bits: MappingProxyType[int, int]
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    """Serialized JSON response body with its ETag."""
+
+    content: bytes
+    etag: str
+
+
+@dataclass(frozen=True)
+class PersonalValuesPack:
+    """See db.PersonalValuesPack."""
+
+    attitude_id: int
+    value_ids: tuple[int, ...]
+    unique_value_ids: tuple[int, ...]
+    positive_count: int
+    neutral_count: int
+    aspect_mask: int
+
+
+@dataclass(frozen=True)
+class LocationCenter:
+    """Area synthetic users are scattered over, uniformly within radius."""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+    weight: float = 1
+
+
+@dataclass(frozen=True)
+class PopulationConfig:
+    """
+    Synthetic population settings.
+    attitude_weights: per attitude id in ascending order, None - uniform.
+    best_values_skew: Zipf exponent of value popularity (ascending value id
+    order) used to pick values for top positions, 0 - uniform.
+    located_share: share of users with location, others have none.
+    contacts_per_user: ongoing contacts, drawn within a batch.
+    """
+
+    users: int
+    batch_size: int = 10_000
+    first_index: int = 0
+    email_prefix: str = 'synthetic'
+    email_domain: str = 'example.com'
+    password: str = 'synthetic-password'
+    attitude_weights: tuple[float, ...] | None = None
+    best_values_skew: float = 1.0
+    aspect_inclusion: float = 0.5
+    located_share: float = 0.9
+    location_centers: tuple[LocationCenter, ...] = (
+        LocationCenter(latitude=52.52, longitude=13.405, radius_km=30),
+        LocationCenter(latitude=48.8566, longitude=2.3522, radius_km=30),
+        LocationCenter(latitude=40.7128, longitude=-74.006, radius_km=50),
+    )
+    distance_limits_km: tuple[float | None, ...] = (None, 10, 50, 500)
+    contacts_per_user: int = 0
+    seed: int | None = None
+
+
+@dataclass
+class PopulationBatch:
+    """Records for COPY, tuples in column order of crud population tables."""
+
+    users: list[tuple]
+    profiles: list[tuple]
+    userdynamics: list[tuple]
+    personal_values: list[tuple]
+    personal_aspects: list[tuple]
+    packs: list[tuple]
+    contacts: list[tuple]
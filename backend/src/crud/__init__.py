@@ -1,3 +1,4 @@
+from ._population import *  # noqa
 from ._prepare_db import *  # noqa
 from .contacts import *  # noqa
 from .definitions import *  # noqa
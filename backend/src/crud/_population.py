@@ -0,0 +1,175 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from src import containers as cnt
+
+POPULATION_USERS_COLUMNS = (
+    'id',
+    'email',
+    'password_hash',
+    'is_active',
+    'is_verified',
+    'is_superuser',
+)
+# location is staged as lon/lat: PostGIS types have no asyncpg COPY codec
+POPULATION_PROFILES_COLUMNS = (
+    'user_id',
+    'attitude_id',
+    'languages',
+    'longitude',
+    'latitude',
+    'distance_limit',
+    'name',
+    'recommend_me',
+)
+POPULATION_USERDYNAMICS_COLUMNS = (
+    'user_id',
+    'search_allowed_status',
+    'values_created',
+    'values_changes',
+    'match_notified',
+)
+POPULATION_PERSONAL_VALUES_COLUMNS = (
+    'user_id',
+    'value_id',
+    'unique_value_id',
+    'polarity',
+    'user_order',
+)
+# personal_value_id is resolved by (user_id, value_id) after COPY
+POPULATION_PERSONAL_ASPECTS_COLUMNS = (
+    'user_id',
+    'value_id',
+    'aspect_id',
+    'included',
+)
+POPULATION_PACKS_COLUMNS = (
+    'user_id',
+    'attitude_id',
+    'value_ids',
+    'unique_value_ids',
+    'positive_count',
+    'neutral_count',
+    'aspect_mask',
+)
+POPULATION_CONTACTS_COLUMNS = ('my_user_id', 'other_user_id', 'status')
+
+_create_population_staging_tables = (
+    """
+CREATE TEMP TABLE population_profiles (
+    user_id uuid,
+    attitude_id integer,
+    languages varchar[],
+    longitude double precision,
+    latitude double precision,
+    distance_limit double precision,
+    name varchar,
+    recommend_me boolean
+) ON COMMIT DROP;
+    """,
+    """
+CREATE TEMP TABLE population_personal_aspects (
+    user_id uuid,
+    value_id integer,
+    aspect_id integer,
+    included boolean
+) ON COMMIT DROP;
+    """,
+)
+
+_move_population_profiles = """
+INSERT INTO profiles (
+    user_id,
+    attitude_id,
+    languages,
+    location,
+    distance_limit,
+    name,
+    recommend_me
+)
+SELECT
+    user_id,
+    attitude_id,
+    languages,
+    CASE
+        WHEN longitude IS NULL THEN NULL
+        ELSE ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+    END,
+    distance_limit,
+    name,
+    recommend_me
+FROM population_profiles;
+"""
+
+_move_population_personal_aspects = """
+INSERT INTO personalaspects (
+    user_id,
+    aspect_id,
+    included,
+    personal_value_id
+)
+SELECT
+    s.user_id,
+    s.aspect_id,
+    s.included,
+    pv.id
+FROM population_personal_aspects s
+JOIN personalvalues pv
+ON pv.user_id = s.user_id AND pv.value_id = s.value_id;
+"""
+
+
+async def copy_population_batch(
+    *, batch: cnt.PopulationBatch, asession: AsyncSession
+) -> None:
+    """
+    Writes batch with COPY, in the session transaction.
+    Tables without COPY-compatible columns go through temp staging tables.
+    """
+    await asession.execute(text('SET LOCAL synchronous_commit = off'))
+    for statement in _create_population_staging_tables:
+        await asession.execute(text(statement))
+    connection = await asession.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    for table_name, columns, records in (
+        ('users', POPULATION_USERS_COLUMNS, batch.users),
+        ('population_profiles', POPULATION_PROFILES_COLUMNS, batch.profiles),
+        (
+            'userdynamics',
+            POPULATION_USERDYNAMICS_COLUMNS,
+            batch.userdynamics,
+        ),
+        (
+            'personalvalues',
+            POPULATION_PERSONAL_VALUES_COLUMNS,
+            batch.personal_values,
+        ),
+        (
+            'population_personal_aspects',
+            POPULATION_PERSONAL_ASPECTS_COLUMNS,
+            batch.personal_aspects,
+        ),
+        ('personalvaluespacks', POPULATION_PACKS_COLUMNS, batch.packs),
+        ('contacts', POPULATION_CONTACTS_COLUMNS, batch.contacts),
+    ):
+        if records:
+            await driver_connection.copy_records_to_table(
+                table_name, records=records, columns=columns
+            )
+    await asession.execute(text(_move_population_profiles))
+    await asession.execute(text(_move_population_personal_aspects))
+
+
+async def analyze_population_tables(*, asession: AsyncSession) -> None:
+    """Updates planner statistics after bulk load."""
+    for table_name in (
+        'users',
+        'profiles',
+        'userdynamics',
+        'personalvalues',
+        'personalaspects',
+        'personalvaluespacks',
+        'contacts',
+    ):
+        await asession.execute(text(f'ANALYZE {table_name}'))
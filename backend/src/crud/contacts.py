@@ -1,13 +1,13 @@
 from uuid import UUID
 
 from sqlalchemy import UUID as SA_UUID
-from sqlalchemy import bindparam, update
-from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy import Row, bindparam, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import containers as cnt
 from src import crud, db
-from src.config import ENM
+from src.config import CNST, ENM
 
 
 async def read_user_recommendations(
@@ -17,10 +17,8 @@ async def read_user_recommendations(
     asession: AsyncSession,
 ) -> list[cnt.ContactRead]:
     results = await asession.execute(
-        crud.sql.read_user_recommendations.bindparams(
-            bindparam('my_user_id', value=my_user_id, type_=SA_UUID),
-            bindparam('other_user_id', value=other_user_id, type_=SA_UUID),
-        )
+        crud.sql.read_user_recommendations,
+        {'my_user_id': my_user_id, 'other_user_id': other_user_id},
     )
     recommendations = [
         cnt.ContactRead(
@@ -40,22 +38,41 @@ async def create_contact_pair(
     other_user_id: UUID,
     my_contact_status: str,
     other_user_contact_status: str,
+    similarity: float,
+    distance: float | None,
     asession: AsyncSession,
-):
+) -> bool:
+    """
+    Inserts a pair of mirrored contacts unless the pair already exists.
+    similarity and distance are stored as snapshots on both contacts.
+    Returns True if the pair was created.
+    """
     contacts_data = [
         {
             'my_user_id': my_user_id,
             'other_user_id': other_user_id,
             'status': my_contact_status,
+            'similarity': similarity,
+            'distance': distance,
         },
         {
             'my_user_id': other_user_id,
             'other_user_id': my_user_id,
             'status': other_user_contact_status,
+            'similarity': similarity,
+            'distance': distance,
         },
     ]
-    stmt = insert(db.Contact).values(contacts_data)
-    await asession.execute(stmt)
+    stmt = (
+        insert(db.Contact)
+        .values(contacts_data)
+        .on_conflict_do_nothing(
+            constraint=CNST.UQ_CNSTR_CONTACT_MY_USER_ID_TARGET_USER_ID
+        )
+        .returning(db.Contact.my_user_id)
+    )
+    results = await asession.execute(stmt)
+    return len(results.all()) == 2
 
 
 async def read_contacts(
@@ -72,40 +89,90 @@ async def read_contacts(
     statuses: optional, if to filter by status.
     """
     results = await asession.execute(
-        crud.sql.read_contacts.bindparams(
+        crud.sql.read_contacts,
+        {
+            'my_user_id': my_user_id,
+            'other_user_id': other_user_id,
+            'statuses': statuses,
+        },
+    )
+    return [_row_to_rich_contact(r) for r in results.all()]
+
+
+async def read_contact_pair(
+    *,
+    my_user_id: UUID,
+    other_user_id: UUID,
+    asession: AsyncSession,
+) -> list[cnt.RichContactRead]:
+    """
+    Reads both mirrored contacts of a pair in one query, 'my' contact first.
+    """
+    results = await asession.execute(
+        crud.sql.read_contact_pair,
+        {'my_user_id': my_user_id, 'other_user_id': other_user_id},
+    )
+    return [_row_to_rich_contact(r) for r in results.all()]
+
+
+async def update_contact_pair(
+    *,
+    my_user_id: UUID,
+    other_user_id: UUID,
+    my_status: ENM.ContactStatus,
+    other_status: ENM.ContactStatus,
+    asession: AsyncSession,
+) -> list[cnt.ContactWrite]:
+    """
+    Updates statuses of both mirrored contacts in one statement.
+    Returns updated contacts, 'my' first.
+    """
+    results = await asession.execute(
+        crud.sql.update_contact_pair.bindparams(
             bindparam('my_user_id', value=my_user_id, type_=SA_UUID),
             bindparam('other_user_id', value=other_user_id, type_=SA_UUID),
-            bindparam(
-                'statuses', value=statuses, type_=ARRAY(ENM.ContactStatusPG)
-            ),
+            bindparam('my_status', value=my_status.value),
+            bindparam('other_status', value=other_status.value),
         )
     )
-    return [
-        cnt.RichContactRead(
+    updated = [
+        cnt.ContactWrite(
             my_user_id=r.my_user_id,
             other_user_id=r.other_user_id,
-            my_name=r.my_profile_name,
-            other_name=r.other_profile_name,
-            status=r.status,
-            distance=r.distance,
-            similarity=r.similarity,
-            unread_msg=r.unread_messages,
-            created_at=r.created_at,
+            status=ENM.ContactStatus(r.status),
         )
         for r in results.all()
     ]
+    updated.sort(key=lambda c: c.my_user_id != my_user_id)
+    return updated
 
 
-async def update_contact(
-    contact: cnt.ContactWrite, asession: AsyncSession
-) -> None:
-    await asession.execute(
-        update(db.Contact)
-        .where(db.Contact.my_user_id == contact.my_user_id)
-        .where(db.Contact.other_user_id == contact.other_user_id)
-        .values(status=contact.status)
-        .returning(db.Contact)
+async def read_contact_user_ids(
+    *, user_id: UUID, asession: AsyncSession
+) -> list[UUID]:
+    """Reads ids of all users, user has contacts with (any status)."""
+    results = await asession.execute(
+        select(db.Contact.other_user_id).where(
+            db.Contact.my_user_id == user_id
+        )
     )
+    return list(results.scalars().all())
+
+
+async def refresh_contacts_similarity_and_distance(
+    *, user_id: UUID | None = None, asession: AsyncSession
+) -> list[UUID]:
+    """
+    Recalculates snapshotted similarity and distance of contacts.
+    user_id: optional, if only this user's contacts (both directions) needed.
+    Returns ids of users whose contacts changed.
+    """
+    results = await asession.execute(
+        crud.sql.refresh_contacts_similarity_and_distance.bindparams(
+            bindparam('user_id', value=user_id, type_=SA_UUID),
+        )
+    )
+    return list({r.my_user_id for r in results.all()})
 
 
 async def read_other_profile(
@@ -132,3 +199,17 @@ async def read_other_profile(
         similarity=r.similarity,
         distance=r.distance,
     )
+
+
+def _row_to_rich_contact(r: Row) -> cnt.RichContactRead:
+    return cnt.RichContactRead(
+        my_user_id=r.my_user_id,
+        other_user_id=r.other_user_id,
+        my_name=r.my_profile_name,
+        other_name=r.other_profile_name,
+        status=r.status,
+        distance=r.distance,
+        similarity=r.similarity,
+        unread_msg=r.unread_messages,
+        created_at=r.created_at,
+    )
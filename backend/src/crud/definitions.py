@@ -1,10 +1,15 @@
-from async_lru import alru_cache
+import asyncio
+import time
+from types import MappingProxyType
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased, contains_eager, joinedload
+from sqlalchemy.orm import aliased, contains_eager, joinedload, selectinload
 
-from src import db
-from src.config import CFG
+from src import containers as cnt
+from src import crud, db
+from src import exceptions as exc
+from src.config import CFG, CNST
 
 
 async def read_values(
@@ -46,10 +51,152 @@ async def read_attitudes(
     return list(result.unique().all())
 
 
-@alru_cache
 async def read_unique_values(
     *,
     asession: AsyncSession,
 ) -> list[db.UniqueValue]:
     result = await asession.scalars(select(db.UniqueValue))
     return list(result.all())
+
+
+async def read_definitions_version(*, asession: AsyncSession) -> str:
+    result = await asession.execute(crud.sql.definitions_version)
+    return result.scalar_one()
+
+
+def _translated(obj, attr_name: str, language_code: str) -> str:
+    for translation in obj.translations:
+        if translation.language_code == language_code:
+            return getattr(translation, attr_name)
+    return getattr(obj, f'{attr_name}_default')
+
+
+async def _read_definitions_data(*, asession: AsyncSession) -> cnt.Definitions:
+    version = await read_definitions_version(asession=asession)
+    values = (
+        await asession.scalars(
+            select(db.Value)
+            .options(
+                selectinload(db.Value.translations),
+                selectinload(db.Value.aspects).selectinload(
+                    db.Aspect.translations
+                ),
+            )
+            .order_by(db.Value.id)
+        )
+    ).all()
+    attitudes = (
+        await asession.scalars(
+            select(db.Attitude)
+            .options(selectinload(db.Attitude.translations))
+            .order_by(db.Attitude.id)
+        )
+    ).all()
+    unique_values = await read_unique_values(asession=asession)
+    aspect_ids = sorted(a.id for v in values for a in v.aspects)
+    if len(aspect_ids) > CNST.ASPECT_MASK_MAX_BITS:
+        raise exc.ServerError(
+            f'Too many aspects for aspect masks: {len(aspect_ids)}.'
+        )
+    by_language = {}
+    for lan_code in CFG.SUPPORTED_LANGUAGES:
+        value_definitions = tuple(
+            cnt.ValueDefinition(
+                id=v.id,
+                name=_translated(v, 'name', lan_code),
+                aspects=tuple(
+                    cnt.AspectDefinition(
+                        id=a.id,
+                        value_id=v.id,
+                        key_phrase=_translated(a, 'key_phrase', lan_code),
+                        statement=_translated(a, 'statement', lan_code),
+                    )
+                    for a in sorted(v.aspects, key=lambda a: a.id)
+                ),
+            )
+            for v in values
+        )
+        by_language[lan_code] = cnt.LanguageDefinitions(
+            values=value_definitions,
+            attitudes=tuple(
+                cnt.AttitudeDefinition(
+                    id=a.id, statement=_translated(a, 'statement', lan_code)
+                )
+                for a in attitudes
+            ),
+            values_by_id=MappingProxyType(
+                {v.id: v for v in value_definitions}
+            ),
+            aspects_by_id=MappingProxyType(
+                {a.id: a for v in value_definitions for a in v.aspects}
+            ),
+        )
+    return cnt.Definitions(
+        version=version,
+        by_language=MappingProxyType(by_language),
+        attitude_ids=frozenset(a.id for a in attitudes),
+        value_aspect_ids=MappingProxyType(
+            {v.id: frozenset(a.id for a in v.aspects) for v in values}
+        ),
+        unique_value_ids=MappingProxyType(
+            {
+                (uv.value_id, frozenset(uv.aspect_ids)): uv.id
+                for uv in unique_values
+            }
+        ),
+        aspect_bits=MappingProxyType(
+            {aspect_id: bit for bit, aspect_id in enumerate(aspect_ids)}
+        ),
+    )
+
+
+class DefinitionsCache:
+    """
+    Process-wide in-memory copy of definitions
+    (values, aspects, attitudes, translations, unique values).
+    Loaded on first use; reloaded after invalidate()
+    or when version stamp in db differs (checked once per
+    CFG.DEFINITIONS_VERSION_CHECK_SECONDS).
+    """
+
+    def __init__(self) -> None:
+        self._definitions: cnt.Definitions | None = None
+        self._checked_at: float = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._definitions = None
+
+    async def get(self, *, asession: AsyncSession) -> cnt.Definitions:
+        definitions = self._definitions
+        if definitions is not None and (
+            time.monotonic() - self._checked_at
+            < CFG.DEFINITIONS_VERSION_CHECK_SECONDS
+        ):
+            return definitions
+        async with self._lock:
+            if self._definitions is not None:
+                if (
+                    time.monotonic() - self._checked_at
+                    < CFG.DEFINITIONS_VERSION_CHECK_SECONDS
+                ):
+                    return self._definitions
+                version = await read_definitions_version(asession=asession)
+                if version == self._definitions.version:
+                    self._checked_at = time.monotonic()
+                    return self._definitions
+            definitions = await _read_definitions_data(asession=asession)
+            if not definitions.unique_value_ids:
+                raise exc.ServerError('Definitions not found.')
+            self._definitions = definitions
+            self._checked_at = time.monotonic()
+            return definitions
+
+
+definitions_cache = DefinitionsCache()
+
+
+async def read_cached_definitions(
+    *, asession: AsyncSession
+) -> cnt.Definitions:
+    return await definitions_cache.get(asession=asession)
@@ -1,13 +1,14 @@
 from uuid import UUID
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import UUID as SA_UUID
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import contains_eager
 
-from src import db
+from src import containers as cnt
+from src import crud, db
 from src import exceptions as exc
-from src.config import CFG
-from src.crud.definitions import read_unique_values
+from src.crud.definitions import read_cached_definitions
 
 
 async def get_uniquevalue_id_by_value_id_and_aspect_ids(
@@ -16,60 +17,15 @@ async def get_uniquevalue_id_by_value_id_and_aspect_ids(
     aspect_ids: list[int],
     asession: AsyncSession,
 ) -> int:
-    uvs = await read_unique_values(asession=asession)
-    sorted_aspect_ids = set(aspect_ids)
-    if not uvs:
-        raise exc.ServerError('UniqueValues not found.')
-    for uv in uvs:
-        if uv.value_id == value_id and set(uv.aspect_ids) == sorted_aspect_ids:
-            return uv.id
+    definitions = await read_cached_definitions(asession=asession)
+    uv_id = definitions.unique_value_ids.get((value_id, frozenset(aspect_ids)))
+    if uv_id is not None:
+        return uv_id
     raise exc.ServerError(
         f'UniqueValue not fount for {value_id=}, aspect_ids={aspect_ids}'
     )
 
 
-async def read_personal_values(
-    *,
-    user_id: UUID,
-    current_language: str = CFG.DEFAULT_LANGUAGE,
-    asession: AsyncSession,
-) -> list[db.PersonalValue]:
-    stmt = (
-        select(db.PersonalValue)
-        .join(db.PersonalValue.value)
-        .join(db.PersonalAspect)
-        .join(db.Aspect)
-        .where(db.PersonalValue.user_id == user_id)
-    )
-    if current_language in CFG.TRANSLATE_TO:
-        stmt = (
-            stmt.outerjoin(db.Value.translations)
-            .outerjoin(db.Aspect.translations)
-            .where(db.ValueTranslation.language_code == current_language)
-            .where(db.AspectTranslation.language_code == current_language)
-        )
-    stmt = stmt.order_by(db.PersonalValue.user_order)
-    if current_language in CFG.TRANSLATE_TO:
-        stmt = stmt.options(
-            contains_eager(db.PersonalValue.value).contains_eager(
-                db.Value.translations
-            ),
-            contains_eager(db.PersonalValue.personal_aspects)
-            .contains_eager(db.PersonalAspect.aspect)
-            .contains_eager(db.Aspect.translations),
-        )
-    else:
-        stmt = stmt.options(
-            contains_eager(db.PersonalValue.value),
-            contains_eager(db.PersonalValue.personal_aspects).contains_eager(
-                db.PersonalAspect.aspect
-            ),
-        )
-    db_personal_values_result = await asession.scalars(stmt)
-    personal_values = list(db_personal_values_result.unique())
-    return personal_values
-
-
 async def count_personal_values(
     *, user_id: UUID, asession: AsyncSession
 ) -> int:
@@ -81,47 +37,98 @@ async def count_personal_values(
     return result if result is not None else 0
 
 
-async def create_personal_values(
+async def upsert_personal_values(
     *,
     user_id: UUID,
-    data: dict,
+    value_links: list[dict],
     asession: AsyncSession,
-) -> list[db.PersonalValue]:
-    personal_values = []
-    for pv_data in data['value_links']:
-        personal_value = db.PersonalValue(
-            user_id=user_id,
+) -> None:
+    """
+    Inserts or updates personal values and personal aspects
+    with two statements. Unchanged rows are left as is.
+    value_links: PersonalValueCreate dicts, all values with all aspects.
+    """
+    pv_params: dict[str, list] = {
+        'value_ids': [],
+        'unique_value_ids': [],
+        'polarities': [],
+        'user_orders': [],
+    }
+    pa_params: dict[str, list] = {
+        'aspect_ids': [],
+        'included': [],
+        'value_ids': [],
+    }
+    for pv_data in value_links:
+        uv_id = await get_uniquevalue_id_by_value_id_and_aspect_ids(
             value_id=pv_data['value_id'],
-            polarity=pv_data['polarity'],
-            user_order=pv_data['user_order'],
+            aspect_ids=[
+                a['aspect_id'] for a in pv_data['aspects'] if a['included']
+            ],
+            asession=asession,
         )
-        personal_value.personal_aspects = [
-            db.PersonalAspect(
-                user_id=user_id,
-                aspect_id=aspect_data['aspect_id'],
-                included=aspect_data['included'],
-            )
-            for aspect_data in pv_data['aspects']
-        ]
-        personal_value.unique_value_id = (
-            await get_uniquevalue_id_by_value_id_and_aspect_ids(
-                value_id=pv_data['value_id'],
-                aspect_ids=[
-                    a['aspect_id'] for a in pv_data['aspects'] if a['included']
-                ],
-                asession=asession,
-            )
-        )
-        personal_values.append(personal_value)
-    asession.add_all(personal_values)
-    return personal_values
+        pv_params['value_ids'].append(pv_data['value_id'])
+        pv_params['unique_value_ids'].append(uv_id)
+        pv_params['polarities'].append(pv_data['polarity'])
+        pv_params['user_orders'].append(pv_data['user_order'])
+        for aspect_data in pv_data['aspects']:
+            pa_params['aspect_ids'].append(aspect_data['aspect_id'])
+            pa_params['included'].append(aspect_data['included'])
+            pa_params['value_ids'].append(pv_data['value_id'])
+    user_id_param = bindparam('user_id', value=user_id, type_=SA_UUID)
+    await asession.execute(
+        crud.sql.upsert_personal_values.bindparams(user_id_param),
+        pv_params,
+    )
+    await asession.execute(
+        crud.sql.upsert_personal_aspects.bindparams(user_id_param),
+        pa_params,
+    )
 
 
-async def delete_personal_values(
+async def upsert_personal_values_pack(
     *,
     user_id: UUID,
+    pack: cnt.PersonalValuesPack,
     asession: AsyncSession,
 ) -> None:
-    await asession.execute(
-        delete(db.PersonalValue).where(db.PersonalValue.user_id == user_id)
+    data = {
+        'attitude_id': pack.attitude_id,
+        'value_ids': list(pack.value_ids),
+        'unique_value_ids': list(pack.unique_value_ids),
+        'positive_count': pack.positive_count,
+        'neutral_count': pack.neutral_count,
+        'aspect_mask': pack.aspect_mask,
+    }
+    stmt = insert(db.PersonalValuesPack).values(user_id=user_id, **data)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[db.PersonalValuesPack.user_id],
+        set_={**data, 'updated_at': func.now()},
+    )
+    await asession.execute(stmt)
+
+
+async def read_personal_values_pack(
+    *, user_id: UUID, asession: AsyncSession
+) -> tuple[cnt.PersonalValuesPack, bool] | None:
+    """
+    Returns a tuple: PersonalValuesPack, Profile.recommend_me.
+    None if personal values are not set.
+    """
+    result = await asession.execute(
+        select(db.PersonalValuesPack, db.Profile.recommend_me)
+        .join(db.Profile, db.Profile.user_id == db.PersonalValuesPack.user_id)
+        .where(db.PersonalValuesPack.user_id == user_id)
     )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    pack, recommend_me = row
+    return cnt.PersonalValuesPack(
+        attitude_id=pack.attitude_id,
+        value_ids=tuple(pack.value_ids),
+        unique_value_ids=tuple(pack.unique_value_ids),
+        positive_count=pack.positive_count,
+        neutral_count=pack.neutral_count,
+        aspect_mask=pack.aspect_mask,
+    ), recommend_me
@@ -72,6 +72,22 @@ async def update_profile(
     await asession.execute(stmt)
 
 
+async def set_profile_attitude(
+    *,
+    user_id: UUID,
+    attitude_id: int,
+    asession: AsyncSession,
+) -> bool:
+    """Sets Profile.attitude_id. Returns Profile.recommend_me."""
+    result = await asession.execute(
+        update(db.Profile)
+        .where(db.Profile.user_id == user_id)
+        .values(attitude_id=attitude_id)
+        .returning(db.Profile.recommend_me)
+    )
+    return result.scalar_one()
+
+
 async def create_user_dynamic(
     *,
     user_id: UUID,
@@ -1,4 +1,6 @@
-from sqlalchemy import text
+from sqlalchemy import UUID as SA_UUID
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from src.config import CFG, CNST, ENM
 
@@ -157,55 +159,36 @@ p.distance_limit,
 p.attitude_id,
 p.user_id,
 
-ARRAY(
-    SELECT pv.unique_value_id
-    FROM personalvalues pv
-    WHERE pv.user_id = p.user_id
-    AND pv.polarity = 'positive'
-    AND pv.user_order <= {CNST.NUMBER_OF_BEST_UVS}
-    ORDER BY pv.user_order
-) AS best_uv_ids,
-
-ARRAY(
-    SELECT pv.unique_value_id
-    FROM personalvalues pv
-    WHERE pv.user_id = p.user_id
-    AND pv.polarity = 'positive'
-    AND pv.user_order > {CNST.NUMBER_OF_BEST_UVS}
-    ORDER BY pv.user_order
-) AS good_uv_ids,
-
-ARRAY(
-    SELECT pv.unique_value_id
-    FROM personalvalues pv
-    WHERE pv.user_id = p.user_id
-    AND pv.polarity = 'neutral'
-    ORDER BY pv.user_order
-) AS neutral_uv_ids,
-
-ARRAY(
-    SELECT pv.unique_value_id
-    FROM personalvalues pv
-    WHERE pv.user_id = p.user_id
-    AND pv.polarity = 'negative'
-    AND pv.user_order
-    <= {CFG.PERSONAL_VALUE_MAX_ORDER - CNST.NUMBER_OF_WORST_UVS}
-    ORDER BY pv.user_order
-) AS bad_uv_ids,
-
-ARRAY(
-    SELECT pv.unique_value_id
-    FROM personalvalues pv
-    WHERE pv.user_id = p.user_id
-    AND pv.polarity = 'negative'
-    AND pv.user_order
-    > {CFG.PERSONAL_VALUE_MAX_ORDER - CNST.NUMBER_OF_WORST_UVS}
-    ORDER BY pv.user_order
-) AS worst_uv_ids
+-- slices of unique_value_ids (in user order) by polarity boundaries;
+-- empty slices (lower > upper) are '{{}}'
+pk.unique_value_ids[
+    1:LEAST(pk.positive_count, {CNST.NUMBER_OF_BEST_UVS})
+] AS best_uv_ids,
+
+pk.unique_value_ids[
+    {CNST.NUMBER_OF_BEST_UVS + 1}:pk.positive_count
+] AS good_uv_ids,
+
+pk.unique_value_ids[
+    pk.positive_count + 1:pk.positive_count + pk.neutral_count
+] AS neutral_uv_ids,
+
+pk.unique_value_ids[
+    pk.positive_count + pk.neutral_count + 1:{
+        CFG.PERSONAL_VALUE_MAX_ORDER - CNST.NUMBER_OF_WORST_UVS
+    }
+] AS bad_uv_ids,
+
+pk.unique_value_ids[
+    GREATEST(
+        pk.positive_count + pk.neutral_count + 1,
+        {CFG.PERSONAL_VALUE_MAX_ORDER - CNST.NUMBER_OF_WORST_UVS + 1}
+    ): {CFG.PERSONAL_VALUE_MAX_ORDER}
+] AS worst_uv_ids
 
 FROM profiles p
 JOIN userdynamics ud ON p.user_id = ud.user_id
-WHERE EXISTS (SELECT 1 FROM personalvalues WHERE user_id = p.user_id);
+JOIN personalvaluespacks pk ON p.user_id = pk.user_id;
     """,
     """
 CREATE UNIQUE INDEX idx_moral_profiles_user_id_unique
@@ -455,6 +438,13 @@ vacuum_limited_recommendations = text("""
 VACUUM limited_recommendations;
 """)
 
+# Read statements below are module-level with typed bind parameters,
+# values are passed at execution: SQL text stays the same, so asyncpg
+# prepares each once per connection (see PREPARED_STATEMENT_CACHE_SIZE).
+_my_user_id = bindparam('my_user_id', type_=SA_UUID)
+_other_user_id = bindparam('other_user_id', type_=SA_UUID)
+_contact_statuses = bindparam('statuses', type_=ARRAY(ENM.ContactStatusPG))
+
 read_user_recommendations = text("""
 WITH ranked_recommendations AS (
 SELECT
@@ -480,7 +470,7 @@ SELECT
     rec.distance
 
 FROM ranked_recommendations rec;
-""")
+""").bindparams(_my_user_id, _other_user_id)
 
 
 users_to_notify_of_match = text(f"""
@@ -558,22 +548,14 @@ CASE
 END as distance
 FROM my_mp_table my_mp
     JOIN other_mp_table other_mp ON true;
-""")
+""").bindparams(_my_user_id, _other_user_id)
 
 
-read_contacts = text("""
+_read_rich_contacts_template = """
 WITH
 filtered_contacts AS (
 SELECT * FROM contacts WHERE
-(my_user_id = :my_user_id OR :my_user_id is NULL)
-AND
-(other_user_id = :other_user_id OR :other_user_id is NULL)
-AND
-(status = ANY(:statuses) OR :statuses is NULL)
-),
-moral_profiles_with_names AS (
-SELECT p.name, p.location, mp.* FROM profiles p JOIN moral_profiles mp
-ON p.user_id = mp.user_id
+{contacts_filter}
 ),
 unread_counts AS (
   SELECT
@@ -586,28 +568,207 @@ unread_counts AS (
 )
 SELECT
   fc.*,
-  mpn1.name as my_profile_name,
-  mpn2.name as other_profile_name,
-  mpn1.location as my_location,
-  mpn2.location as other_location,
-  public.compare_moral_profiles(
-    mpn1.attitude_id, mpn1.best_uv_ids, mpn1.worst_uv_ids, mpn1.good_uv_ids,
-    mpn1.bad_uv_ids, mpn1.neutral_uv_ids,
-    mpn2.attitude_id, mpn2.best_uv_ids, mpn2.worst_uv_ids, mpn2.good_uv_ids,
-    mpn2.bad_uv_ids, mpn2.neutral_uv_ids
-  ) as similarity,
-CASE
-    WHEN
-        mpn1.distance_limit IS NOT NULL
-        OR mpn2.distance_limit IS NOT NULL
-    THEN ST_Distance(mpn1.location, mpn2.location) / 1000.0
-    ELSE
-        NULL
-END as distance,
-COALESCE(uc.unread_count, 0) as unread_messages
+  p1.name as my_profile_name,
+  p2.name as other_profile_name,
+  COALESCE(uc.unread_count, 0) as unread_messages
 FROM filtered_contacts fc
-JOIN moral_profiles_with_names mpn1 ON fc.my_user_id = mpn1.user_id
-JOIN moral_profiles_with_names mpn2 ON fc.other_user_id = mpn2.user_id
+JOIN profiles p1 ON fc.my_user_id = p1.user_id
+JOIN profiles p2 ON fc.other_user_id = p2.user_id
 LEFT JOIN unread_counts uc ON
-  uc.sender_id = fc.other_user_id AND uc.receiver_id = fc.my_user_id;
+  uc.sender_id = fc.other_user_id AND uc.receiver_id = fc.my_user_id
+{order_by};
+"""
+
+
+read_contacts = text(
+    _read_rich_contacts_template.format(
+        contacts_filter="""
+(my_user_id = :my_user_id OR :my_user_id is NULL)
+AND
+(other_user_id = :other_user_id OR :other_user_id is NULL)
+AND
+(status = ANY(:statuses) OR :statuses is NULL)""",
+        order_by='',
+    )
+).bindparams(_my_user_id, _other_user_id, _contact_statuses)
+
+
+# both mirrored contacts of a pair, 'my' contact first
+read_contact_pair = text(
+    _read_rich_contacts_template.format(
+        contacts_filter="""
+(my_user_id = :my_user_id AND other_user_id = :other_user_id)
+OR
+(my_user_id = :other_user_id AND other_user_id = :my_user_id)""",
+        order_by='ORDER BY fc.my_user_id = :my_user_id DESC',
+    )
+).bindparams(_my_user_id, _other_user_id)
+
+
+# sets statuses of both mirrored contacts of a pair in one statement
+update_contact_pair = text("""
+UPDATE contacts c
+SET status = new.status
+FROM (
+    VALUES
+        (
+            CAST(:my_user_id AS uuid),
+            CAST(:other_user_id AS uuid),
+            CAST(:my_status AS contact_status_enum)
+        ),
+        (
+            CAST(:other_user_id AS uuid),
+            CAST(:my_user_id AS uuid),
+            CAST(:other_status AS contact_status_enum)
+        )
+) AS new(my_user_id, other_user_id, status)
+WHERE c.my_user_id = new.my_user_id AND c.other_user_id = new.other_user_id
+RETURNING c.my_user_id, c.other_user_id, c.status;
+""")
+
+
+# recalculates snapshotted similarity and distance of contacts
+# (of all contacts, or only of the given user's ones),
+# returns ids of users whose contacts changed
+refresh_contacts_similarity_and_distance = text("""
+WITH fresh AS (
+SELECT
+    c.my_user_id,
+    c.other_user_id,
+    public.compare_moral_profiles(
+        mp1.attitude_id, mp1.best_uv_ids, mp1.worst_uv_ids, mp1.good_uv_ids,
+        mp1.bad_uv_ids, mp1.neutral_uv_ids,
+        mp2.attitude_id, mp2.best_uv_ids, mp2.worst_uv_ids, mp2.good_uv_ids,
+        mp2.bad_uv_ids, mp2.neutral_uv_ids
+    ) as similarity,
+    CASE
+        WHEN
+            mp1.distance_limit IS NOT NULL
+            OR mp2.distance_limit IS NOT NULL
+        THEN ST_Distance(p1.location, p2.location) / 1000.0
+        ELSE
+            NULL
+    END as distance
+FROM contacts c
+JOIN moral_profiles mp1 ON c.my_user_id = mp1.user_id
+JOIN profiles p1 ON c.my_user_id = p1.user_id
+JOIN moral_profiles mp2 ON c.other_user_id = mp2.user_id
+JOIN profiles p2 ON c.other_user_id = p2.user_id
+WHERE
+    :user_id IS NULL
+    OR c.my_user_id = :user_id
+    OR c.other_user_id = :user_id
+)
+UPDATE contacts c
+SET similarity = fresh.similarity, distance = fresh.distance
+FROM fresh
+WHERE
+    c.my_user_id = fresh.my_user_id
+    AND c.other_user_id = fresh.other_user_id
+    AND (c.similarity, c.distance)
+        IS DISTINCT FROM (fresh.similarity, fresh.distance)
+RETURNING c.my_user_id;
+""")
+
+
+# one row per personal value, arrays are parallel;
+# rows that did not change are not rewritten
+upsert_personal_values = text("""
+INSERT INTO personalvalues (
+    user_id, value_id, unique_value_id, polarity, user_order
+)
+SELECT
+    :user_id,
+    pv.value_id,
+    pv.unique_value_id,
+    CAST(pv.polarity AS polarity_enum),
+    pv.user_order
+FROM unnest(
+    CAST(:value_ids AS integer[]),
+    CAST(:unique_value_ids AS integer[]),
+    CAST(:polarities AS text[]),
+    CAST(:user_orders AS integer[])
+) AS pv(value_id, unique_value_id, polarity, user_order)
+ON CONFLICT ON CONSTRAINT uq_user_id_value_id DO UPDATE
+SET
+    unique_value_id = EXCLUDED.unique_value_id,
+    polarity = EXCLUDED.polarity,
+    user_order = EXCLUDED.user_order,
+    updated_at = now()
+WHERE (
+    personalvalues.unique_value_id,
+    personalvalues.polarity,
+    personalvalues.user_order
+) IS DISTINCT FROM (
+    EXCLUDED.unique_value_id, EXCLUDED.polarity, EXCLUDED.user_order
+);
+""")
+
+
+# one row per personal aspect, linked to personal value by value_id;
+# rows that did not change are not rewritten
+upsert_personal_aspects = text("""
+INSERT INTO personalaspects (
+    user_id, aspect_id, included, personal_value_id
+)
+SELECT :user_id, pa.aspect_id, pa.included, pv.id
+FROM unnest(
+    CAST(:aspect_ids AS integer[]),
+    CAST(:included AS boolean[]),
+    CAST(:value_ids AS integer[])
+) AS pa(aspect_id, included, value_id)
+JOIN personalvalues pv
+    ON pv.user_id = :user_id AND pv.value_id = pa.value_id
+ON CONFLICT ON CONSTRAINT user_aspect_unique_constraint DO UPDATE
+SET
+    included = EXCLUDED.included,
+    personal_value_id = EXCLUDED.personal_value_id,
+    updated_at = now()
+WHERE (
+    personalaspects.included, personalaspects.personal_value_id
+) IS DISTINCT FROM (EXCLUDED.included, EXCLUDED.personal_value_id);
+""")
+
+
+# changes whenever any definitions row is added, removed or edited
+definitions_version = text("""
+SELECT md5(concat_ws('|',
+    (SELECT string_agg(concat_ws(',', id, name_default), ';' ORDER BY id)
+        FROM values),
+    (SELECT string_agg(
+        concat_ws(',', id, value_id, key_phrase_default, statement_default),
+        ';' ORDER BY id
+    ) FROM aspects),
+    (SELECT string_agg(concat_ws(',', id, statement_default), ';' ORDER BY id)
+        FROM attitudes),
+    (SELECT string_agg(
+        concat_ws(',', id, value_id, language_code, name), ';' ORDER BY id
+    ) FROM valuetranslations),
+    (SELECT string_agg(
+        concat_ws(
+            ',', id, aspect_id, language_code, key_phrase, statement
+        ),
+        ';' ORDER BY id
+    ) FROM aspecttranslations),
+    (SELECT string_agg(
+        concat_ws(',', id, attitude_id, language_code, statement),
+        ';' ORDER BY id
+    ) FROM attitudetranslations),
+    (SELECT string_agg(
+        concat_ws(',', id, value_id, aspect_ids::text), ';' ORDER BY id
+    ) FROM uniquevalues)
+)) AS version;
+""")
+
+
+# seconds a replica is behind, 0 on the primary or when all received WAL
+# is replayed (an idle primary writes nothing new to replay)
+replica_lag_seconds = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+    )
+END;
 """)
@@ -6,6 +6,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src import containers as cnt
 from src import db
 from src.config import ENM
 
@@ -22,6 +23,23 @@ async def read_user_by_id(
     return await asession.scalar(select(db.User).where(db.User.id == user_id))
 
 
+async def read_principal(
+    *, user_id: UUID, asession: AsyncSession
+) -> cnt.Principal | None:
+    """Reads only the user flags access checks need."""
+    result = await asession.execute(
+        select(db.User.id, db.User.is_active, db.User.is_verified).where(
+            db.User.id == user_id
+        )
+    )
+    r = result.one_or_none()
+    if r is None:
+        return None
+    return cnt.Principal(
+        id=r.id, is_active=r.is_active, is_verified=r.is_verified
+    )
+
+
 def create_user(
     *,
     email: str,
@@ -55,6 +73,15 @@ async def get_all_valid_refresh_tokens_for_user(
     return list(results.scalars().all())
 
 
+async def read_refresh_token_by_hash(
+    *, token_hash: str, asession: AsyncSession
+) -> db.RefreshToken | None:
+    stmt = select(db.RefreshToken).where(
+        db.RefreshToken.token_hash == token_hash
+    )
+    return await asession.scalar(stmt)
+
+
 async def get_specific_refresh_token(
     jti: UUID, asession: AsyncSession
 ) -> db.RefreshToken | None:
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import Float, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.config import CNST, ENM
@@ -19,6 +19,13 @@ class Contact(Base):
     status: Mapped[str] = mapped_column(
         ENM.ContactStatusPG, default=ENM.ContactStatus.REJECTED_BY_ME.value
     )
+    # snapshots, refreshed with recommendations and on profile updates
+    similarity: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0, server_default='0'
+    )
+    distance: Mapped[float | None] = mapped_column(
+        Float, nullable=True, default=None
+    )
     my_user: Mapped[User] = relationship(
         User,
         foreign_keys=[my_user_id],
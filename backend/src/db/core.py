@@ -1,19 +1,15 @@
-import inspect
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import ForeignKey, Index, Integer, String, text
+from sqlalchemy import ForeignKey, Index, Integer, String, inspect, text
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.exc import MissingGreenlet
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
     relationship,
 )
 
-from src import exceptions as exc
 from src.config import CFG, CNST
 from src.context import get_current_language
-from src.logger import logger
 
 from .base import BaseWithIntPK
 
@@ -31,34 +27,40 @@ if TYPE_CHECKING:
     from .user_and_profile import Profile
 
 
-def _translate_attribute(self: 'Value | Aspect | Attitude'):
+def _loaded_translation(obj, lan_code: str) -> Any:
     """
-    If current language ContextVar != CFG.DEFAULT_LANGUAGE -
-    returns translated version of an attribute.
-    Related Translations must be eagerly loaded -
-    otherwise default attribute will be returned.
+    Returns obj translation to lan_code or None.
+    Only already loaded translations are used - never triggers lazy load.
     """
-    current_frame = inspect.currentframe()
-    if current_frame is None or current_frame.f_back is None:
-        msg = 'current_frame / current_frame.f_back is None'
-        logger.error(msg)
-        raise exc.ServerError(msg)
-    lan_code = get_current_language()
-    attr_name = current_frame.f_back.f_code.co_name
-    if lan_code != CFG.DEFAULT_LANGUAGE and lan_code in CFG.TRANSLATE_TO:
-        try:
-            for translation in self.translations:
-                if translation.language_code == lan_code:
-                    translation = translation
-                    return getattr(translation, attr_name)
-        except MissingGreenlet:
-            logger.error(
-                (
-                    f'_translate_attribute MissingGreenlet, {lan_code=}. '
-                    'Translations not loaded?'
-                )
-            )
-    return getattr(self, f'{attr_name}_default')
+    if 'translations' in inspect(obj).unloaded:
+        return None
+    for translation in obj.translations:
+        if translation.language_code == lan_code:
+            return translation
+    return None
+
+
+class Translated:
+    """
+    Descriptor for a translated text attribute.
+    For current language ContextVar != CFG.DEFAULT_LANGUAGE returns
+    the attribute of the eagerly loaded translation,
+    otherwise (or if not loaded) - '<attribute>_default'.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.default_name = f'{name}_default'
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        lan_code = get_current_language()
+        if lan_code != CFG.DEFAULT_LANGUAGE:
+            translation = _loaded_translation(obj, lan_code)
+            if translation is not None:
+                return getattr(translation, self.name)
+        return getattr(obj, self.default_name)
 
 
 class Value(BaseWithIntPK):
@@ -84,10 +86,7 @@ class Value(BaseWithIntPK):
         cascade='all, delete-orphan',
     )
 
-    @property
-    def name(self) -> str:
-        """Return translated name or fallback to default."""
-        return _translate_attribute(self)
+    name = Translated()
 
 
 class Aspect(BaseWithIntPK):
@@ -122,15 +121,8 @@ class Aspect(BaseWithIntPK):
         cascade='all, delete-orphan',
     )
 
-    @property
-    def key_phrase(self) -> str:
-        """Return translated key_phrase or fallback to default."""
-        return _translate_attribute(self)
-
-    @property
-    def statement(self) -> str:
-        """Return translated statement or fallback to default."""
-        return _translate_attribute(self)
+    key_phrase = Translated()
+    statement = Translated()
 
 
 class UniqueValue(BaseWithIntPK):
@@ -174,7 +166,4 @@ class Attitude(BaseWithIntPK):
         'AttitudeTranslation', back_populates='attitude'
     )
 
-    @property
-    def statement(self) -> str:
-        """Return translated statement or fallback to default."""
-        return _translate_attribute(self)
+    statement = Translated()
@@ -1,13 +1,16 @@
 from uuid import UUID
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     ForeignKey,
     Index,
     Integer,
+    SmallInteger,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.config import CFG, ENM
@@ -112,3 +115,25 @@ class PersonalAspect(BaseWithIntPK):
             name='user_aspect_unique_constraint',
         ),
     )
+
+
+class PersonalValuesPack(Base):
+    """
+    Compact copy of user's personal values, one row per user.
+    value_ids, unique_value_ids: in user order;
+    polarities: first positive_count positive, next neutral_count neutral,
+    the rest negative;
+    aspect_mask: included aspects, bit per aspect (see cnt.Definitions).
+    """
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), primary_key=True
+    )
+    attitude_id: Mapped[int] = mapped_column(
+        ForeignKey('attitudes.id', ondelete='CASCADE')
+    )
+    value_ids: Mapped[list[int]] = mapped_column(ARRAY(SmallInteger))
+    unique_value_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer))
+    positive_count: Mapped[int] = mapped_column(SmallInteger)
+    neutral_count: Mapped[int] = mapped_column(SmallInteger)
+    aspect_mask: Mapped[int] = mapped_column(BigInteger)
@@ -101,7 +101,10 @@ class RefreshToken(BaseWithIntPK):
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey('users.id', ondelete='CASCADE')
     )
-    token_hash: Mapped[str] = mapped_column(String, nullable=False)
+    # HMAC-SHA256 hex digest, or Argon2 hash for tokens issued before it
+    token_hash: Mapped[str] = mapped_column(
+        String, nullable=False, unique=True, index=True
+    )
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
     )
@@ -1,18 +1,25 @@
 from typing import Annotated, Any, AsyncGenerator
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, Query, WebSocketException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt.exceptions import ExpiredSignatureError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import crud, db
+from src import containers as cnt
+from src import crud
 from src import services as srv
 from src.logger import logger
 from src.schemas.descriptions import (
     COMMON_RESPONSES,
     ErrorResponseSchema,
 )
-from src.sessions import asession_factory, sync_session_factory
+from src.sessions import (
+    asession_factory,
+    chat_asession_factory,
+    replica_router,
+    sync_session_factory,
+)
 
 
 def get_sync_session():
@@ -25,6 +32,12 @@ async def get_async_session() -> AsyncGenerator:
         yield session
 
 
+async def get_read_async_session() -> AsyncGenerator:
+    """Session of read-only public endpoints, replica if usable."""
+    async with (await replica_router.choose())() as session:
+        yield session
+
+
 def with_common_responses(
     *,
     common_response_codes: list[int] | None = None,
@@ -51,13 +64,12 @@ def with_common_responses(
 security = HTTPBearer()
 
 
-async def get_current_user_with_asession(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    asession: AsyncSession = Depends(get_async_session),
-) -> tuple[db.User, AsyncSession]:
+def _decode_principal(
+    credentials: HTTPAuthorizationCredentials,
+) -> tuple[UUID, cnt.Principal | None]:
     token = credentials.credentials
     try:
-        user_id = srv.decode_access_token(token)
+        return srv.decode_access_token_principal(token)
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,44 +80,103 @@ async def get_current_user_with_asession(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Invalid token.',
         )
-    user = await crud.read_user_by_id(user_id=user_id, asession=asession)
-    if user is None:
+
+
+async def _ensure_principal(
+    *,
+    user_id: UUID,
+    principal: cnt.Principal | None,
+    asession: AsyncSession,
+) -> cnt.Principal:
+    """
+    Reads user flags if the token has no claims or they deny access
+    (could have changed since the token was issued).
+    """
+    if (
+        principal is None
+        or not principal.is_active
+        or not principal.is_verified
+    ):
+        principal = await crud.read_principal(
+            user_id=user_id, asession=asession
+        )
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='User not found.',
         )
-    return user, asession
+    return principal
 
 
-async def get_current_active_and_virified_user_with_asession(
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        get_current_user_with_asession
-    ),
-) -> tuple[db.User, AsyncSession]:
-    user, asession = user_and_asession
-    if not user.is_active:
+def _ensure_active_and_verified(principal: cnt.Principal) -> None:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='User deactivated.',
         )
-    if not user.is_verified:
+    if not principal.is_verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Email is not verified. Try request email verification.',
         )
-    return user, asession
+
+
+async def get_current_user_with_asession(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    asession: AsyncSession = Depends(get_async_session),
+) -> tuple[cnt.Principal, AsyncSession]:
+    """
+    Principal from access token claims, without reading the database.
+    Session is on the primary: the request may write, so the user's
+    reads are sent to the primary for a while (read-your-writes).
+    """
+    user_id, principal = _decode_principal(credentials)
+    principal = await _ensure_principal(
+        user_id=user_id, principal=principal, asession=asession
+    )
+    await replica_router.mark_users_wrote(user_id)
+    return principal, asession
+
+
+async def get_current_active_and_virified_user_with_asession(
+    principal_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        get_current_user_with_asession
+    ),
+) -> tuple[cnt.Principal, AsyncSession]:
+    principal, asession = principal_and_asession
+    _ensure_active_and_verified(principal)
+    return principal, asession
+
+
+async def get_current_active_and_virified_user_with_read_asession(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> AsyncGenerator[tuple[cnt.Principal, AsyncSession], None]:
+    """
+    As get_current_active_and_virified_user_with_asession,
+    for read-only endpoints: session is on the replica if usable
+    and the user has not written recently.
+    """
+    user_id, principal = _decode_principal(credentials)
+    asession_factory_ = await replica_router.choose(user_id)
+    async with asession_factory_() as asession:
+        principal = await _ensure_principal(
+            user_id=user_id, principal=principal, asession=asession
+        )
+        _ensure_active_and_verified(principal)
+        yield principal, asession
 
 
 async def get_current_active_and_virified_websocket_user(
     token: Annotated[str | None, Query()] = None,
-) -> db.User:
+) -> cnt.Principal:
+    """Principal as in get_current_user_with_asession."""
     if token is None:
         raise WebSocketException(
             code=status.WS_1008_POLICY_VIOLATION,
             reason='Access token not provided.',
         )
     try:
-        user_id = srv.decode_access_token(token)
+        user_id, principal = srv.decode_access_token_principal(token)
     except ExpiredSignatureError:
         raise WebSocketException(
             code=status.WS_1008_POLICY_VIOLATION, reason='Expired token.'
@@ -115,20 +186,27 @@ async def get_current_active_and_virified_websocket_user(
             code=status.WS_1008_POLICY_VIOLATION,
             reason='Invalid authentication credentials.',
         )
-    async with asession_factory() as asession:
-        user = await crud.read_user_by_id(user_id=user_id, asession=asession)
-    if user is None:
+    if (
+        principal is None
+        or not principal.is_active
+        or not principal.is_verified
+    ):
+        async with chat_asession_factory() as asession:
+            principal = await crud.read_principal(
+                user_id=user_id, asession=asession
+            )
+    if principal is None:
         logger.error(f'User ({user_id=}) not found.')
         raise WebSocketException(
             code=status.WS_1011_INTERNAL_ERROR, reason='User not found.'
         )
-    if not user.is_active:
+    if not principal.is_active:
         raise WebSocketException(
             code=status.WS_1008_POLICY_VIOLATION, reason='Inactive user.'
         )
-    if not user.is_verified:
+    if not principal.is_verified:
         raise WebSocketException(
             code=status.WS_1008_POLICY_VIOLATION,
             reason='Email is not verified.',
         )
-    return user
+    return principal
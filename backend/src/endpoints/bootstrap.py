@@ -1,26 +1,52 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import db
+from src import containers as cnt
 from src import dependencies as dp
 from src import schemas as sch
 from src import services as srv
-from src.config import CFG
+from src.config import CFG, ENM
+from src.timing import ServerTiming
 
 router = APIRouter()
 
 
 @router.get(
     CFG.PATHS.PRIVATE.BOOTSTRAP,
+    response_model=sch.ApiResponse[sch.Bootstrap],
     responses=dp.with_common_responses(
         common_response_codes=[401, 403],
     ),
 )
 async def bootstrap(
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
-) -> sch.ApiResponse[sch.Bootstrap]:
+) -> Response:
+    """
+    Served from per-user response cache when possible.
+    Per-part query and serialization durations go to Server-Timing.
+    """
     user, asession = user_and_asession
-    data, message = await srv.bootstrap(my_user=user, asession=asession)
-    return sch.ApiResponse(data=data, message=message)
+    timing = ServerTiming()
+
+    async def build() -> bytes:
+        data, message = await srv.bootstrap(
+            my_user=user, timing=timing, asession=asession
+        )
+        with timing.measure('serialization'):
+            return (
+                sch.ApiResponse[sch.Bootstrap](data=data, message=message)
+                .model_dump_json()
+                .encode()
+            )
+
+    with timing.measure('total'):
+        content, _ = await srv.get_or_cache_response(
+            user_id=user.id, kind=ENM.CachedResponse.BOOTSTRAP, build=build
+        )
+    return Response(
+        content=content,
+        media_type='application/json',
+        headers={'Server-Timing': timing.header()},
+    )
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import db
+from src import containers as cnt
 from src import dependencies as dp
 from src import schemas as sch
 from src import services as srv
-from src.config import CFG
+from src.config import CFG, ENM
 
 router = APIRouter()
 
@@ -27,8 +27,8 @@ router = APIRouter()
 )
 async def check_for_alike(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[list[sch.RecommendationRead]]:
     current_user, asession = user_and_asession
@@ -47,7 +47,7 @@ async def check_for_alike(
 )
 async def agree_to_start(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     payload: sch.TargetUser,
@@ -67,8 +67,8 @@ async def agree_to_start(
 )
 async def contacts(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[sch.ActiveContactsAndRequests]:
     current_user, asession = user_and_asession
@@ -81,20 +81,36 @@ async def contacts(
 
 @router.get(
     '/contacts-and-recommendations',
+    response_model=sch.ApiResponse[sch.ContsNReqstsNRecoms],
     responses=dp.with_common_responses(common_response_codes=[401, 403]),
 )
 async def contacts_and_recommendations(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
-) -> sch.ApiResponse[sch.ContsNReqstsNRecoms]:
+) -> Response:
     current_user, asession = user_and_asession
-    results, message = await srv.get_conts_n_reqsts_n_recoms(
-        current_user=current_user,
-        asession=asession,
+
+    async def build() -> bytes:
+        results, message = await srv.get_conts_n_reqsts_n_recoms(
+            current_user=current_user,
+            asession=asession,
+        )
+        return (
+            sch.ApiResponse[sch.ContsNReqstsNRecoms](
+                data=results, message=message
+            )
+            .model_dump_json()
+            .encode()
+        )
+
+    content, _ = await srv.get_or_cache_response(
+        user_id=current_user.id,
+        kind=ENM.CachedResponse.CONTS_N_REQSTS_N_RECOMS,
+        build=build,
     )
-    return sch.ApiResponse(data=results, message=message)
+    return Response(content=content, media_type='application/json')
 
 
 @router.post(
@@ -106,7 +122,7 @@ async def contacts_and_recommendations(
 )
 async def cancel_contact_request(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     target_user: sch.TargetUser,
@@ -129,7 +145,7 @@ async def cancel_contact_request(
 )
 async def reject_contact_request(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     target_user: sch.TargetUser,
@@ -152,7 +168,7 @@ async def reject_contact_request(
 )
 async def block_contact(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     target_user: sch.TargetUser,
@@ -174,8 +190,8 @@ async def block_contact(
 )
 async def get_rejected_requests(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[list[sch.ContactRead]]:
     current_user, asession = user_and_asession
@@ -194,8 +210,8 @@ async def get_rejected_requests(
 )
 async def get_cancelled_requests(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[list[sch.ContactRead]]:
     current_user, asession = user_and_asession
@@ -214,8 +230,8 @@ async def get_cancelled_requests(
 )
 async def get_blocked_contacts(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[list[sch.ContactRead]]:
     current_user, asession = user_and_asession
@@ -235,7 +251,7 @@ async def get_blocked_contacts(
 )
 async def unblock_contact(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     target_user: sch.TargetUser,
@@ -260,8 +276,8 @@ async def unblock_contact(
 )
 async def get_contact_profile(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
     target_user: sch.TargetUser,
 ) -> sch.ApiResponse[sch.RecommendationRead]:
@@ -280,8 +296,8 @@ async def get_contact_profile(
 )
 async def get_additional_contacts_options(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[sch.AdditionalContactsOptions]:
     current_user, asession = user_and_asession
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src import containers as cnt
 from src import dependencies as dp
 from src import schemas as sch
 from src import services as srv
 from src.config import CFG
+from src.responses import conditional_response
 
 router = APIRouter()
 
 
 @router.get(
     CFG.PATHS.PUBLIC.DEFINITIONS,
+    response_model=sch.ApiResponse[sch.DefinitionsRead],
     responses=dp.with_common_responses(
         common_response_codes=[401, 403],
         extra_responses_to_iclude={500: 'Definitions not found.'},
@@ -18,7 +21,26 @@ router = APIRouter()
 )
 async def get_definitions(
     *,
-    asession: AsyncSession = Depends(dp.get_async_session),
-) -> sch.ApiResponse[sch.DefinitionsRead]:
-    definitions_model, msg = await srv.read_definitions(asession=asession)
-    return sch.ApiResponse(data=definitions_model, message=msg)
+    request: Request,
+    asession: AsyncSession = Depends(dp.get_read_async_session),
+) -> Response:
+    rendered = await srv.get_rendered_definitions(asession=asession)
+    return conditional_response(request=request, rendered=rendered)
+
+
+@router.get(
+    CFG.PATHS.PRIVATE.METRICS,
+    responses=dp.with_common_responses(
+        common_response_codes=[401, 403],
+    ),
+)
+async def get_metrics(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_asession
+    ),
+) -> sch.ApiResponse[dict[str, float]]:
+    current_user, asession = user_and_asession
+    data, message = await srv.get_metrics(
+        current_user=current_user, asession=asession
+    )
+    return sch.ApiResponse(data=data, message=message)
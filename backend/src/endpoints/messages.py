@@ -7,7 +7,6 @@ from fastapi import (
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import containers as cnt
-from src import db
 from src import dependencies as dp
 from src import schemas as sch
 from src import services as srv
@@ -22,8 +21,8 @@ router = APIRouter()
 )
 async def count_unread_messages(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[sch.UnreadMessagesCount]:
     current_user, asession = user_and_asession
@@ -39,7 +38,7 @@ async def count_unread_messages(
 )
 async def get_messages(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     contact_user_id: UUID,
@@ -64,7 +63,7 @@ async def get_messages(
 )
 async def send_message(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     payload: sch.MessageCreate,
@@ -1,29 +1,34 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import db
+from src import containers as cnt
 from src import dependencies as dp
 from src import schemas as sch
 from src import services as srv
 from src.config import CFG
+from src.responses import conditional_response
 
 router = APIRouter()
 
 
 @router.get(
     CFG.PATHS.PRIVATE.VALUES,
+    response_model=sch.ApiResponse[sch.PersonalValuesRead],
     responses=dp.with_common_responses(common_response_codes=[401, 403]),
 )
 async def get_my_values(
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    request: Request,
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
-) -> sch.ApiResponse[sch.PersonalValuesRead]:
+) -> Response:
     current_user, asession = user_and_asession
-    user_values, message = await srv.get_personal_values(
+    rendered = await srv.get_rendered_personal_values(
         current_user=current_user, asession=asession
     )
-    return sch.ApiResponse(data=user_values, message=message)
+    return conditional_response(
+        request=request, rendered=rendered, cache_control='private, no-cache'
+    )
 
 
 @router.post(
@@ -47,7 +52,7 @@ async def get_my_values(
 )
 async def post_my_values(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     payload: sch.PersonalValuesCreateUpdate,
@@ -78,7 +83,7 @@ async def post_my_values(
 )
 async def edit_my_values(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     payload: sch.PersonalValuesCreateUpdate,
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import db
+from src import containers as cnt
 from src import dependencies as dp
 from src import schemas as sch
 from src import services as srv
@@ -18,8 +18,8 @@ router = APIRouter()
     ),
 )
 async def get_profile(
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
-        dp.get_current_active_and_virified_user_with_asession
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
+        dp.get_current_active_and_virified_user_with_read_asession
     ),
 ) -> sch.ApiResponse[sch.ProfileRead]:
     current_user, asession = user_and_asession
@@ -41,7 +41,7 @@ async def get_profile(
 )
 async def edit_profile(
     *,
-    user_and_asession: tuple[db.User, AsyncSession] = Depends(
+    user_and_asession: tuple[cnt.Principal, AsyncSession] = Depends(
         dp.get_current_active_and_virified_user_with_asession
     ),
     payload: sch.ProfileUpdate,
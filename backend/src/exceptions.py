@@ -51,6 +51,14 @@ class BadRequest(Error):
         super().__init__(message)
 
 
+class TooManyRequests(Error):
+    def __init__(
+        self,
+        message: str = 'Server is busy. Try again later.',
+    ):
+        super().__init__(message)
+
+
 class IncorrectDefinitions(Error):
     def __init__(
         self,
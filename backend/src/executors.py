@@ -0,0 +1,75 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from src import exceptions as exc
+from src.config import CFG
+from src.metrics import metrics
+
+T = TypeVar('T')
+
+
+class BoundedExecutor:
+    """
+    Thread pool for CPU-heavy calls (that release the GIL) off the event loop.
+    Rejects with TooManyRequests once max_pending calls are queued or running,
+    instead of letting the queue grow.
+    Metrics: <name>.pending, <name>.submitted, <name>.rejected,
+    <name>.queue_wait_seconds, <name>.run_seconds.
+    """
+
+    def __init__(self, *, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_pending = max_pending
+        self.pending = 0
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        metrics.register_gauge(f'{name}.pending', lambda: self.pending)
+
+    @staticmethod
+    def _timed(fn: Callable[[], T]) -> tuple[T, float, float]:
+        started_at = time.perf_counter()
+        return fn(), started_at, time.perf_counter()
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        if self.pending >= self.max_pending:
+            metrics.increment(f'{self.name}.rejected')
+            raise exc.TooManyRequests()
+        self.pending += 1
+        metrics.increment(f'{self.name}.submitted')
+        submitted_at = time.perf_counter()
+        try:
+            # metrics are recorded here: the registry is not thread-safe
+            (
+                result,
+                started_at,
+                finished_at,
+            ) = await asyncio.get_running_loop().run_in_executor(
+                self._pool, self._timed, partial(fn, *args, **kwargs)
+            )
+        finally:
+            self.pending -= 1
+        metrics.increment(
+            f'{self.name}.queue_wait_seconds', started_at - submitted_at
+        )
+        metrics.increment(f'{self.name}.run_seconds', finished_at - started_at)
+        return result
+
+    def shut_down(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+password_executor = BoundedExecutor(
+    name='password_hashing',
+    max_workers=CFG.PASSWORD_HASHING_WORKERS,
+    max_pending=CFG.PASSWORD_HASHING_MAX_PENDING,
+)
+
+password_strength_executor = BoundedExecutor(
+    name='password_strength',
+    max_workers=CFG.PASSWORD_STRENGTH_WORKERS,
+    max_pending=CFG.PASSWORD_STRENGTH_MAX_PENDING,
+)
@@ -2,11 +2,33 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from src.services import chat_manager
+from src import exceptions as exc
+from src.executors import password_executor, password_strength_executor
+from src.logger import logger
+from src.pwned_passwords import (
+    get_pwned_passwords_index,
+    pwned_passwords_client,
+)
+from src.redis_client import aredis_client, aredis_pubsub_client
+from src.services import chat_manager, prerender_definitions
+from src.sessions import asession_factory
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await chat_manager.start_up()
+    # fails startup on a misconfigured index
+    get_pwned_passwords_index()
+    try:
+        async with asession_factory() as asession:
+            await prerender_definitions(asession=asession)
+    except Exception as e:
+        # rendered on first request then
+        logger.warning(f'Definitions not prerendered: {exc.get_error_msg(e)}')
     yield
     await chat_manager.shut_down()
+    password_executor.shut_down()
+    password_strength_executor.shut_down()
+    await pwned_passwords_client.aclose()
+    await aredis_client.aclose()
+    await aredis_pubsub_client.aclose()
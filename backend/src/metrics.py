@@ -0,0 +1,25 @@
+from typing import Callable
+
+
+class Metrics:
+    """Process-local counters and gauges, read by superusers."""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def register_gauge(self, name: str, read: Callable[[], float]) -> None:
+        """read: called on every snapshot, must be cheap."""
+        self._gauges[name] = read
+
+    def snapshot(self) -> dict[str, float]:
+        values = dict(self._counters)
+        for name, read in self._gauges.items():
+            values[name] = read()
+        return dict(sorted(values.items()))
+
+
+metrics = Metrics()
@@ -1,6 +1,7 @@
-from fastapi import Request, Response, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src import exceptions as exc
 from src.config import CFG
@@ -8,56 +9,79 @@ from src.context import set_current_language
 from src.logger import logger
 
 
-class ExceptionsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        logger.info('ExceptionsMiddleware called')
-        try:
-            return await call_next(request)
-        except exc.NotFound as e:
-            return JSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={'detail': exc.get_error_msg(e)},
-            )
-        except exc.Forbidden as e:
-            return JSONResponse(
-                status_code=status.HTTP_403_FORBIDDEN,
-                content={'detail': exc.get_error_msg(e)},
-            )
-        except exc.Unauthorized as e:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={'detail': exc.get_error_msg(e)},
-            )
-        except exc.AlreadyExists as e:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={'detail': exc.get_error_msg(e)},
-            )
-        except exc.BadRequest as e:
+def _error_response(e: Exception) -> JSONResponse:
+    match e:
+        case exc.NotFound():
+            status_code = status.HTTP_404_NOT_FOUND
+        case exc.Forbidden():
+            status_code = status.HTTP_403_FORBIDDEN
+        case exc.Unauthorized():
+            status_code = status.HTTP_401_UNAUTHORIZED
+        case exc.AlreadyExists() | exc.BadRequest():
+            status_code = status.HTTP_400_BAD_REQUEST
+        case exc.TooManyRequests():
             return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={'detail': exc.get_error_msg(e)},
+                headers={'Retry-After': '1'},
             )
-        except (exc.ServerError, Exception):
+        case _:
             return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={'detail': 'Something went wrong.'},
             )
+    return JSONResponse(
+        status_code=status_code, content={'detail': exc.get_error_msg(e)}
+    )
+
+
+class ExceptionsMiddleware:
+    """
+    Maps exceptions to JSON error responses.
+    Pure ASGI: no task or body stream per request, unlike BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        response_started = False
 
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+            await send(message)
 
-class LanguageMiddleware(BaseHTTPMiddleware):
+        try:
+            await self.app(scope, receive, tracking_send)
+        except Exception as e:
+            if response_started:
+                # too late for an error response
+                logger.error(
+                    f'Error after response started: {exc.get_error_msg(e)}'
+                )
+                raise
+            await _error_response(e)(scope, receive, send)
+
+
+class LanguageMiddleware:
     """Parses request header and sets current language ContextVar."""
 
-    async def dispatch(self, request: Request, call_next):
-        logger.info('LanguageMiddleware called')
-        accept_language_header = request.headers.get('accept-language')
-        if not accept_language_header:
-            set_current_language(CFG.DEFAULT_LANGUAGE)
-        else:
-            lan_code = accept_language_header.split(',')[0][:2].lower()
-            if lan_code in CFG.SUPPORTED_LANGUAGES:
-                set_current_language(lan_code)
-            else:
-                set_current_language(CFG.DEFAULT_LANGUAGE)
-        response = await call_next(request)
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] == 'http':
+            accept_language_header = Headers(scope=scope).get(
+                'accept-language'
+            )
+            language = CFG.DEFAULT_LANGUAGE
+            if accept_language_header:
+                lan_code = accept_language_header.split(',')[0][:2].lower()
+                if lan_code in CFG.SUPPORTED_LANGUAGES:
+                    language = lan_code
+            set_current_language(language)
+        await self.app(scope, receive, send)
@@ -0,0 +1,134 @@
+"""
+Breached password lookups: a local index built from the Have I Been Pwned
+SHA-1 dataset, or the k-anonymity range API (first 5 hex chars of SHA-1
+sent, suffixes of the range received).
+"""
+
+import hashlib
+import mmap
+import os
+from pathlib import Path
+
+import httpx
+from async_lru import alru_cache
+
+from src.config import CFG
+
+DIGEST_SIZE = 20  # SHA-1
+
+
+class PwnedPasswordsIndex:
+    """
+    Memory-mapped file of sorted raw SHA-1 digests, DIGEST_SIZE bytes each,
+    looked up by binary search. Pages are loaded by the OS on demand
+    and shared between worker processes.
+    """
+
+    def __init__(self, path: str | Path):
+        with open(path, 'rb') as file:
+            file_size = os.fstat(file.fileno()).st_size
+            # empty files can not be mapped
+            if not file_size or file_size % DIGEST_SIZE:
+                raise ValueError(f'{path} is not a pwned passwords index.')
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = file_size // DIGEST_SIZE
+
+    def __contains__(self, digest: bytes) -> bool:
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * DIGEST_SIZE
+            found = self._mmap[offset : offset + DIGEST_SIZE]
+            if found == digest:
+                return True
+            if found < digest:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+def build_pwned_passwords_index(
+    *, source: Path, target: Path, min_count: int = 1
+) -> int:
+    """
+    Converts the HIBP dataset ("HASH:COUNT" lines ordered by hash,
+    as written by PwnedPasswordsDownloader) to an index file.
+    Hashes seen less than min_count times are left out.
+    Returns number of written digests, raises ValueError if none
+    (an empty index can not be loaded).
+    """
+    written = 0
+    previous = b''
+    with open(source) as lines, open(target, 'wb') as index:
+        for line in lines:
+            sha1_hash, _, count = line.strip().partition(':')
+            if not sha1_hash or int(count or 0) < min_count:
+                continue
+            digest = bytes.fromhex(sha1_hash)
+            if len(digest) != DIGEST_SIZE or digest <= previous:
+                raise ValueError(
+                    f'{source}: expected SHA-1 hashes in ascending order, '
+                    f'got {sha1_hash!r} after {previous.hex().upper()!r}.'
+                )
+            index.write(digest)
+            previous = digest
+            written += 1
+    if not written:
+        target.unlink()
+        raise ValueError(
+            f'{source}: no hashes seen at least {min_count} times.'
+        )
+    return written
+
+
+_index: PwnedPasswordsIndex | None = None
+
+
+def get_pwned_passwords_index() -> PwnedPasswordsIndex | None:
+    """Index of CFG.PWNED_PASSWORDS_INDEX_PATH, None if not configured."""
+    global _index
+    if _index is None and CFG.PWNED_PASSWORDS_INDEX_PATH:
+        _index = PwnedPasswordsIndex(CFG.PWNED_PASSWORDS_INDEX_PATH)
+    return _index
+
+
+# shared for connection reuse, closed on shutdown
+pwned_passwords_client = httpx.AsyncClient(
+    base_url='https://api.pwnedpasswords.com',
+    timeout=CFG.PWNED_PASSWORDS_TIMEOUT_SECONDS,
+    # responses padded with fake zero-count suffixes to hide range size
+    headers={'Add-Padding': 'true'},
+)
+
+
+@alru_cache(
+    maxsize=CFG.PWNED_PASSWORDS_RANGE_CACHE_SIZE,
+    ttl=CFG.PWNED_PASSWORDS_RANGE_CACHE_TTL_SECONDS,
+)
+async def read_pwned_range(prefix: str) -> frozenset[str]:
+    """
+    Hash suffixes of the range, from the API.
+    Raises httpx errors, which are not cached.
+    """
+    response = await pwned_passwords_client.get(f'/range/{prefix}')
+    response.raise_for_status()
+    suffixes = set()
+    for line in response.text.splitlines():
+        suffix, _, count = line.partition(':')
+        if int(count) > 0:
+            suffixes.add(suffix)
+    return frozenset(suffixes)
+
+
+async def is_password_pwned(password: str) -> bool:
+    """Looks up local index if configured, else the range API."""
+    digest = hashlib.sha1(password.encode('utf-8')).digest()
+    index = get_pwned_passwords_index()
+    if index is not None:
+        return digest in index
+    sha1_hash = digest.hex().upper()
+    return sha1_hash[5:] in await read_pwned_range(sha1_hash[:5])
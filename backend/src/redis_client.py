@@ -1,7 +1,9 @@
 import redis
+import redis.asyncio as redis_a
 
 from src.config import CFG
 
+# sync clients: Celery tasks and CLI only, they block the event loop
 redis_client = redis.Redis(
     host=CFG.REDIS_HOST,
     port=CFG.REDIS_PORT,
@@ -17,3 +19,17 @@ redis_pubsub_client = redis.Redis(
     decode_responses=True,
     encoding='utf-8',
 )
+
+# async clients: FastAPI process, pooled, closed on shutdown
+# bytes in / bytes out, used for cached responses and email codes
+aredis_client = redis_a.Redis(
+    host=CFG.REDIS_HOST,
+    port=CFG.REDIS_PORT,
+    db=CFG.REDIS_MAIN_DB,
+)
+
+aredis_pubsub_client = redis_a.Redis(
+    host=CFG.REDIS_HOST,
+    port=CFG.REDIS_PORT,
+    db=CFG.REDIS_PUBSUB_DB,
+)
@@ -0,0 +1,50 @@
+from hashlib import md5
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from src import containers as cnt
+
+
+def render_response(model: BaseModel) -> cnt.RenderedResponse:
+    """Serializes model to JSON bytes, ETag is the content hash."""
+    content = model.model_dump_json().encode()
+    return cnt.RenderedResponse(
+        content=content, etag=f'"{md5(content).hexdigest()}"'
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == '*':
+        return True
+    return any(
+        tag.strip().removeprefix('W/') == etag
+        for tag in if_none_match.split(',')
+    )
+
+
+def conditional_response(
+    *,
+    request: Request,
+    rendered: cnt.RenderedResponse,
+    cache_control: str = 'no-cache',
+) -> Response:
+    """
+    Returns rendered JSON,
+    or empty 304 if request's If-None-Match matches its ETag.
+    """
+    headers = {
+        'ETag': rendered.etag,
+        'Cache-Control': cache_control,
+        'Vary': 'Accept-Language',
+    }
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and _etag_matches(if_none_match, rendered.etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    return Response(
+        content=rendered.content,
+        media_type='application/json',
+        headers=headers,
+    )
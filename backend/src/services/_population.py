@@ -0,0 +1,235 @@
+import math
+import random
+import time
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from src import containers as cnt
+from src import crud
+from src import exceptions as exc
+from src import services as srv
+from src.config import CFG, ENM
+from src.logger import async_catch, logger
+from src.sessions import background_asession_factory
+
+KM_PER_DEGREE = 111.32
+
+
+def _weighted_order(
+    *, items: list[int], weights: list[float], rng: random.Random
+) -> list[int]:
+    """Weighted random permutation (Efraimidis-Spirakis keys)."""
+    keys = [rng.random() ** (1 / weight) for weight in weights]
+    return [item for _, item in sorted(zip(keys, items), reverse=True)]
+
+
+def _random_location(
+    *, config: cnt.PopulationConfig, rng: random.Random
+) -> tuple[float | None, float | None]:
+    """Returns (longitude, latitude) or (None, None)."""
+    if not config.location_centers or rng.random() >= config.located_share:
+        return None, None
+    (center,) = rng.choices(
+        config.location_centers,
+        weights=[c.weight for c in config.location_centers],
+    )
+    distance_km = center.radius_km * math.sqrt(rng.random())
+    angle = rng.uniform(0, 2 * math.pi)
+    latitude = center.latitude + (
+        distance_km * math.sin(angle) / KM_PER_DEGREE
+    )
+    longitude = center.longitude + distance_km * math.cos(angle) / (
+        KM_PER_DEGREE * max(math.cos(math.radians(center.latitude)), 0.01)
+    )
+    latitude = max(min(latitude, 90), -90)
+    longitude = (longitude + 180) % 360 - 180
+    return longitude, latitude
+
+
+def _random_contacts(
+    *, user_ids: list[UUID], contacts_per_user: int, rng: random.Random
+) -> list[tuple]:
+    """Ongoing contacts (both directions) between users of one batch."""
+    if contacts_per_user <= 0 or len(user_ids) < 2:
+        return []
+    pairs = set()
+    for i in range(len(user_ids)):
+        for _ in range(max(contacts_per_user // 2, 1)):
+            j = rng.randrange(len(user_ids) - 1)
+            j += j >= i
+            pairs.add((min(i, j), max(i, j)))
+    status = ENM.ContactStatus.ONGOING.value
+    contacts = []
+    for i, j in pairs:
+        contacts.append((user_ids[i], user_ids[j], status))
+        contacts.append((user_ids[j], user_ids[i], status))
+    return contacts
+
+
+def generate_population_batch(
+    *,
+    config: cnt.PopulationConfig,
+    definitions: cnt.Definitions,
+    first_index: int,
+    size: int,
+    password_hash: str,
+    rng: random.Random,
+) -> cnt.PopulationBatch:
+    """
+    Generates records for size synthetic users,
+    consistent with what the API would have written for them.
+    """
+    attitude_ids = sorted(definitions.attitude_ids)
+    value_ids = sorted(definitions.value_aspect_ids)
+    value_weights = [
+        1 / (rank + 1) ** config.best_values_skew
+        for rank in range(len(value_ids))
+    ]
+    sorted_aspect_ids = {
+        value_id: sorted(aspect_ids)
+        for value_id, aspect_ids in definitions.value_aspect_ids.items()
+    }
+    now = datetime.now(timezone.utc)
+    batch = cnt.PopulationBatch(
+        users=[],
+        profiles=[],
+        userdynamics=[],
+        personal_values=[],
+        personal_aspects=[],
+        packs=[],
+        contacts=[],
+    )
+    user_ids = []
+    for index in range(first_index, first_index + size):
+        user_id = uuid4()
+        user_ids.append(user_id)
+        (attitude_id,) = rng.choices(
+            attitude_ids, weights=config.attitude_weights
+        )
+        batch.users.append(
+            (
+                user_id,
+                f'{config.email_prefix}{index}@{config.email_domain}',
+                password_hash,
+                True,
+                True,
+                False,
+            )
+        )
+        longitude, latitude = _random_location(config=config, rng=rng)
+        batch.profiles.append(
+            (
+                user_id,
+                attitude_id,
+                [rng.choice(CFG.SUPPORTED_LANGUAGES)],
+                longitude,
+                latitude,
+                rng.choice(config.distance_limits_km),
+                f'{config.email_prefix.capitalize()} {index}',
+                True,
+            )
+        )
+        batch.userdynamics.append(
+            (user_id, ENM.SearchAllowedStatus.OK.value, now, [], 0)
+        )
+        positive_count, negative_start = sorted(
+            (
+                rng.randint(0, len(value_ids)),
+                rng.randint(0, len(value_ids)),
+            )
+        )
+        neutral_count = negative_start - positive_count
+        unique_value_ids = []
+        aspect_mask = 0
+        ordered_value_ids = _weighted_order(
+            items=value_ids, weights=value_weights, rng=rng
+        )
+        for i, value_id in enumerate(ordered_value_ids):
+            if i < positive_count:
+                polarity = ENM.Polarity.POSITIVE
+            elif i < negative_start:
+                polarity = ENM.Polarity.NEUTRAL
+            else:
+                polarity = ENM.Polarity.NEGATIVE
+            included_aspect_ids = []
+            for aspect_id in sorted_aspect_ids[value_id]:
+                included = rng.random() < config.aspect_inclusion
+                batch.personal_aspects.append(
+                    (user_id, value_id, aspect_id, included)
+                )
+                if included:
+                    included_aspect_ids.append(aspect_id)
+                    aspect_mask |= 1 << definitions.aspect_bits[aspect_id]
+            unique_value_id = definitions.unique_value_ids[
+                (value_id, frozenset(included_aspect_ids))
+            ]
+            unique_value_ids.append(unique_value_id)
+            batch.personal_values.append(
+                (user_id, value_id, unique_value_id, polarity.value, i + 1)
+            )
+        batch.packs.append(
+            (
+                user_id,
+                attitude_id,
+                ordered_value_ids,
+                unique_value_ids,
+                positive_count,
+                neutral_count,
+                aspect_mask,
+            )
+        )
+    batch.contacts = _random_contacts(
+        user_ids=user_ids,
+        contacts_per_user=config.contacts_per_user,
+        rng=rng,
+    )
+    return batch
+
+
+@async_catch(to_raise=True)
+async def populate_db(*, config: cnt.PopulationConfig) -> None:
+    """
+    Bulk-writes config.users synthetic users with profiles, dynamics,
+    personal values (with packs) and contacts, batch per transaction.
+    Materialized views and contact snapshots are left to
+    refresh_materialized_views.
+    """
+    async with background_asession_factory() as asession:
+        definitions = await crud.read_cached_definitions(asession=asession)
+    if config.attitude_weights is not None and len(
+        config.attitude_weights
+    ) != len(definitions.attitude_ids):
+        raise exc.BadRequest(
+            f'{len(config.attitude_weights)} attitude_weights for '
+            f'{len(definitions.attitude_ids)} Attitudes.'
+        )
+    rng = random.Random(config.seed)
+    password_hash = srv.get_value_hash(config.password)
+    started = time.perf_counter()
+    last_index = config.first_index + config.users
+    for first_index in range(
+        config.first_index, last_index, config.batch_size
+    ):
+        batch = generate_population_batch(
+            config=config,
+            definitions=definitions,
+            first_index=first_index,
+            size=min(config.batch_size, last_index - first_index),
+            password_hash=password_hash,
+            rng=rng,
+        )
+        async with background_asession_factory() as asession:
+            async with asession.begin():
+                await crud.copy_population_batch(
+                    batch=batch, asession=asession
+                )
+        written = first_index + len(batch.users) - config.first_index
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f'{written}/{config.users} synthetic users written, '
+            f'{written / elapsed:.0f} users/s.'
+        )
+    async with background_asession_factory() as asession:
+        await crud.analyze_population_tables(asession=asession)
+        await asession.commit()
+    logger.info('Synthetic population written.')
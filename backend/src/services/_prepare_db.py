@@ -3,10 +3,10 @@ from getpass import getpass
 from pandas import DataFrame, read_excel
 
 from src import crud, db
-from src import dependencies as dp
 from src import services as srv
 from src.config.config import CFG
 from src.logger import async_catch, logger
+from src.sessions import background_asession_factory
 
 
 def check_file_data_consistency(
@@ -90,7 +90,7 @@ def read_basic_data_from_file(*, path: str = CFG.BASIC_DATA_PATH) -> dict:
 
 
 async def clear_db() -> None:
-    async with dp.asession_factory() as asession:
+    async with background_asession_factory() as asession:
         some_user = await crud.read_first_user(asession=asession)
         if some_user is not None:
             answer = 'dunno'
@@ -109,7 +109,7 @@ async def add_basic_data_to_db(
     *,
     input_data: dict,
 ) -> None:
-    async with dp.asession_factory() as asession:
+    async with background_asession_factory() as asession:
         async with asession.begin():
             await crud.create_attitudes(
                 attitudes_data=input_data['attitudes'], asession=asession
@@ -178,12 +178,13 @@ async def prepare_db():
     else - compares file data to
     """
     input_data = read_basic_data_from_file()
-    async with dp.asession_factory() as asession:
+    async with background_asession_factory() as asession:
         definitions = await crud.read_values(asession=asession)
         attitudes = await crud.read_attitudes(asession=asession)
         u_v_s = await crud.read_unique_values(asession=asession)
     if all((not definitions, not attitudes, not u_v_s)):
         await add_basic_data_to_db(input_data=input_data)
+        crud.definitions_cache.invalidate()
     else:
         compare_db_to_file_data(
             db_definitions=definitions,
@@ -191,7 +192,7 @@ async def prepare_db():
             db_u_v_s=u_v_s,
             input_data=input_data,
         )
-    async with dp.asession_factory() as asession:
+    async with background_asession_factory() as asession:
         await crud.prepare_funcs_and_matviews(asession=asession)
         await asession.commit()
     logger.info('DB prepared.')
@@ -202,7 +203,7 @@ async def add_superuser():
     password1 = getpass('Password: ')
     password2 = getpass('Repeat password: ')
     assert password1 == password2, 'Typo in password?'
-    async with dp.asession_factory() as asession:
+    async with background_asession_factory() as asession:
         await srv.user.create_superuser(
             email=email, password=password1, asession=asession
         )
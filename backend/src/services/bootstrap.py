@@ -1,41 +1,128 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from src import crud
 from src import schemas as sch
 from src import services as srv
-from src.config import ENM
+from src.config import CFG, ENM
 from src.services.utils import other as other
+from src.timing import ServerTiming
+
+T = TypeVar('T')
+
+
+# per engine and worker process, see CFG.BOOTSTRAP_EXTRA_CONNECTIONS
+_extra_connection_slots: dict[AsyncEngine, asyncio.Semaphore] = {}
+
+
+def _get_extra_connection_slots(engine: AsyncEngine) -> asyncio.Semaphore:
+    slots = _extra_connection_slots.get(engine)
+    if slots is None:
+        slots = asyncio.Semaphore(CFG.BOOTSTRAP_EXTRA_CONNECTIONS)
+        _extra_connection_slots[engine] = slots
+    return slots
+
+
+async def _timed_part(
+    *,
+    name: str,
+    query: Callable[[AsyncSession], Awaitable[T]],
+    timing: ServerTiming,
+    asession: AsyncSession,
+    asession_lock: asyncio.Lock,
+    extra_connections: asyncio.Semaphore | None = None,
+) -> T:
+    """
+    Runs query and records its duration in timing.
+    On a separate session (pooled connection of asession's engine)
+    if extra_connections has a free slot, never waiting for one:
+    a request holding its connection while waiting for more
+    could exhaust the pool. Otherwise on asession, a part at a time.
+    """
+    with timing.measure(name):
+        if extra_connections is not None and not extra_connections.locked():
+            async with extra_connections:
+                async with AsyncSession(
+                    asession.bind, expire_on_commit=False
+                ) as own_asession:
+                    return await query(own_asession)
+        async with asession_lock:
+            return await query(asession)
 
 
 async def bootstrap(
-    *, my_user, asession: AsyncSession
+    *,
+    my_user,
+    timing: ServerTiming | None = None,
+    asession: AsyncSession,
 ) -> tuple[sch.Bootstrap, str]:
     """
     Returns UpdateRead schema:
     current user profile, contacts with unread messages counts,
     contacts requests, recommendations.
+    Parts are read concurrently, each on its own connection
+    while the worker's extra connections last (profile and the rest
+    reuse asession); durations are recorded in timing.
     """
-    profile, _ = await srv.get_profile(current_user=my_user, asession=asession)
-    recommendations = await other.get_recommendations(
-        my_user_id=my_user.id, asession=asession
-    )
+    timing = timing or ServerTiming()
+    # parts are read from the same database (primary or replica) as asession
+    asession_lock = asyncio.Lock()
+    extra_connections = _get_extra_connection_slots(asession.bind)
     (
-        active_contacts_and_requests,
-        _,
-    ) = await srv.get_contacts_and_requests(
-        current_user=my_user,
-        asession=asession,
+        (profile, _),
+        recommendations,
+        (active_contacts_and_requests, _),
+        ud,
+    ) = await asyncio.gather(
+        _timed_part(
+            name='profile',
+            query=lambda s: srv.get_profile(current_user=my_user, asession=s),
+            timing=timing,
+            asession=asession,
+            asession_lock=asession_lock,
+        ),
+        _timed_part(
+            name='recommendations',
+            query=lambda s: other.get_recommendations(
+                my_user_id=my_user.id, asession=s
+            ),
+            timing=timing,
+            asession=asession,
+            asession_lock=asession_lock,
+            extra_connections=extra_connections,
+        ),
+        _timed_part(
+            name='contacts',
+            query=lambda s: srv.get_contacts_and_requests(
+                current_user=my_user, asession=s
+            ),
+            timing=timing,
+            asession=asession,
+            asession_lock=asession_lock,
+            extra_connections=extra_connections,
+        ),
+        _timed_part(
+            name='user_dynamics',
+            query=lambda s: crud.read_user_dynamics(
+                user_id=my_user.id, asession=s
+            ),
+            timing=timing,
+            asession=asession,
+            asession_lock=asession_lock,
+            extra_connections=extra_connections,
+        ),
     )
     filtered_recoms = []
-    ud = await crud.read_user_dynamics(user_id=my_user.id, asession=asession)
     if ud.search_allowed_status != ENM.SearchAllowedStatus.COOLDOWN:
-        contacts_user_ids = [
+        contacts_user_ids = {
             req.user_id
             for req in [
                 *active_contacts_and_requests.contact_requests,
                 *active_contacts_and_requests.active_contacts,
             ]
-        ]
+        }
         filtered_recoms = [
             rec
             for rec in recommendations
@@ -16,27 +16,37 @@ from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
 
 from src import containers as cnt
-from src import crud, db
+from src import crud
 from src import exceptions as exc
 from src import schemas as sch
 from src import services as srv
 from src.config import CFG, ENM
 from src.logger import async_catch, logger
-from src.sessions import asession_factory
+from src.metrics import metrics
+from src.sessions import chat_asession_factory
 
 
 class ReentrantLock:
-    """Reentrant asyncio lock"""
+    """Reentrant asyncio lock, collects wait stats of outer acquisitions."""
 
     def __init__(self):
         self._lock = asyncio.Lock()
         self._task: asyncio.Task | None = None
         self._depth = 0
+        self.wait_stats = cnt.LockWaitStats()
 
     async def __aenter__(self):
         current_task = asyncio.current_task()
         if self._task is not current_task:
+            contended = self._lock.locked()
+            start = time.perf_counter()
             await self._lock.acquire()
+            waited = time.perf_counter() - start
+            stats = self.wait_stats
+            stats.acquisitions += 1
+            stats.contended += contended
+            stats.wait_seconds += waited
+            stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
             self._task = current_task
         self._depth += 1
         return self
@@ -225,7 +235,7 @@ class ChatManager:
                     connection = self.connections[target_user_id]
                     await connection.ws.send_text(valid_json)
                     if isinstance(schema.related_content, sch.MessageRead):
-                        async with asession_factory() as asession:
+                        async with chat_asession_factory() as asession:
                             await crud.mark_as_read(
                                 sender_id=schema.related_content.sender_id,
                                 receiver_id=schema.related_content.receiver_id,
@@ -233,6 +243,9 @@ class ChatManager:
                                 asession=asession,
                             )
                             await asession.commit()
+                        await srv.invalidate_cached_responses(
+                            schema.related_content.receiver_id
+                        )
                 else:
                     if isinstance(schema.related_content, sch.MessageRead):
                         redis = await self.redis
@@ -303,7 +316,7 @@ class ChatManager:
     ):
         received_timestamp = sch.get_now_timestamp_for_zod()
         try:
-            async with asession_factory() as asession:
+            async with chat_asession_factory() as asession:
                 await srv.add_message(
                     current_user_id=current_user_id,
                     data=msg_data,
@@ -436,7 +449,7 @@ class ChatManager:
     async def manage_chat(
         self,
         *,
-        current_user: db.User,
+        current_user: cnt.Principal,
         websocket: WebSocket,
     ) -> str:
         user_id = current_user.id
@@ -488,3 +501,10 @@ class ChatManager:
 
 
 chat_manager = ChatManager()
+metrics.register_gauge(
+    'chat.connections', lambda: len(chat_manager.connections)
+)
+metrics.register_gauge(
+    'chat.lock_wait_seconds',
+    lambda: chat_manager._lock.wait_stats.wait_seconds,
+)
@@ -2,18 +2,19 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import crud, db
+from src import containers as cnt
+from src import crud
 from src import exceptions as exc
 from src import schemas as sch
 from src.config import CNST, ENM
-from src.redis_client import redis_pubsub_client
+from src.redis_client import aredis_pubsub_client
 
 from . import utils as utl
 
 
 async def get_contacts_and_requests(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     asession: AsyncSession,
 ) -> tuple[sch.ActiveContactsAndRequests, str]:
     """
@@ -51,7 +52,7 @@ async def get_contacts_and_requests(
 
 async def get_rejected_requests(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     asession: AsyncSession,
 ) -> tuple[list[sch.ContactRead], str]:
     """
@@ -74,7 +75,7 @@ async def get_rejected_requests(
 
 async def get_cancelled_requests(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     asession: AsyncSession,
 ) -> tuple[list[sch.ContactRead], str]:
     """
@@ -97,7 +98,7 @@ async def get_cancelled_requests(
 
 async def get_blocked_contacts(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     asession: AsyncSession,
 ) -> tuple[list[sch.ContactRead], str]:
     """Reads blocked contacts, returns as ContactRead schema."""
@@ -112,7 +113,7 @@ async def get_blocked_contacts(
 
 
 async def check_for_alike(
-    *, current_user: db.User, asession: AsyncSession
+    *, current_user: cnt.Principal, asession: AsyncSession
 ) -> tuple[list[sch.RecommendationRead], str]:
     """
     Checks search_allowed_status and if personal values are set.
@@ -143,7 +144,7 @@ async def check_for_alike(
 
 async def get_conts_n_reqsts_n_recoms(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     asession: AsyncSession,
 ) -> tuple[sch.ContsNReqstsNRecoms, str]:
     conts_n_reqsts, _ = await get_contacts_and_requests(
@@ -161,7 +162,7 @@ async def get_conts_n_reqsts_n_recoms(
 
 async def agree_to_start(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     other_user_id: UUID,
     asession: AsyncSession,
 ) -> tuple[sch.ActiveContactsAndRequests, str]:
@@ -198,30 +199,25 @@ async def agree_to_start(
     )
     await crud.unsuspend(user_id=current_user.id, asession=asession)
 
-    (
-        (my_contact, others_contact),
-        created,
-    ) = await utl.create_or_get_contact_pair(
+    contact_pair, created = await utl.create_or_get_contact_pair(
         my_user_id=current_user.id,
         other_user_id=other_user_id,
+        other_profile=requested_profile,
         asession=asession,
     )
+    my_contact, others_contact = contact_pair
+    change_type = None
     match my_contact.status, created:
         case ENM.ContactStatus.REQUESTED_BY_ME, _:  # new contact request
-            utl.notify_of_contact_change(
-                contact=others_contact,
-                change_type=ENM.ChatPayloadType.NEW_REQUEST,
-                redis_pubsub_client=redis_pubsub_client,
-            )
+            change_type = ENM.ChatPayloadType.NEW_REQUEST
             message = 'Accepted. Waiting for the other user.'
 
         case (  # contact request accepted
             ENM.ContactStatus.REQUESTED_BY_OTHER,
             False,
         ):
-            await utl.update_contact_pair(
-                my_user_id=current_user.id,
-                other_user_id=other_user_id,
+            _, others_contact = await utl.update_contact_pair(
+                contact_pair=contact_pair,
                 my_contact_status=ENM.ContactStatus.ONGOING,
                 asession=asession,
             )
@@ -229,11 +225,7 @@ async def agree_to_start(
                 user_ids=[current_user.id, other_user_id],
                 asession=asession,
             )
-            utl.notify_of_contact_change(
-                contact=others_contact,
-                change_type=ENM.ChatPayloadType.NEW_CHAT,
-                redis_pubsub_client=redis_pubsub_client,
-            )
+            change_type = ENM.ChatPayloadType.NEW_CHAT
             message = 'Chat started!'
 
         # changed mind after contact request been cancelled/rejected
@@ -242,32 +234,35 @@ async def agree_to_start(
             | ENM.ContactStatus.REJECTED_BY_ME,
             False,
         ):
-            await utl.update_contact_pair(
-                my_user_id=current_user.id,
-                other_user_id=other_user_id,
+            _, others_contact = await utl.update_contact_pair(
+                contact_pair=contact_pair,
                 my_contact_status=ENM.ContactStatus.REQUESTED_BY_ME,
                 asession=asession,
             )
-            utl.notify_of_contact_change(
-                contact=others_contact,
-                change_type=ENM.ChatPayloadType.NEW_REQUEST,
-                redis_pubsub_client=redis_pubsub_client,
-            )
+            change_type = ENM.ChatPayloadType.NEW_REQUEST
             message = 'Accepted. Waiting for the other user.'
 
         # requested contact have invalid status
         case _, _:
             message = f'Contact status is: {my_contact.status}.'
     await asession.commit()
+    await utl.invalidate_cached_responses(current_user.id, other_user_id)
     contacts_and_requests, _ = await get_contacts_and_requests(
         current_user=current_user, asession=asession
     )
+    # after commit and invalidation: the other user refetches on notice
+    if change_type is not None:
+        await utl.notify_of_contact_change(
+            contact=others_contact,
+            change_type=change_type,
+            aredis_pubsub_client=aredis_pubsub_client,
+        )
     return contacts_and_requests, message
 
 
 async def cancel_contact_request(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     other_user_id: UUID,
     asession: AsyncSession,
 ) -> tuple[sch.ActiveContactsAndRequests, str]:
@@ -282,33 +277,33 @@ async def cancel_contact_request(
         asession=asession,
         raise_not_found=True,
     )
-    my_contact, others_contact = contact_pair
+    my_contact, _ = contact_pair
     if my_contact.status != ENM.ContactStatus.REQUESTED_BY_ME:
         raise exc.BadRequest(
             'Only outgoing contact requests can be cancelled.'
         )
-    await utl.update_contact_pair(
-        my_user_id=current_user.id,
-        other_user_id=other_user_id,
+    _, others_contact = await utl.update_contact_pair(
+        contact_pair=contact_pair,
         my_contact_status=ENM.ContactStatus.CANCELLED_BY_ME,
         asession=asession,
     )
     await asession.commit()
+    await utl.invalidate_cached_responses(current_user.id, other_user_id)
     active_contacts_and_requests, _ = await get_contacts_and_requests(
         current_user=current_user,
         asession=asession,
     )
-    utl.notify_of_contact_change(
+    await utl.notify_of_contact_change(
         contact=others_contact,
         change_type=ENM.ChatPayloadType.REQUEST_CLOSED,
-        redis_pubsub_client=redis_pubsub_client,
+        aredis_pubsub_client=aredis_pubsub_client,
     )
     return active_contacts_and_requests, 'Contact request cancelled.'
 
 
 async def reject_contact_request(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     other_user_id: UUID,
     asession: AsyncSession,
 ) -> tuple[sch.ActiveContactsAndRequests, str]:
@@ -323,31 +318,31 @@ async def reject_contact_request(
         asession=asession,
         raise_not_found=True,
     )
-    my_contact, others_contact = contact_pair
+    my_contact, _ = contact_pair
     if my_contact.status != ENM.ContactStatus.REQUESTED_BY_OTHER:
         raise exc.BadRequest('Only received contact requests can be rejected.')
-    await utl.update_contact_pair(
-        my_user_id=current_user.id,
-        other_user_id=other_user_id,
+    _, others_contact = await utl.update_contact_pair(
+        contact_pair=contact_pair,
         my_contact_status=ENM.ContactStatus.REJECTED_BY_ME,
         asession=asession,
     )
     await asession.commit()
+    await utl.invalidate_cached_responses(current_user.id, other_user_id)
     active_contacts_and_requests, _ = await get_contacts_and_requests(
         current_user=current_user,
         asession=asession,
     )
-    utl.notify_of_contact_change(
+    await utl.notify_of_contact_change(
         contact=others_contact,
         change_type=ENM.ChatPayloadType.REQUEST_CLOSED,
-        redis_pubsub_client=redis_pubsub_client,
+        aredis_pubsub_client=aredis_pubsub_client,
     )
     return active_contacts_and_requests, 'Contact request rejected.'
 
 
 async def block_contact(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     other_user_id: UUID,
     asession: AsyncSession,
 ) -> tuple[sch.ActiveContactsAndRequests, str]:
@@ -362,7 +357,7 @@ async def block_contact(
         asession=asession,
         raise_not_found=True,
     )
-    my_contact, others_contact = contact_pair
+    my_contact, _ = contact_pair
     if my_contact.status not in (CNST.BLOCKABLE_CONTACT_STATUSES):
         raise exc.BadRequest(
             (
@@ -370,26 +365,26 @@ async def block_contact(
                 f'{", ".join(CNST.BLOCKABLE_CONTACT_STATUSES)}.'
             )
         )
-    await utl.update_contact_pair(
-        my_user_id=current_user.id,
-        other_user_id=other_user_id,
+    _, others_contact = await utl.update_contact_pair(
+        contact_pair=contact_pair,
         my_contact_status=ENM.ContactStatus.BLOCKED_BY_ME,
         asession=asession,
     )
     await asession.commit()
+    await utl.invalidate_cached_responses(current_user.id, other_user_id)
     active_contacts_and_requests, _ = await get_contacts_and_requests(
         current_user=current_user, asession=asession
     )
-    utl.notify_of_contact_change(
+    await utl.notify_of_contact_change(
         contact=others_contact,
         change_type=ENM.ChatPayloadType.BLOCKED_BY,
-        redis_pubsub_client=redis_pubsub_client,
+        aredis_pubsub_client=aredis_pubsub_client,
     )
     return active_contacts_and_requests, 'Contact blocked.'
 
 
 async def unblock_contact(
-    current_user: db.User, other_user_id: UUID, asession: AsyncSession
+    current_user: cnt.Principal, other_user_id: UUID, asession: AsyncSession
 ) -> tuple[sch.ActiveContactsAndRequests, str]:
     """
     Unblocks contact (puts to 'ongoing' status).
@@ -402,33 +397,33 @@ async def unblock_contact(
         asession=asession,
         raise_not_found=True,
     )
-    my_contact, others_contact = contact_pair
+    my_contact, _ = contact_pair
     if my_contact.status != ENM.ContactStatus.BLOCKED_BY_ME:
         raise exc.BadRequest(
             f'Requested contact status is {my_contact.status}. '
             'Only contacts in status BLOCKED_BY_ME can be unblocked.'
         )
-    await utl.update_contact_pair(
-        my_user_id=current_user.id,
-        other_user_id=other_user_id,
+    _, others_contact = await utl.update_contact_pair(
+        contact_pair=contact_pair,
         my_contact_status=ENM.ContactStatus.ONGOING,
         asession=asession,
     )
     await asession.commit()
+    await utl.invalidate_cached_responses(current_user.id, other_user_id)
     active_contacts_and_requests, _ = await get_contacts_and_requests(
         current_user=current_user, asession=asession
     )
-    utl.notify_of_contact_change(
+    await utl.notify_of_contact_change(
         contact=others_contact,
         change_type=ENM.ChatPayloadType.UNBLOCKED_BY,
-        redis_pubsub_client=redis_pubsub_client,
+        aredis_pubsub_client=aredis_pubsub_client,
     )
     return active_contacts_and_requests, 'Contact unblocked.'
 
 
 async def get_other_profile(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     other_user_id: UUID,
     asession: AsyncSession,
 ) -> tuple[sch.RecommendationRead, str]:
@@ -471,7 +466,7 @@ async def get_other_profile(
 
 
 async def get_additional_contacts_options(
-    current_user: db.User, asession: AsyncSession
+    current_user: cnt.Principal, asession: AsyncSession
 ) -> tuple[sch.AdditionalContactsOptions, str]:
     contacts = await crud.read_contacts(
         my_user_id=current_user.id,
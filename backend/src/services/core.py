@@ -1,30 +1,117 @@
+import os
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src import containers as cnt
 from src import crud
 from src import exceptions as exc
 from src import schemas as sch
+from src.config import CNST
 from src.context import get_current_language
+from src.metrics import metrics
+from src.responses import render_response
+from src.services.utils.other import values_to_p_v_read_model
+
+# (definitions version, payload kind, language code) -> rendered payload
+_rendered_payloads: dict[tuple[str, str, str], cnt.RenderedResponse] = {}
+
+
+def _to_definitions_read_model(
+    lan_definitions: cnt.LanguageDefinitions,
+) -> sch.DefinitionsRead:
+    return sch.DefinitionsRead(
+        attitudes=[
+            sch.AttitudeRead.model_validate(a)
+            for a in lan_definitions.attitudes
+        ],
+        values=[
+            sch.ValueRead.model_validate(v) for v in lan_definitions.values
+        ],
+    )
 
 
 async def read_definitions(
     *, asession: AsyncSession
 ) -> tuple[sch.DefinitionsRead, str]:
     """
-    Reads Attitudes, Values and Aspects.
+    Reads Attitudes, Values and Aspects (from definitions cache).
     Returns DefinitionsRead schema.
     """
-    attitudes = await crud.read_attitudes(
-        user_language=get_current_language(), asession=asession
-    )
-    if not attitudes:
-        raise exc.ServerError('Attitudes not found.')
-    definitions = await crud.read_values(
-        user_language=get_current_language(), asession=asession
-    )
-    if not definitions:
-        raise exc.ServerError('Definitions not found.')
-    def_model = sch.DefinitionsRead(
-        attitudes=[sch.AttitudeRead.model_validate(a) for a in attitudes],
-        values=[sch.ValueRead.model_validate(v) for v in definitions],
+    definitions = await crud.read_cached_definitions(asession=asession)
+    def_model = _to_definitions_read_model(
+        definitions.by_language[get_current_language()]
     )
     return def_model, 'Definitions.'
+
+
+async def _render_payloads(definitions: cnt.Definitions) -> None:
+    """
+    Serializes definitions and initial personal values payloads
+    for every supported language. Replaces previously rendered ones.
+    """
+    rendered = {}
+    for lan_code, lan_definitions in definitions.by_language.items():
+        def_model = _to_definitions_read_model(lan_definitions)
+        rendered[(definitions.version, 'definitions', lan_code)] = (
+            render_response(
+                sch.ApiResponse(data=def_model, message='Definitions.')
+            )
+        )
+        initial_pv_model = await values_to_p_v_read_model(
+            definitions=def_model
+        )
+        rendered[(definitions.version, 'initial_values', lan_code)] = (
+            render_response(
+                sch.ApiResponse(
+                    data=initial_pv_model,
+                    message=CNST.INITIAL_PERSONAL_VALUES_MESSAGE,
+                )
+            )
+        )
+    _rendered_payloads.clear()
+    _rendered_payloads.update(rendered)
+
+
+async def prerender_definitions(*, asession: AsyncSession) -> None:
+    """Renders definitions payloads ahead of first requests."""
+    definitions = await crud.read_cached_definitions(asession=asession)
+    await _render_payloads(definitions)
+
+
+async def _get_rendered(
+    *, kind: str, asession: AsyncSession
+) -> cnt.RenderedResponse:
+    definitions = await crud.read_cached_definitions(asession=asession)
+    key = (definitions.version, kind, get_current_language())
+    if key not in _rendered_payloads:
+        await _render_payloads(definitions)
+    return _rendered_payloads[key]
+
+
+async def get_rendered_definitions(
+    *, asession: AsyncSession
+) -> cnt.RenderedResponse:
+    """Pre-rendered definitions ApiResponse in current language."""
+    return await _get_rendered(kind='definitions', asession=asession)
+
+
+async def get_rendered_initial_personal_values(
+    *, asession: AsyncSession
+) -> cnt.RenderedResponse:
+    """
+    Pre-rendered ApiResponse with initial data to create personal values,
+    in current language.
+    """
+    return await _get_rendered(kind='initial_values', asession=asession)
+
+
+async def get_metrics(
+    *, current_user: cnt.Principal, asession: AsyncSession
+) -> tuple[dict[str, float], str]:
+    """Returns this worker's metrics. Superusers only."""
+    user = await crud.read_user_by_id(
+        user_id=current_user.id, asession=asession
+    )
+    if user is None or not user.is_superuser:
+        raise exc.Forbidden()
+    return metrics.snapshot(), f'Metrics of worker {os.getpid()}.'
@@ -4,14 +4,16 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import containers as cnt
-from src import crud, db
+from src import crud
 from src import exceptions as exc
 from src import schemas as sch
 from src.config.enums import ContactStatus
 
+from . import utils as utl
+
 
 async def count_unread_messages(
-    *, current_user: db.User, asession: AsyncSession
+    *, current_user: cnt.Principal, asession: AsyncSession
 ) -> tuple[sch.UnreadMessagesCount, str]:
     """Counts unread messages."""
     results = await crud.count_uread_messages(
@@ -62,6 +64,7 @@ async def read_messages(
         asession=asession,
     )
     await asession.commit()
+    await utl.invalidate_cached_responses(current_user_id)
     return schemas, 'Messages found.'
 
 
@@ -94,6 +97,7 @@ async def add_message(
         )
     await crud.create_message(data=data, asession=asession)
     await asession.commit()
+    await utl.invalidate_cached_responses(current_user_id, data.receiver_id)
     msg_cnt = await crud.read_last_message(
         sender_id=current_user_id,
         receiver_id=data.receiver_id,
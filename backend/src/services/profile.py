@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import crud, db
+from src import containers as cnt
+from src import crud
 from src import schemas as sch
 from src.context import get_current_language
+from src.services.utils.cache import invalidate_cached_responses
 from src.services.utils.other import (
     personal_values_already_set,
     profile_model_to_write_data,
@@ -12,7 +14,7 @@ from src.services.utils.other import (
 
 async def get_profile(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     asession: AsyncSession,
 ) -> tuple[sch.ProfileRead, str]:
     """Gets Profile with user_id. Returns as ProfileRead."""
@@ -26,7 +28,7 @@ async def get_profile(
 
 async def edit_profile(
     *,
-    user: db.User,
+    user: cnt.Principal,
     update_model: sch.ProfileUpdate,
     asession: AsyncSession,
 ) -> tuple[sch.ProfileRead, str]:
@@ -36,7 +38,15 @@ async def edit_profile(
     """
     data = profile_model_to_write_data(update_model)
     await crud.update_profile(user_id=user.id, data=data, asession=asession)
+    await crud.refresh_contacts_similarity_and_distance(
+        user_id=user.id, asession=asession
+    )
     await asession.commit()
+    # contacts see 'my' name, similarity and distance
+    contact_user_ids = await crud.read_contact_user_ids(
+        user_id=user.id, asession=asession
+    )
+    await invalidate_cached_responses(user.id, *contact_user_ids)
     profile = await crud.read_profile_by_user_id(
         user_id=user.id,
         user_language=get_current_language(),
@@ -20,7 +20,7 @@ async def register_user(
     )
     if created_user is None:
         raise exc.ServerError('User not found in DB after creation.')
-    srv_msg = utl.run_email_verification(email)
+    srv_msg = await utl.run_email_verification(email)
     return created_user.email, srv_msg
 
 
@@ -39,7 +39,7 @@ async def create_superuser(
 async def verify_email(
     *, email: str, code: int, asession: AsyncSession
 ) -> str:
-    success, msg = utl.check_verification_code(email=email, code=code)
+    success, msg = await utl.check_verification_code(email=email, code=code)
     if not success:
         raise exc.Unauthorized(msg)
     await utl.set_existing_user_to_verified(email=email, asession=asession)
@@ -52,8 +52,10 @@ async def process_verify_email_request(
     user = await crud.read_user_by_email(email=email, asession=asession)
     if user is None:
         raise exc.NotFound('User not found.')
-    if utl.verify_value_with_hash(plain=password, hashed=user.password_hash):
-        srv_msg = utl.run_email_verification(email=email)
+    if await utl.averify_value_with_hash(
+        plain=password, hashed=user.password_hash
+    ):
+        srv_msg = await utl.run_email_verification(email=email)
         return True, srv_msg
     return False, 'Invalid password.'
 
@@ -68,13 +70,15 @@ async def authenticate_user(
     Raises if password is invalid.
     """
     user = await utl.get_user_by_email_or_raise(email=email, asession=asession)
-    password_is_valid = utl.verify_value_with_hash(
+    password_is_valid = await utl.averify_value_with_hash(
         plain=password, hashed=user.password_hash
     )
     if not password_is_valid:
         raise exc.Forbidden('Invalid password.')
 
-    access_token = utl.create_access_token(user.id)
+    access_token = utl.create_access_token(
+        user.id, is_active=user.is_active, is_verified=user.is_verified
+    )
     now = datetime.now(timezone.utc)
     current_valid_refresh_token = (
         await utl.get_current_valid_refresh_token_for_user(
@@ -108,7 +112,7 @@ async def refresh_access(
         raise exc.Forbidden('Invalid refresh token.')  # TODO
 
     current_refresh_token = await utl.validate_db_refresh_token_for_user(
-        user_id=result.subject, jti=result.jti, asession=asession
+        user_id=result.subject, jti=result.jti, token=token, asession=asession
     )
     now = datetime.now(timezone.utc)
     current_refresh_token.revoked_at = now
@@ -117,13 +121,22 @@ async def refresh_access(
     )
     asession.add(db_refresh_token)
     await asession.commit()
-    access_token = utl.create_access_token(current_refresh_token.user_id)
+    principal = await crud.read_principal(
+        user_id=current_refresh_token.user_id, asession=asession
+    )
+    if principal is None:
+        raise exc.NotFound('User not found.')
+    access_token = utl.create_access_token(
+        principal.id,
+        is_active=principal.is_active,
+        is_verified=principal.is_verified,
+    )
     return access_token, refresh_token, 'Access token.'
 
 
 async def run_forgot_password_steps(email: str, asession: AsyncSession) -> str:
     await utl.get_active_user_by_email(email=email, asession=asession)
-    srv_msg = utl.run_email_verification(email)
+    srv_msg = await utl.run_email_verification(email)
     return srv_msg
 
 
@@ -133,6 +146,6 @@ async def set_new_password(
     user = await utl.get_active_user_by_email(email=email, asession=asession)
     await utl.validate_password(password=new_password, email=email)
     msg = await verify_email(email=email, code=code, asession=asession)
-    user.password_hash = utl.get_value_hash(password=new_password)
+    user.password_hash = await utl.aget_value_hash(password=new_password)
     await asession.commit()
     return msg
@@ -1,2 +1,4 @@
 from .user import *  # noqa
 from .other import *  # noqa
+from .cache import *  # noqa
+from .moral_profile import *  # noqa
@@ -0,0 +1,105 @@
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from src.config import CFG, CNST, ENM
+from src.context import get_current_language
+from src.logger import logger
+from src.redis_client import aredis_client
+from src.sessions import replica_router
+
+
+def _cache_key(user_id: UUID) -> str:
+    return f'{CNST.RESPONSE_CACHE_REDIS_KEY}{user_id}'
+
+
+def _generation_key(user_id: UUID) -> str:
+    return f'{CNST.RESPONSE_CACHE_GENERATION_REDIS_KEY}{user_id}'
+
+
+def _cache_field(kind: ENM.CachedResponse) -> str:
+    return f'{kind.value}:{get_current_language()}'
+
+
+# KEYS: cache, user generation, all generation
+# ARGV: field, content, ttl, user generation, all generation ('' - unset)
+_set_if_generations_unchanged = aredis_client.register_script("""
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[4]
+    or (redis.call('GET', KEYS[3]) or '') ~= ARGV[5] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+""")
+
+
+async def get_or_cache_response(
+    *,
+    user_id: UUID,
+    kind: ENM.CachedResponse,
+    build: Callable[[], Awaitable[bytes]],
+) -> tuple[bytes, bool]:
+    """
+    Returns serialized response of kind for user from cache,
+    or builds and caches it.
+    All user's cached responses are kept in one hash,
+    field per kind and language.
+    Not cached if the user's responses were invalidated while building.
+    Redis errors are logged - response is built without cache.
+    Returns a tuple: content, cache hit (boolean).
+    """
+    key = _cache_key(user_id)
+    field = _cache_field(kind)
+    generation_keys = [
+        _generation_key(user_id),
+        CNST.RESPONSE_CACHE_GENERATION_ALL_REDIS_KEY,
+    ]
+    try:
+        async with aredis_client.pipeline(transaction=False) as pipe:
+            pipe.hget(key, field)
+            pipe.mget(generation_keys)
+            cached, generations = await pipe.execute()
+    except RedisError as e:
+        logger.warning(f'Response cache read failed: {e!r}')
+        return await build(), False
+    if cached is not None:
+        return cached, True
+    content = await build()
+    try:
+        # not written if invalidated while building: content may be stale
+        await _set_if_generations_unchanged(
+            keys=[key, *generation_keys],
+            args=[
+                field,
+                content,
+                CFG.RESPONSE_CACHE_TTL_SECONDS,
+                *(generation or b'' for generation in generations),
+            ],
+        )
+    except RedisError as e:
+        logger.warning(f'Response cache write failed: {e!r}')
+    return content, False
+
+
+async def invalidate_cached_responses(*user_ids: UUID) -> None:
+    """
+    Drops all cached responses of given users.
+    Their reads go to the primary first, so that responses are not
+    rebuilt and cached from a replica not yet having the change.
+    """
+    if not user_ids:
+        return
+    await replica_router.mark_users_wrote(*user_ids)
+    try:
+        async with aredis_client.pipeline(transaction=True) as pipe:
+            for uid in user_ids:
+                pipe.incr(_generation_key(uid))
+                pipe.expire(
+                    _generation_key(uid), CFG.RESPONSE_CACHE_TTL_SECONDS
+                )
+            pipe.delete(*[_cache_key(uid) for uid in user_ids])
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f'Response cache invalidation failed: {e!r}')
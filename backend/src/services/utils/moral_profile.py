@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from src import containers as cnt
+from src import exceptions as exc
+from src import schemas as sch
+from src.config import ENM
+
+_POLARITY_ORDER = {
+    ENM.Polarity.POSITIVE: 1,
+    ENM.Polarity.NEUTRAL: 2,
+    ENM.Polarity.NEGATIVE: 3,
+}
+
+
+def pack_personal_values(
+    *,
+    attitude_id: int,
+    value_links: list[sch.PersonalValueCreate],
+    definitions: cnt.Definitions,
+) -> cnt.PersonalValuesPack:
+    """
+    Encodes checked personal values input as PersonalValuesPack.
+    value_links: all values, sorted by user_order.
+    """
+    value_ids = []
+    unique_value_ids = []
+    polarity_counts = {p: 0 for p in ENM.Polarity}
+    aspect_mask = 0
+    for value_link in value_links:
+        included_aspect_ids = frozenset(
+            a.aspect_id for a in value_link.aspects if a.included
+        )
+        uv_id = definitions.unique_value_ids.get(
+            (value_link.value_id, included_aspect_ids)
+        )
+        if uv_id is None:
+            raise exc.ServerError(
+                f'UniqueValue not fount for value_id={value_link.value_id}, '
+                f'aspect_ids={set(included_aspect_ids)}'
+            )
+        value_ids.append(value_link.value_id)
+        unique_value_ids.append(uv_id)
+        polarity_counts[ENM.Polarity(value_link.polarity)] += 1
+        for aspect_id in included_aspect_ids:
+            aspect_mask |= 1 << definitions.aspect_bits[aspect_id]
+    return cnt.PersonalValuesPack(
+        attitude_id=attitude_id,
+        value_ids=tuple(value_ids),
+        unique_value_ids=tuple(unique_value_ids),
+        positive_count=polarity_counts[ENM.Polarity.POSITIVE],
+        neutral_count=polarity_counts[ENM.Polarity.NEUTRAL],
+        aspect_mask=aspect_mask,
+    )
+
+
+def unpack_personal_values(
+    *,
+    pack: cnt.PersonalValuesPack,
+    definitions: cnt.Definitions,
+) -> list[sch.PersonalValueCreate]:
+    """Decodes PersonalValuesPack to value links, sorted by user_order."""
+    value_links = []
+    for i, value_id in enumerate(pack.value_ids):
+        if i < pack.positive_count:
+            polarity = ENM.Polarity.POSITIVE
+        elif i < pack.positive_count + pack.neutral_count:
+            polarity = ENM.Polarity.NEUTRAL
+        else:
+            polarity = ENM.Polarity.NEGATIVE
+        value_links.append(
+            sch.PersonalValueCreate(
+                value_id=value_id,
+                polarity=polarity.value,
+                user_order=i + 1,
+                aspects=[
+                    sch.PersonalAspectCreate(
+                        aspect_id=aspect_id,
+                        included=bool(
+                            pack.aspect_mask
+                            >> definitions.aspect_bits[aspect_id]
+                            & 1
+                        ),
+                    )
+                    for aspect_id in sorted(
+                        definitions.value_aspect_ids[value_id]
+                    )
+                ],
+            )
+        )
+    return value_links
+
+
+def _ids_diff_message(
+    *, name: str, expected: set[int], provided: list[int]
+) -> str:
+    message_parts = []
+    if missing := expected - set(provided):
+        message_parts.append(f'missing {name}: {missing}')
+    if extra := set(provided) - expected:
+        message_parts.append(f'extra {name}: {extra}')
+    if len(provided) != len(set(provided)):
+        message_parts.append(f'duplicated {name}')
+    return '; '.join(message_parts)
+
+
+@dataclass(frozen=True)
+class PersonalValuesInputChecker:
+    """
+    Checks PersonalValuesCreateUpdate against definitions
+    by comparing bitmasks of provided ids to precomputed expected ones.
+    Sets of ids are built only to describe an error.
+    """
+
+    version: str
+    attitude_ids: frozenset[int]
+    value_bits: MappingProxyType[int, int]
+    all_values_mask: int
+    aspect_bits: MappingProxyType[int, int]
+    # value id -> mask of its aspects
+    value_aspects_masks: MappingProxyType[int, int]
+    value_aspects_counts: MappingProxyType[int, int]
+
+    @classmethod
+    def from_definitions(
+        cls, definitions: cnt.Definitions
+    ) -> 'PersonalValuesInputChecker':
+        value_ids = sorted(definitions.value_aspect_ids)
+        return cls(
+            version=definitions.version,
+            attitude_ids=definitions.attitude_ids,
+            value_bits=MappingProxyType(
+                {value_id: bit for bit, value_id in enumerate(value_ids)}
+            ),
+            all_values_mask=(1 << len(value_ids)) - 1,
+            aspect_bits=definitions.aspect_bits,
+            value_aspects_masks=MappingProxyType(
+                {
+                    value_id: sum(
+                        1 << definitions.aspect_bits[a_id]
+                        for a_id in aspect_ids
+                    )
+                    for value_id, aspect_ids in (
+                        definitions.value_aspect_ids.items()
+                    )
+                }
+            ),
+            value_aspects_counts=MappingProxyType(
+                {
+                    value_id: len(aspect_ids)
+                    for value_id, aspect_ids in (
+                        definitions.value_aspect_ids.items()
+                    )
+                }
+            ),
+        )
+
+    def check(self, p_v_model: sch.PersonalValuesCreateUpdate) -> None:
+        """
+        Raises BadRequest if input is inconsistent.
+        Sorts p_v_model.value_links by user_order.
+        """
+        value_links = p_v_model.value_links
+        value_links.sort(key=lambda x: x.user_order)
+        if p_v_model.attitude_id not in self.attitude_ids:
+            raise exc.BadRequest(
+                f'Incorrect attitude_id: {p_v_model.attitude_id}.'
+            )
+        values_mask = 0
+        previous_polarity_order = 0
+        for i, value_link in enumerate(value_links):
+            if value_link.user_order != i + 1:
+                raise exc.BadRequest('Inconsistent user_order.')
+            polarity_order = _POLARITY_ORDER[ENM.Polarity(value_link.polarity)]
+            if polarity_order < previous_polarity_order:
+                raise exc.BadRequest('Inconsistent polarity/user_order.')
+            previous_polarity_order = polarity_order
+            value_bit = self.value_bits.get(value_link.value_id)
+            if value_bit is not None:
+                values_mask |= 1 << value_bit
+        if values_mask != self.all_values_mask or len(value_links) != len(
+            self.value_bits
+        ):
+            raise exc.BadRequest(
+                _ids_diff_message(
+                    name='values',
+                    expected=set(self.value_bits),
+                    provided=[vl.value_id for vl in value_links],
+                )
+            )
+        for value_link in value_links:
+            aspects_mask = 0
+            for aspect in value_link.aspects:
+                aspect_bit = self.aspect_bits.get(aspect.aspect_id)
+                if aspect_bit is not None:
+                    aspects_mask |= 1 << aspect_bit
+            if (
+                aspects_mask != self.value_aspects_masks[value_link.value_id]
+                or len(value_link.aspects)
+                != self.value_aspects_counts[value_link.value_id]
+            ):
+                expected_mask = self.value_aspects_masks[value_link.value_id]
+                raise exc.BadRequest(
+                    _ids_diff_message(
+                        name='aspects',
+                        expected={
+                            a_id
+                            for a_id, bit in self.aspect_bits.items()
+                            if expected_mask >> bit & 1
+                        },
+                        provided=[a.aspect_id for a in value_link.aspects],
+                    )
+                )
+
+
+_checker: PersonalValuesInputChecker | None = None
+
+
+def get_personal_values_input_checker(
+    definitions: cnt.Definitions,
+) -> PersonalValuesInputChecker:
+    """Returns checker for definitions version, compiles it if needed."""
+    global _checker
+    if _checker is None or _checker.version != definitions.version:
+        _checker = PersonalValuesInputChecker.from_definitions(definitions)
+    return _checker
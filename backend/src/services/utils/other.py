@@ -1,10 +1,10 @@
 import json
 import random
+from dataclasses import replace
 from datetime import datetime, timezone
 from uuid import UUID
 
-import redis
-from async_lru import alru_cache
+import redis.asyncio as redis_a
 from geoalchemy2.elements import WKBElement
 from geoalchemy2.shape import to_shape
 from shapely.geometry import Point
@@ -15,10 +15,13 @@ from src import crud, db
 from src import exceptions as exc
 from src import schemas as sch
 from src.config import CFG, CNST, ENM
+from src.services.utils.moral_profile import (
+    get_personal_values_input_checker,
+)
 
 
 async def personal_values_already_set(
-    *, my_user: db.User, asession: AsyncSession
+    *, my_user: cnt.Principal, asession: AsyncSession
 ) -> bool:
     pvl_count = await crud.count_personal_values(
         user_id=my_user.id, asession=asession
@@ -80,28 +83,34 @@ def profile_model_to_write_data(model: sch.ProfileUpdate) -> dict:
 
 async def personal_values_to_read_model(
     *,
-    value_links: list[db.PersonalValue],
-    attitudes: list[db.Attitude],
-    profile: db.Profile,
+    value_links: list[sch.PersonalValueCreate],
+    lan_definitions: cnt.LanguageDefinitions,
+    attitude_id: int | None,
 ) -> sch.PersonalValuesRead:
-    """Prepares PersonalValuesRead schema based on existing personal values."""
+    """
+    Prepares PersonalValuesRead schema based on personal values
+    (unpacked from PersonalValuesPack, or just written input models).
+    Texts are taken from lan_definitions (definitions in user's language).
+    """
     personal_value_models = []
     for pv in sorted(value_links, key=lambda x: x.user_order):
-        personal_aspect_models = [
-            sch.PersonalAspectRead.model_validate(
-                {
-                    'aspect_id': pa.aspect_id,
-                    'aspect_key_phrase': pa.aspect.key_phrase,
-                    'aspect_statement': pa.aspect.statement,
-                    'included': pa.included,
-                }
+        personal_aspect_models = []
+        for pa in pv.aspects:
+            aspect = lan_definitions.aspects_by_id[pa.aspect_id]
+            personal_aspect_models.append(
+                sch.PersonalAspectRead.model_validate(
+                    {
+                        'aspect_id': pa.aspect_id,
+                        'aspect_key_phrase': aspect.key_phrase,
+                        'aspect_statement': aspect.statement,
+                        'included': pa.included,
+                    }
+                )
             )
-            for pa in pv.personal_aspects
-        ]
         pv_model = sch.PersonalValueRead.model_validate(
             {
-                'value_id': pv.value.id,
-                'value_name': pv.value.name,
+                'value_id': pv.value_id,
+                'value_name': lan_definitions.values_by_id[pv.value_id].name,
                 'polarity': pv.polarity,
                 'user_order': pv.user_order,
                 'aspects': personal_aspect_models,
@@ -113,9 +122,9 @@ async def personal_values_to_read_model(
         sch.PersonalAttitude(
             attitude_id=a.id,
             statement=a.statement,
-            chosen=a.id == profile.attitude_id,
+            chosen=a.id == attitude_id,
         )
-        for a in attitudes
+        for a in lan_definitions.attitudes
     ]
 
     moral_profile_model = sch.PersonalValuesRead.model_validate(
@@ -179,7 +188,6 @@ async def values_to_p_v_read_model(
     return personal_values_model
 
 
-@alru_cache(maxsize=512)
 async def get_schema_for_pesonal_values_input(
     *,
     asession: AsyncSession,
@@ -197,22 +205,16 @@ async def get_schema_for_pesonal_values_input(
         }
     }
     """
-    attitudes = await crud.read_attitudes(asession=asession)
-    if not attitudes:
+    definitions = await crud.read_cached_definitions(asession=asession)
+    if not definitions.attitude_ids:
         raise exc.ServerError('Attitudes not found.')
-    schema = {'attitude_ids': set(), 'definitions': {}}
-    schema['attitude_ids'] = set([att.id for att in attitudes])
-    definitions = await crud.read_values(asession=asession)
-    if not definitions:
-        raise exc.ServerError('Definitions not found.')
-    for v in definitions:
-        schema['definitions'][v.id] = set([a.id for a in v.aspects])
-    keys = sorted(schema['definitions'].keys())
-    result = {}
-    for k in keys:
-        result[k] = schema['definitions'][k]
-    schema['definitions'] = result
-    return schema
+    return {
+        'attitude_ids': set(definitions.attitude_ids),
+        'definitions': {
+            value_id: set(definitions.value_aspect_ids[value_id])
+            for value_id in sorted(definitions.value_aspect_ids)
+        },
+    }
 
 
 async def check_personal_values_input(
@@ -220,44 +222,12 @@ async def check_personal_values_input(
     p_v_model: sch.PersonalValuesCreateUpdate,
     asession: AsyncSession,
 ):
-    """Checks PersonalValuesCreateUpdate on consistency."""
-    p_v_model.value_links.sort(key=lambda x: x.user_order)
-    polarity_order = {'positive': 1, 'neutral': 2, 'negative': 3}
-    poalrity_consistent = all(
-        polarity_order[a.polarity] <= polarity_order[b.polarity]
-        for a, b in zip(p_v_model.value_links, p_v_model.value_links[1:])
-    )
-    if not poalrity_consistent:
-        raise exc.BadRequest('Inconsistent polarity/user_order.')
-    provided_value_ids = {vl.value_id for vl in p_v_model.value_links}
-    schema = await get_schema_for_pesonal_values_input(asession=asession)
-    if p_v_model.attitude_id not in schema['attitude_ids']:
-        raise exc.BadRequest(
-            f'Incorrect attitude_id: {p_v_model.attitude_id}.'
-        )
-    expected_value_ids = set(schema['definitions'].keys())
-    message_parts = []
-    if provided_value_ids != schema['definitions']:
-        missing = expected_value_ids - provided_value_ids
-        extra = provided_value_ids - expected_value_ids
-        if missing:
-            message_parts.append(f'missing values: {missing}')
-        if extra:
-            message_parts.append(f'extra values: {extra}')
-        if message_parts:
-            raise exc.BadRequest('; '.join(message_parts))
-    for value_link_md in p_v_model.value_links:
-        expected_aspect_ids = schema['definitions'][value_link_md.value_id]
-        provided_aspect_ids = set([a.aspect_id for a in value_link_md.aspects])
-        if provided_aspect_ids != expected_aspect_ids:
-            missing = expected_aspect_ids - provided_aspect_ids
-            extra = provided_aspect_ids - expected_aspect_ids
-            if missing:
-                message_parts.append(f'missing aspects: {missing}')
-            if extra:
-                message_parts.append(f'extra aspects: {extra}')
-            if message_parts:
-                raise exc.BadRequest('; '.join(message_parts))
+    """
+    Checks PersonalValuesCreateUpdate on consistency.
+    Sorts p_v_model.value_links by user_order.
+    """
+    definitions = await crud.read_cached_definitions(asession=asession)
+    get_personal_values_input_checker(definitions).check(p_v_model)
 
 
 async def get_contact_pair(
@@ -275,21 +245,19 @@ async def get_contact_pair(
     or raises error if optional raise_not_found param set to True.
     Raises ServerError if different number of contacts found.
     """
-    my_contact_results = await crud.read_contacts(
+    contact_pair = await crud.read_contact_pair(
         my_user_id=my_user_id, other_user_id=other_user_id, asession=asession
     )
-    other_contact_results = await crud.read_contacts(
-        my_user_id=other_user_id, other_user_id=my_user_id, asession=asession
-    )
-    contact_pair = [*my_contact_results, *other_contact_results]
     if not contact_pair:
         if raise_not_found:
             raise exc.NotFound(
                 (f'Contacts not found for {my_user_id=}, {other_user_id=}.')
             )
         return [], 'No contact pair.'
-    number_of_my_results = len(my_contact_results)
-    number_of_other_results = len(other_contact_results)
+    number_of_my_results = len(
+        [c for c in contact_pair if c.my_user_id == my_user_id]
+    )
+    number_of_other_results = len(contact_pair) - number_of_my_results
     if not (number_of_my_results == 1 and number_of_other_results == 1):
         raise exc.ServerError(
             f'Inconsistent number of contacts found '
@@ -306,50 +274,62 @@ async def create_or_get_contact_pair(
     other_user_id: UUID,
     my_contact_status: str = ENM.ContactStatus.REQUESTED_BY_ME,
     other_user_contact_status: str = ENM.ContactStatus.REQUESTED_BY_OTHER,
+    other_profile: cnt.ContactRead,
     asession: AsyncSession,
 ) -> tuple[list[cnt.RichContactRead], bool]:
     """
     Creates a pair of mirrored contacts if this pair is not already exist.
+    other_profile: similarity and distance to store on a new pair.
     Returns a tuple: pair ('my' first), created (boolean).
     """
-    existing_pair, _ = await get_contact_pair(
-        my_user_id=my_user_id, other_user_id=other_user_id, asession=asession
-    )
-    if existing_pair:
-        return existing_pair, False
-    await crud.create_contact_pair(
+    created = await crud.create_contact_pair(
         my_user_id=my_user_id,
         other_user_id=other_user_id,
         my_contact_status=my_contact_status,
         other_user_contact_status=other_user_contact_status,
+        similarity=other_profile.similarity,
+        distance=other_profile.distance,
         asession=asession,
     )
-    created_pair, _ = await get_contact_pair(
+    contact_pair, _ = await get_contact_pair(
         my_user_id=my_user_id,
         other_user_id=other_user_id,
         asession=asession,
+        raise_not_found=True,
     )
-    return created_pair, False
+    return contact_pair, created
 
 
 async def update_contact_pair(
-    my_user_id: UUID,
-    other_user_id: UUID,
+    *,
+    contact_pair: list[cnt.RichContactRead],
     my_contact_status: ENM.ContactStatus,
     asession: AsyncSession,
-) -> None:
-    my_contact = cnt.ContactWrite(
-        my_user_id=my_user_id,
-        other_user_id=other_user_id,
-        status=my_contact_status,
-    )
-    other_contact = cnt.ContactWrite(
-        my_user_id=other_user_id,
-        other_user_id=my_user_id,
-        status=CNST.OTHER_CONTACT_STATUS[my_contact_status],
+) -> list[cnt.RichContactRead]:
+    """
+    Sets my contact status and the mirrored status of the other contact
+    in one statement.
+    Returns the pair ('my' first) with updated statuses.
+    """
+    my_contact, others_contact = contact_pair
+    updated = await crud.update_contact_pair(
+        my_user_id=my_contact.my_user_id,
+        other_user_id=my_contact.other_user_id,
+        my_status=my_contact_status,
+        other_status=CNST.OTHER_CONTACT_STATUS[my_contact_status],
+        asession=asession,
     )
-    await crud.update_contact(contact=my_contact, asession=asession)
-    await crud.update_contact(contact=other_contact, asession=asession)
+    if len(updated) != 2:
+        raise exc.ServerError(
+            f'Inconsistent number of contacts updated '
+            f'for my_user_id={my_contact.my_user_id}, '
+            f'other_user_id={my_contact.other_user_id}: {len(updated)}.'
+        )
+    my_updated, others_updated = updated
+    return [
+        replace(my_contact, status=my_updated.status),
+        replace(others_contact, status=others_updated.status),
+    ]
 
 
 def rich_contact_to_schema(*, contact: cnt.RichContactRead) -> sch.ContactRead:
@@ -462,11 +442,11 @@ async def generate_random_personal_values(*, asession: AsyncSession) -> dict:
     return pv_dict
 
 
-def notify_of_contact_change(
+async def notify_of_contact_change(
     *,
     contact: cnt.RichContactRead,
     change_type: ENM.ChatPayloadType,
-    redis_pubsub_client: redis.Redis,
+    aredis_pubsub_client: redis_a.Redis,
 ) -> None:
     """
     Used to notify user A when user B changes their contact
@@ -490,4 +470,4 @@ def notify_of_contact_change(
     )
     valid_json = schema.model_dump_json()
     key = f'ws:{contact.my_user_id}'
-    redis_pubsub_client.publish(key, valid_json)
+    await aredis_pubsub_client.publish(key, valid_json)
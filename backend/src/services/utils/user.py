@@ -1,4 +1,6 @@
 import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta, timezone
 from random import randint
 from uuid import UUID, uuid4
@@ -13,21 +15,34 @@ from src import containers as cnt
 from src import crud, db, tasks
 from src import exceptions as exc
 from src.config import CFG, CNST
+from src.executors import password_executor, password_strength_executor
 from src.logger import logger
-from src.redis_client import redis_client
+from src.pwned_passwords import is_password_pwned
+from src.redis_client import aredis_client
 
 value_hash = PasswordHash.recommended()
 
 
 def create_access_token(
-    user_id: UUID, expires_delta: timedelta | None = None
+    user_id: UUID,
+    expires_delta: timedelta | None = None,
+    *,
+    is_active: bool | None = None,
+    is_verified: bool | None = None,
 ) -> str:
+    """
+    is_active, is_verified: optional, User flags to carry as claims,
+    so that requests are authorized without reading the user.
+    """
     now = datetime.now(timezone.utc)
     if expires_delta:
         expire = now + expires_delta
     else:
         expire = now + timedelta(minutes=CFG.JWT_ACCESS_LIFETIME_MINUTES)
     to_encode = {'sub': str(user_id), 'exp': expire}
+    if is_active is not None and is_verified is not None:
+        to_encode[CNST.ACCESS_TOKEN_ACTIVE_CLAIM] = is_active
+        to_encode[CNST.ACCESS_TOKEN_VERIFIED_CLAIM] = is_verified
     return jwt.encode(to_encode, CFG.JWT_SECRET, algorithm=CFG.JWT_ALGORITHM)
 
 
@@ -39,8 +54,17 @@ def get_value_hash(password: str) -> str:
     return value_hash.hash(password)
 
 
-def decode_access_token(token: str) -> UUID:
-    """Returns user token subject (user id)."""
+async def averify_value_with_hash(*, plain: str, hashed: str) -> bool:
+    """verify_value_with_hash on password_executor, may raise 429."""
+    return await password_executor.run(value_hash.verify, plain, hashed)
+
+
+async def aget_value_hash(password: str) -> str:
+    """get_value_hash on password_executor, may raise 429."""
+    return await password_executor.run(value_hash.hash, password)
+
+
+def _decode_access_token_claims(token: str) -> tuple[UUID, dict]:
     decoded = jwt.decode(token, CFG.JWT_SECRET, algorithms=[CFG.JWT_ALGORITHM])
     raw_subject = decoded.get('sub')
     if not raw_subject:
@@ -49,9 +73,32 @@ def decode_access_token(token: str) -> UUID:
         subject = UUID(raw_subject)
     except Exception:
         raise exc.ServerError('invalid token sub format.')
+    return subject, decoded
+
+
+def decode_access_token(token: str) -> UUID:
+    """Returns user token subject (user id)."""
+    subject, _ = _decode_access_token_claims(token)
     return subject
 
 
+def decode_access_token_principal(
+    token: str,
+) -> tuple[UUID, cnt.Principal | None]:
+    """
+    Returns user token subject (user id)
+    and Principal if the token carries User flags claims.
+    """
+    subject, decoded = _decode_access_token_claims(token)
+    is_active = decoded.get(CNST.ACCESS_TOKEN_ACTIVE_CLAIM)
+    is_verified = decoded.get(CNST.ACCESS_TOKEN_VERIFIED_CLAIM)
+    if not isinstance(is_active, bool) or not isinstance(is_verified, bool):
+        return subject, None
+    return subject, cnt.Principal(
+        id=subject, is_active=is_active, is_verified=is_verified
+    )
+
+
 async def _is_password_pwned(*, password: str) -> bool | None:
     """
     Returns:
@@ -60,21 +107,7 @@ async def _is_password_pwned(*, password: str) -> bool | None:
         None if request failed (timeout, network, etc.).
     """
     try:
-        sha1_hash = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
-        prefix, suffix = sha1_hash[:5], sha1_hash[5:]
-
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f'https://api.pwnedpasswords.com/range/{prefix}'
-            )
-            response.raise_for_status()
-
-        for line in response.text.splitlines():
-            h, _ = line.split(':')
-            if h == suffix:
-                return True
-        return False
-
+        return await is_password_pwned(password)
     except (
         httpx.RequestError,
         httpx.TimeoutException,
@@ -85,25 +118,59 @@ async def _is_password_pwned(*, password: str) -> bool | None:
         return None
 
 
+_password_strength_cache: dict[bytes, tuple[float, int, list[str]]] = {}
+
+
+def _score_password(password: str, email: str) -> tuple[int, list[str]]:
+    result = zxcvbn(
+        password[: CNST.PASSWORD_STRENGTH_MAX_LENGTH],
+        user_inputs=[email],
+    )
+    return result['score'], result['feedback']['suggestions']
+
+
+async def _get_password_strength(
+    *, password: str, email: str
+) -> tuple[int, list[str]]:
+    """
+    zxcvbn score and suggestions, scored on password_strength_executor.
+    Cached by digest for a short time, so that passwords are not kept.
+    """
+    key = hashlib.sha256(f'{email}\0{password}'.encode('utf-8')).digest()
+    now = time.monotonic()
+    cached = _password_strength_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1], cached[2]
+    score, suggestions = await password_strength_executor.run(
+        _score_password, password, email
+    )
+    _password_strength_cache.pop(key, None)
+    if len(_password_strength_cache) >= CFG.PASSWORD_STRENGTH_CACHE_SIZE:
+        # oldest first
+        del _password_strength_cache[next(iter(_password_strength_cache))]
+    _password_strength_cache[key] = (
+        now + CFG.PASSWORD_STRENGTH_CACHE_TTL_SECONDS,
+        score,
+        suggestions,
+    )
+    return score, suggestions
+
+
 async def validate_password(
     *,
     password: str,
     email: str,
 ) -> None:
     """
-    Validates password with pwnedpasswords API.
+    Validates password with pwned passwords index or API.
     Raises if password is weak or leaked.
-    Skips if no responce from API.
+    Skips leak check if no responce from API.
     """
-    result = zxcvbn(
-        password,
-        user_inputs=[email],
+    score, suggestions = await _get_password_strength(
+        password=password, email=email
     )
-
-    if result['score'] < CNST.PASSWORD_MIN_SCORE:
-        raise exc.Forbidden(
-            f'Password too weak: {result["feedback"]["suggestions"]}'
-        )
+    if score < CNST.PASSWORD_MIN_SCORE:
+        raise exc.Forbidden(f'Password too weak: {suggestions}')
     is_pwned = await _is_password_pwned(password=password)
     if is_pwned:
         raise exc.Forbidden(
@@ -137,7 +204,7 @@ async def create_user(
     if existing_user is not None:
         raise exc.AlreadyExists('User already exists.')
     await validate_password(password=password, email=email)
-    hashed_password = get_value_hash(password)
+    hashed_password = await aget_value_hash(password)
     crud.create_user(
         email=email,
         hashed_password=hashed_password,
@@ -165,7 +232,7 @@ async def get_active_user_by_email(
     return user
 
 
-def run_email_verification(email: str) -> str:
+async def run_email_verification(email: str) -> str:
     code = ''
     for _ in range(6):
         code += str(randint(1, 9))
@@ -175,10 +242,12 @@ def run_email_verification(email: str) -> str:
         'email': email,
         'attempts': 0,
     }
-    redis_client.hset(key, mapping=data)
-    redis_client.expire(
-        key, timedelta(seconds=CFG.CONFIRMATION_CODE_LIFETIME_SECONDS)
-    )
+    async with aredis_client.pipeline() as pipe:
+        pipe.hset(key, mapping=data)  # type: ignore
+        pipe.expire(
+            key, timedelta(seconds=CFG.CONFIRMATION_CODE_LIFETIME_SECONDS)
+        )
+        await pipe.execute()
     tasks.send_email_confirmation_code.delay(email=email, code=code)
     return (
         f'Email confirmation code sent to {email}. '
@@ -186,17 +255,19 @@ def run_email_verification(email: str) -> str:
     )
 
 
-def check_verification_code(*, email: str, code: int) -> tuple[bool, str]:
+async def check_verification_code(
+    *, email: str, code: int
+) -> tuple[bool, str]:
     key = f'{CNST.CONFIRM_EMAIL_REDIS_KEY}{email}'
-    data = redis_client.hgetall(key)
+    data = await aredis_client.hgetall(key)  # type: ignore
     if not data:
         return False, 'Invalid email or expired code.'
-    attempts = int(data.get('attempts', 0))  # type: ignore
+    attempts = int(data.get(b'attempts', 0))
     if attempts >= 3:
-        redis_client.delete(key)
+        await aredis_client.delete(key)
         return False, 'To many attempts.'
-    if int(data['code']) != code:  # type: ignore
-        redis_client.hincrby(key, 'attempts', 1)
+    if int(data[b'code']) != code:
+        await aredis_client.hincrby(key, 'attempts', 1)  # type: ignore
         return False, 'Invalid code.'
     return True, 'Valid code'
 
@@ -215,6 +286,18 @@ async def set_existing_user_to_verified(
     await asession.commit()
 
 
+def hash_refresh_token(token: str) -> str:
+    """
+    Keyed digest to store and look refresh tokens up by.
+    Tokens are random and signed, so no slow hash is needed.
+    """
+    return hmac.new(
+        CFG.REFRESH_TOKEN_HASH_SECRET.encode(),
+        token.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
 def create_refresh_token(
     *, user_id: UUID, now: datetime
 ) -> tuple[str, db.RefreshToken]:
@@ -229,7 +312,7 @@ def create_refresh_token(
         'exp': int((now + timedelta(days=30)).timestamp()),
     }
     token = jwt.encode(payload, CFG.JWT_SECRET, algorithm=CFG.JWT_ALGORITHM)
-    token_hash = get_value_hash(token)
+    token_hash = hash_refresh_token(token)
     new_token = db.RefreshToken(
         user_id=user_id,
         jti=jti,
@@ -249,7 +332,7 @@ def decode_refresh_token(token: str) -> cnt.DecodedRefreshToken:
     if not raw_jti:
         raise exc.ServerError('Incorrect decoded jti format.')
     jti = UUID(raw_jti)
-    return cnt.DecodedRefreshToken(subject=subject, jti=jti)
+    return cnt.DecodedRefreshToken(subject=UUID(subject), jti=jti)
 
 
 async def get_current_valid_refresh_token_for_user(
@@ -265,21 +348,47 @@ async def get_current_valid_refresh_token_for_user(
     return current_refresh_tokens[0]
 
 
-async def validate_db_refresh_token_for_user(
-    *, user_id: UUID, jti: UUID, asession: AsyncSession
-) -> db.RefreshToken:
-    current_valid_refresh_token = (
-        await get_current_valid_refresh_token_for_user(
-            user_id=user_id, asession=asession
-        )
+async def _read_refresh_token(
+    *, token: str, jti: UUID, asession: AsyncSession
+) -> db.RefreshToken | None:
+    """
+    Reads stored refresh token by its hash.
+    Tokens stored with Argon2 hash are found by jti and verified once,
+    their hash is replaced with the HMAC one.
+    """
+    token_hash = hash_refresh_token(token)
+    found = await crud.read_refresh_token_by_hash(
+        token_hash=token_hash, asession=asession
     )
-    if current_valid_refresh_token:
-        return current_valid_refresh_token
+    if found is not None:
+        return found
     found = await crud.get_specific_refresh_token(jti=jti, asession=asession)
+    if (
+        found is None
+        or not found.token_hash.startswith(
+            CNST.LEGACY_REFRESH_TOKEN_HASH_PREFIX
+        )
+        or not await averify_value_with_hash(
+            plain=token, hashed=found.token_hash
+        )
+    ):
+        return None
+    found.token_hash = token_hash
+    return found
+
+
+async def validate_db_refresh_token_for_user(
+    *, user_id: UUID, jti: UUID, token: str, asession: AsyncSession
+) -> db.RefreshToken:
+    """Returns stored refresh token if it is valid, raises otherwise."""
+    found = await _read_refresh_token(token=token, jti=jti, asession=asession)
     if not found:
         raise exc.ServerError('Invalid refresh token.')  # TODO FAKE?
     if found.user_id != user_id:
         raise exc.ServerError('Invalid refresh token.')  # TODO STOLEN?
+    now = datetime.now(timezone.utc)
+    if found.revoked_at is None and found.expires_at > now:
+        return found
     if found.revoked_at:
         exc.Forbidden('Invalid refresh token.')  # TODO REUSE?
     found.revoked_at = datetime.now(timezone.utc)
@@ -2,62 +2,85 @@ from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import crud, db
+from src import containers as cnt
+from src import crud
 from src import exceptions as exc
 from src import schemas as sch
+from src.config import CNST
 from src.context import get_current_language
-from src.services.utils import other
+from src.responses import render_response
+from src.services.utils import cache, other
+from src.services.utils.moral_profile import (
+    pack_personal_values,
+    unpack_personal_values,
+)
 
-from .core import read_definitions
+from .core import get_rendered_initial_personal_values, read_definitions
 
 
 async def get_personal_values(
-    *, current_user: db.User, asession: AsyncSession
+    *, current_user: cnt.Principal, asession: AsyncSession
 ) -> tuple[sch.PersonalValuesRead, str]:
     """
     Reads personal values.
     exc.NotFound raised if no personal values.
     """
-    user_language = get_current_language()
-    profile = await crud.read_profile_by_user_id(
-        user_id=current_user.id,
-        user_language=user_language,
-        asession=asession,
-    )
-    attitudes = await crud.read_attitudes(
-        user_language=user_language, asession=asession
+    pack_n_recommend_me = await crud.read_personal_values_pack(
+        user_id=current_user.id, asession=asession
     )
-    message = 'Your values.'
-    if not await other.personal_values_already_set(
-        my_user=current_user, asession=asession
-    ):
+    if pack_n_recommend_me is None:
         definitions, _ = await read_definitions(asession=asession)
         pv_read_model = await other.values_to_p_v_read_model(
             definitions=definitions
         )
-        return (
-            pv_read_model,
-            'Personal values have not been created yet. '
-            'This is initial data to create Personal Values.',
-        )
+        return pv_read_model, CNST.INITIAL_PERSONAL_VALUES_MESSAGE
+    return await _pack_to_personal_values(
+        pack_n_recommend_me=pack_n_recommend_me, asession=asession
+    )
 
-    personal_values = await crud.read_personal_values(
-        user_id=current_user.id,
-        current_language=user_language,
-        asession=asession,
+
+async def get_rendered_personal_values(
+    *, current_user: cnt.Principal, asession: AsyncSession
+) -> cnt.RenderedResponse:
+    """
+    Same as get_personal_values, but returns rendered ApiResponse.
+    If personal values are not set - pre-rendered initial data.
+    """
+    pack_n_recommend_me = await crud.read_personal_values_pack(
+        user_id=current_user.id, asession=asession
+    )
+    if pack_n_recommend_me is None:
+        return await get_rendered_initial_personal_values(asession=asession)
+    pv_read_model, message = await _pack_to_personal_values(
+        pack_n_recommend_me=pack_n_recommend_me, asession=asession
+    )
+    return render_response(
+        sch.ApiResponse(data=pv_read_model, message=message)
     )
+
+
+async def _pack_to_personal_values(
+    *,
+    pack_n_recommend_me: tuple[cnt.PersonalValuesPack, bool],
+    asession: AsyncSession,
+) -> tuple[sch.PersonalValuesRead, str]:
+    pack, recommend_me = pack_n_recommend_me
+    definitions = await crud.read_cached_definitions(asession=asession)
+    message = 'Your values.'
     pv_read_model = await other.personal_values_to_read_model(
-        value_links=personal_values, profile=profile, attitudes=attitudes
+        value_links=unpack_personal_values(pack=pack, definitions=definitions),
+        lan_definitions=definitions.by_language[get_current_language()],
+        attitude_id=pack.attitude_id,
     )
 
-    if not profile.recommend_me:
+    if not recommend_me:
         message += " Enable 'recommend me' option in Profile to allow searh."
     return pv_read_model, message
 
 
 async def create_personal_values(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     p_v_model: sch.PersonalValuesCreateUpdate,
     asession: AsyncSession,
 ) -> tuple[sch.PersonalValuesRead, str]:
@@ -78,24 +101,15 @@ async def create_personal_values(
         user_id=current_user.id, asession=asession
     )
     ud.values_created = datetime.now()
-    await crud.create_personal_values(
-        user_id=current_user.id, data=p_v_model.model_dump(), asession=asession
-    )
-    await crud.update_profile(
-        user_id=current_user.id,
-        data={'attitude_id': p_v_model.attitude_id},
-        asession=asession,
-    )
-    await asession.commit()
-    pv_read_model, _ = await get_personal_values(
-        current_user=current_user, asession=asession
+    pv_read_model, _ = await _write_personal_values(
+        current_user=current_user, p_v_model=p_v_model, asession=asession
     )
     return pv_read_model, 'Personal Values set.'
 
 
 async def update_personal_values(
     *,
-    current_user: db.User,
+    current_user: cnt.Principal,
     p_v_model: sch.PersonalValuesCreateUpdate,
     asession: AsyncSession,
 ) -> tuple[sch.PersonalValuesRead, str]:
@@ -117,20 +131,51 @@ async def update_personal_values(
         user_id=current_user.id, asession=asession
     )
     ud.values_changes = ud.values_changes + [datetime.now()]
-    await crud.delete_personal_values(
-        user_id=current_user.id, asession=asession
+    pv_read_model, recommend_me = await _write_personal_values(
+        current_user=current_user, p_v_model=p_v_model, asession=asession
     )
-    await crud.create_personal_values(
-        user_id=current_user.id, data=p_v_model.model_dump(), asession=asession
+    message = 'Personal Values updated.'
+    if not recommend_me:
+        message += " Enable 'recommend me' option in Profile to allow searh."
+    return pv_read_model, message
+
+
+async def _write_personal_values(
+    *,
+    current_user: cnt.Principal,
+    p_v_model: sch.PersonalValuesCreateUpdate,
+    asession: AsyncSession,
+) -> tuple[sch.PersonalValuesRead, bool]:
+    """
+    Upserts checked personal values (rows and pack),
+    sets Profile.attitude_id, commits.
+    Returns a tuple: read model built from the input, Profile.recommend_me.
+    """
+    await crud.upsert_personal_values(
+        user_id=current_user.id,
+        value_links=p_v_model.model_dump()['value_links'],
+        asession=asession,
     )
-    await crud.update_profile(
+    recommend_me = await crud.set_profile_attitude(
         user_id=current_user.id,
-        data={'attitude_id': p_v_model.attitude_id},
+        attitude_id=p_v_model.attitude_id,
+        asession=asession,
+    )
+    definitions = await crud.read_cached_definitions(asession=asession)
+    await crud.upsert_personal_values_pack(
+        user_id=current_user.id,
+        pack=pack_personal_values(
+            attitude_id=p_v_model.attitude_id,
+            value_links=p_v_model.value_links,
+            definitions=definitions,
+        ),
         asession=asession,
     )
     await asession.commit()
-    pv_read_model, message = await get_personal_values(
-        current_user=current_user, asession=asession
+    await cache.invalidate_cached_responses(current_user.id)
+    pv_read_model = await other.personal_values_to_read_model(
+        value_links=p_v_model.value_links,
+        lan_definitions=definitions.by_language[get_current_language()],
+        attitude_id=p_v_model.attitude_id,
     )
-    message = message.replace('Your values.', 'Personal Values updated.')
-    return pv_read_model, message
+    return pv_read_model, recommend_me
@@ -1,21 +1,247 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
+from uuid import UUID
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine
+from redis.exceptions import RedisError
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.asyncio.session import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from src.config.config import CFG
+from src.config import CNST
+from src.config.config import CFG, PoolConfig
+from src.crud.sql import replica_lag_seconds
+from src.logger import logger
+from src.metrics import metrics
+from src.redis_client import aredis_client
 
-sync_engine = create_engine(CFG.SYNC_DATABASE_URL)  # , echo=True
+
+def _measured_pool_class(role: str, base: type[QueuePool]) -> type[QueuePool]:
+    """
+    Pool class counting checkouts, time waited for a connection
+    and checkout timeouts as db.<role>.* metrics.
+    A class per role, as pools are recreated from their class on dispose.
+    """
+
+    class MeasuredPool(base):
+        def _do_get(self):
+            started_at = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                metrics.increment(f'db.{role}.checkout_timeouts')
+                raise
+            finally:
+                metrics.increment(f'db.{role}.checkouts')
+                metrics.increment(
+                    f'db.{role}.checkout_wait_seconds',
+                    time.perf_counter() - started_at,
+                )
+
+    return MeasuredPool
+
+
+def _pool_arguments(
+    role: str, pool: PoolConfig, base: type[QueuePool]
+) -> dict:
+    return {
+        'poolclass': _measured_pool_class(role, base),
+        'pool_size': pool.SIZE,
+        'max_overflow': pool.MAX_OVERFLOW,
+        'pool_timeout': pool.TIMEOUT_SECONDS,
+        'pool_recycle': pool.RECYCLE_SECONDS,
+        'pool_pre_ping': pool.PRE_PING,
+    }
+
+
+def _register_pool_gauges(
+    role: str, engine: Engine | AsyncEngine, pool: PoolConfig
+) -> None:
+    """engine.pool is read on every snapshot: it is replaced on dispose."""
+    metrics.register_gauge(
+        f'db.{role}.checked_out', lambda: engine.pool.checkedout()
+    )
+    metrics.register_gauge(
+        f'db.{role}.saturation',
+        lambda: engine.pool.checkedout() / (pool.SIZE + pool.MAX_OVERFLOW),
+    )
+
+
+def _create_async_engine(
+    role: str, pool: PoolConfig, url: str = CFG.ASYNC_DATABASE_URL
+) -> AsyncEngine:
+    engine = create_async_engine(
+        make_url(url).update_query_dict(
+            {
+                'prepared_statement_cache_size': str(
+                    CFG.PREPARED_STATEMENT_CACHE_SIZE
+                )
+            }
+        ),
+        **_pool_arguments(role, pool, AsyncAdaptedQueuePool),
+    )  # , echo=True
+    _register_pool_gauges(role, engine, pool)
+    return engine
+
+
+# Celery tasks
+sync_engine = create_engine(
+    CFG.SYNC_DATABASE_URL,
+    **_pool_arguments('background_sync', CFG.BACKGROUND_POOL, QueuePool),
+)  # , echo=True
+_register_pool_gauges('background_sync', sync_engine, CFG.BACKGROUND_POOL)
 sync_session_factory = sessionmaker(sync_engine)
 
-async_engine = create_async_engine(CFG.ASYNC_DATABASE_URL)  # , echo=True
+# API requests
+async_engine = _create_async_engine('request', CFG.REQUEST_POOL)
 asession_factory = async_sessionmaker(
     async_engine,
     expire_on_commit=False,
 )
 
+# ChatManager: WebSocket authentication, message writes, read marks
+chat_async_engine = _create_async_engine('chat', CFG.CHAT_POOL)
+chat_asession_factory = async_sessionmaker(
+    chat_async_engine,
+    expire_on_commit=False,
+)
+
+# CLI commands, bulk writes
+background_async_engine = _create_async_engine(
+    'background', CFG.BACKGROUND_POOL
+)
+background_asession_factory = async_sessionmaker(
+    background_async_engine,
+    expire_on_commit=False,
+)
+
+# read-only endpoints, see ReplicaRouter
+replica_async_engine = (
+    _create_async_engine(
+        'replica', CFG.REPLICA_POOL, CFG.ASYNC_REPLICA_DATABASE_URL
+    )
+    if CFG.ASYNC_REPLICA_DATABASE_URL
+    else None
+)
+replica_asession_factory = (
+    async_sessionmaker(replica_async_engine, expire_on_commit=False)
+    if replica_async_engine is not None
+    else None
+)
+
+
+class ReplicaRouter:
+    """
+    Chooses the session factory of a read-only request:
+    the replica, unless it is not configured, unreachable,
+    lags more than max_lag_seconds, or the user's data changed recently
+    (read-your-writes, marked in Redis by mark_users_wrote, or for all
+    users by CNST.READ_FROM_PRIMARY_ALL_REDIS_KEY).
+    A response rebuilt after its cache was dropped is thus read
+    from the primary, so stale replica data is not cached.
+    Lag is checked at most once per check_every_seconds per process.
+    """
+
+    def __init__(
+        self,
+        *,
+        replica_factory: async_sessionmaker | None,
+        primary_factory: async_sessionmaker,
+        max_lag_seconds: float,
+        check_every_seconds: float,
+    ):
+        self.replica_factory = replica_factory
+        self.primary_factory = primary_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.check_every_seconds = check_every_seconds
+        self.lag_seconds: float | None = None  # None - unavailable
+        self._checked_at = float('-inf')
+        self._check_lock = asyncio.Lock()
+
+    async def _read_lag(self) -> float:
+        assert self.replica_factory is not None
+        async with self.replica_factory() as asession:
+            return float(await asession.scalar(replica_lag_seconds))
+
+    async def replica_usable(self) -> bool:
+        if self.replica_factory is None:
+            return False
+        if time.monotonic() - self._checked_at >= self.check_every_seconds:
+            async with self._check_lock:
+                # checked by another request while waiting
+                if (
+                    time.monotonic() - self._checked_at
+                    >= self.check_every_seconds
+                ):
+                    try:
+                        self.lag_seconds = await self._read_lag()
+                    except Exception as e:
+                        logger.warning(f'Replica lag check failed: {e!r}')
+                        self.lag_seconds = None
+                    self._checked_at = time.monotonic()
+        return (
+            self.lag_seconds is not None
+            and self.lag_seconds <= self.max_lag_seconds
+        )
+
+    @staticmethod
+    def _wrote_key(user_id: UUID) -> str:
+        return f'{CNST.READ_FROM_PRIMARY_REDIS_KEY}{user_id}'
+
+    async def mark_users_wrote(self, *user_ids: UUID) -> None:
+        """Sends reads of users to the primary for a while."""
+        if self.replica_factory is None or not user_ids:
+            return
+        try:
+            async with aredis_client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.set(
+                        self._wrote_key(user_id),
+                        1,
+                        ex=CFG.REPLICA_READ_YOUR_WRITES_SECONDS,
+                    )
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f'Read-your-writes mark failed: {e!r}')
+
+    async def choose(self, user_id: UUID | None = None) -> async_sessionmaker:
+        if not await self.replica_usable():
+            metrics.increment('db.reads.primary')
+            return self.primary_factory
+        if user_id is not None:
+            try:
+                wrote = await aredis_client.exists(
+                    self._wrote_key(user_id),
+                    CNST.READ_FROM_PRIMARY_ALL_REDIS_KEY,
+                )
+            except RedisError as e:
+                logger.warning(f'Read-your-writes check failed: {e!r}')
+                wrote = True
+            if wrote:
+                metrics.increment('db.reads.primary')
+                return self.primary_factory
+        metrics.increment('db.reads.replica')
+        return self.replica_factory  # type: ignore
+
+
+replica_router = ReplicaRouter(
+    replica_factory=replica_asession_factory,
+    primary_factory=asession_factory,
+    max_lag_seconds=CFG.REPLICA_MAX_LAG_SECONDS,
+    check_every_seconds=CFG.REPLICA_LAG_CHECK_SECONDS,
+)
+metrics.register_gauge(
+    'db.replica.lag_seconds',
+    lambda: (
+        -1
+        if replica_router.lag_seconds is None
+        else replica_router.lag_seconds
+    ),
+)
+
 
 @asynccontextmanager
 async def get_async_session():
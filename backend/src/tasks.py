@@ -38,6 +38,31 @@ def send_email(*, email_to: str, subject: str, content: str) -> None:
 #     )
 
 
+def invalidate_all_cached_responses() -> None:
+    """
+    Drops cached responses (see services.utils.cache) of all users.
+    Their reads go to the primary first, see sessions.ReplicaRouter.
+    """
+    if CFG.ASYNC_REPLICA_DATABASE_URL:
+        redis_client.set(
+            CNST.READ_FROM_PRIMARY_ALL_REDIS_KEY,
+            1,
+            ex=CFG.REPLICA_READ_YOUR_WRITES_SECONDS,
+        )
+    # builds in progress are not cached, see services.utils.cache
+    redis_client.incr(CNST.RESPONSE_CACHE_GENERATION_ALL_REDIS_KEY)
+    batch = []
+    for key in redis_client.scan_iter(
+        match=f'{CNST.RESPONSE_CACHE_REDIS_KEY}*', count=1000
+    ):
+        batch.append(key)
+        if len(batch) == 1000:
+            redis_client.unlink(*batch)
+            batch.clear()
+    if batch:
+        redis_client.unlink(*batch)
+
+
 @celery_app.task
 @sync_catch(to_raise=True)
 def send_email_confirmation_code(*, email: str, code: str):
@@ -121,22 +146,43 @@ def send_match_email_notification(*, email: str, user_id: str):
     )
 
 
+# (name, statement, parameters) in execution order, also used by benchmarks
+MATERIALIZED_VIEWS_REFRESH_STAGES = (
+    ('refresh_moral_profiles', crud.sql.refresh_moral_profiles, {}),
+    ('vacuum_moral_profiles', crud.sql.vacuum_moral_profiles, {}),
+    (
+        'refresh_contacts_similarity_and_distance',
+        crud.sql.refresh_contacts_similarity_and_distance,
+        {'user_id': None},
+    ),
+    ('refresh_all_recommendations', crud.sql.refresh_all_recommendations, {}),
+    ('vacuum_all_recommendations', crud.sql.vacuum_all_recommendations, {}),
+    (
+        'refresh_limited_recommendations',
+        crud.sql.refresh_limited_recommendations,
+        {},
+    ),
+    (
+        'vacuum_limited_recommendations',
+        crud.sql.vacuum_limited_recommendations,
+        {},
+    ),
+)
+
+
 @celery_app.task
 @sync_catch(to_raise=True)
 def refresh_materialized_views():
     """
     Task to refresh moral_profiles and recommendations
-    materialized views.
+    materialized views, and similarity/distance stored on contacts.
     """
     with sync_engine.connect().execution_options(
         isolation_level='AUTOCOMMIT'
     ) as connection:
-        connection.execute(crud.sql.refresh_moral_profiles)
-        connection.execute(crud.sql.vacuum_moral_profiles)
-        connection.execute(crud.sql.refresh_all_recommendations)
-        connection.execute(crud.sql.vacuum_all_recommendations)
-        connection.execute(crud.sql.refresh_limited_recommendations)
-        connection.execute(crud.sql.vacuum_limited_recommendations)
+        for _, statement, parameters in MATERIALIZED_VIEWS_REFRESH_STAGES:
+            connection.execute(statement, parameters)
+    invalidate_all_cached_responses()
 
 
 @celery_app.task
@@ -201,6 +247,7 @@ def end_cooldowns():
     with sync_session_factory() as session:
         crud.end_cooldowns(update_after=update_after, ssession=session)
         session.commit()
+    invalidate_all_cached_responses()
 
 
 @celery_app.task
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator
+
+
+class ServerTiming:
+    """Collects named durations for the Server-Timing response header."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = (perf_counter() - start) * 1000
+
+    def header(self) -> str:
+        return ', '.join(
+            f'{name};dur={duration:.1f}'
+            for name, duration in self.durations.items()
+        )
@@ -4,12 +4,13 @@ import pytest
 import pytest_asyncio
 import redis
 from httpx import AsyncClient
-from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio.session import async_sessionmaker
 
-from src import crud, db
+from src import containers as cnt
+from src import crud
 from src import exceptions as exc
+from src import schemas as sch
 from src import services as srv
 from src.config import CFG
 from src.services.utils import create_access_token
@@ -109,44 +110,14 @@ def redis_client():
 
 @pytest_asyncio.fixture
 async def db_user_with_personal_values(asession_fixture, unique_db_user):
-    result = await asession_fixture.scalars(select(db.UniqueValue))
-    db_unique_values = list(result.all())
-    if not db_unique_values:
-        raise exc.ServerError('No UniqueValues in DB.')
     input_data = await srv.utils.generate_random_personal_values(
         asession=asession_fixture
     )
-    await asession_fixture.execute(
-        update(db.Profile)
-        .where(db.Profile.user_id == unique_db_user['id'])
-        .values({'attitude_id': input_data['attitude_id']})
+    await srv.create_personal_values(
+        current_user=cnt.Principal(
+            id=unique_db_user['id'], is_active=True, is_verified=True
+        ),
+        p_v_model=sch.PersonalValuesCreateUpdate.model_validate(input_data),
+        asession=asession_fixture,
     )
-    personal_values = []
-    value_links = input_data['value_links']
-    for pv_input in value_links:
-        aspect_links = [
-            db.PersonalAspect(**al, user_id=unique_db_user['id'])
-            for al in pv_input.pop('aspects')
-        ]
-        value_link = db.PersonalValue(
-            **pv_input,
-            personal_aspects=aspect_links,
-            user_id=unique_db_user['id'],
-        )
-        sorted_aspect_ids = set([a.aspect_id for a in aspect_links])
-        for uv in db_unique_values:
-            if (
-                uv.value_id == pv_input['value_id']
-                and set(uv.aspect_ids) == sorted_aspect_ids
-            ):
-                value_link.unique_value_id = uv.id
-                break
-        else:
-            raise exc.ServerError(
-                f'UniqueValue not fount for {value_link.value_id=}, '
-                f'aspect_ids={sorted_aspect_ids}'
-            )
-        personal_values.append(value_link)
-    asession_fixture.add_all(personal_values)
-    await asession_fixture.commit()
     return unique_db_user
@@ -8,7 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import crud, db
 from src.config import CFG
-from src.services.utils import generate_random_personal_values
+from src.services.utils import (
+    generate_random_personal_values,
+    unpack_personal_values,
+)
 
 
 async def test_get_profile(client, unique_db_user):
@@ -110,11 +113,16 @@ async def check_personal_values(
         select(db.Profile).where(db.Profile.user_id == user_id)
     )
     assert db_profile is not None
-    db_personal_values_result = await crud.read_personal_values(
+    pack_n_recommend_me = await crud.read_personal_values_pack(
         user_id=user_id, asession=asession
     )
-    assert db_personal_values_result is not None
-    db_personal_values = list(db_personal_values_result)
+    assert pack_n_recommend_me is not None
+    pack, _ = pack_n_recommend_me
+    definitions = await crud.read_cached_definitions(asession=asession)
+    lan_definitions = definitions.by_language[CFG.DEFAULT_LANGUAGE]
+    db_personal_values = unpack_personal_values(
+        pack=pack, definitions=definitions
+    )
     assert len(db_personal_values) == CFG.PERSONAL_VALUE_MAX_ORDER
     for ind in range(CFG.PERSONAL_VALUE_MAX_ORDER):
         sent_pv = sent_personal_values[ind]
@@ -124,7 +132,10 @@ async def check_personal_values(
         assert 'value_name' in returned_pv
         assert 'polarity' in returned_pv
         assert sent_pv['value_id'] == returned_pv['value_id'] == db_pv.value_id
-        assert returned_pv['value_name'] == db_pv.value.name
+        assert (
+            returned_pv['value_name']
+            == lan_definitions.values_by_id[db_pv.value_id].name
+        )
         assert sent_pv['polarity'] == returned_pv['polarity'] == db_pv.polarity
         assert (
             sent_pv['user_order']
@@ -0,0 +1,108 @@
+import pytest
+
+from src import crud
+from src import exceptions as exc
+from src import schemas as sch
+from src.config.config import CFG
+from src.services.utils.moral_profile import (
+    PersonalValuesInputChecker,
+    pack_personal_values,
+    unpack_personal_values,
+)
+from src.services.utils.other import generate_random_personal_values
+
+
+async def test_pack_unpack_personal_values(asession_fixture):
+    definitions = await crud.read_cached_definitions(asession=asession_fixture)
+    for _ in range(CFG.RANDOM_PV_TEST_ATTEMPTS):
+        input_data = await generate_random_personal_values(
+            asession=asession_fixture
+        )
+        p_v_model = sch.PersonalValuesCreateUpdate.model_validate(input_data)
+        pack = pack_personal_values(
+            attitude_id=p_v_model.attitude_id,
+            value_links=p_v_model.value_links,
+            definitions=definitions,
+        )
+        assert len(pack.value_ids) == CFG.PERSONAL_VALUE_MAX_ORDER
+        assert len(pack.unique_value_ids) == CFG.PERSONAL_VALUE_MAX_ORDER
+        assert pack.positive_count + pack.neutral_count <= len(pack.value_ids)
+        assert 0 <= pack.aspect_mask < 1 << 63
+        unpacked = unpack_personal_values(pack=pack, definitions=definitions)
+        for expected, actual in zip(p_v_model.value_links, unpacked):
+            assert actual.value_id == expected.value_id
+            assert actual.polarity == expected.polarity
+            assert actual.user_order == expected.user_order
+            assert sorted(
+                (a.aspect_id, a.included) for a in actual.aspects
+            ) == sorted((a.aspect_id, a.included) for a in expected.aspects)
+
+
+async def _checker_and_input(
+    asession,
+) -> tuple[PersonalValuesInputChecker, sch.PersonalValuesCreateUpdate]:
+    definitions = await crud.read_cached_definitions(asession=asession)
+    input_data = await generate_random_personal_values(asession=asession)
+    return (
+        PersonalValuesInputChecker.from_definitions(definitions),
+        sch.PersonalValuesCreateUpdate.model_validate(input_data),
+    )
+
+
+async def test_input_checker_accepts_valid_input(asession_fixture):
+    checker, p_v_model = await _checker_and_input(asession_fixture)
+    p_v_model.value_links.reverse()
+    checker.check(p_v_model)
+    assert [vl.user_order for vl in p_v_model.value_links] == list(
+        range(1, CFG.PERSONAL_VALUE_MAX_ORDER + 1)
+    )
+
+
+async def test_input_checker_rejects_missing_value(asession_fixture):
+    checker, p_v_model = await _checker_and_input(asession_fixture)
+    p_v_model.value_links.pop()
+    with pytest.raises(exc.BadRequest):
+        checker.check(p_v_model)
+
+
+async def test_input_checker_rejects_duplicate_value(asession_fixture):
+    checker, p_v_model = await _checker_and_input(asession_fixture)
+    value_links = p_v_model.value_links
+    value_links[-1].value_id = value_links[0].value_id
+    with pytest.raises(exc.BadRequest):
+        checker.check(p_v_model)
+
+
+async def test_input_checker_rejects_foreign_aspect(asession_fixture):
+    checker, p_v_model = await _checker_and_input(asession_fixture)
+    value_links = p_v_model.value_links
+    value_links[0].aspects[0].aspect_id = value_links[1].aspects[0].aspect_id
+    with pytest.raises(exc.BadRequest):
+        checker.check(p_v_model)
+
+
+async def test_input_checker_rejects_duplicate_aspect(asession_fixture):
+    checker, p_v_model = await _checker_and_input(asession_fixture)
+    aspects = p_v_model.value_links[0].aspects
+    aspects.append(aspects[0].model_copy())
+    with pytest.raises(exc.BadRequest):
+        checker.check(p_v_model)
+
+
+async def test_input_checker_rejects_polarity_out_of_order(
+    asession_fixture,
+):
+    checker, p_v_model = await _checker_and_input(asession_fixture)
+    p_v_model.value_links[0].polarity = 'negative'
+    p_v_model.value_links[-1].polarity = 'positive'
+    with pytest.raises(exc.BadRequest):
+        checker.check(p_v_model)
+
+
+async def test_input_checker_rejects_non_sequential_user_order(
+    asession_fixture,
+):
+    checker, p_v_model = await _checker_and_input(asession_fixture)
+    p_v_model.value_links[1].user_order = 1
+    with pytest.raises(exc.BadRequest):
+        checker.check(p_v_model)
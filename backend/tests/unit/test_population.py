@@ -0,0 +1,99 @@
+import random
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+
+from src import containers as cnt
+from src import crud, db
+from src.config.config import CFG
+from src.services._population import generate_population_batch
+from src.services.utils.moral_profile import unpack_personal_values
+
+
+async def test_generate_population_batch(asession_fixture):
+    definitions = await crud.read_cached_definitions(asession=asession_fixture)
+    config = cnt.PopulationConfig(users=50, contacts_per_user=4, seed=1)
+    batch = generate_population_batch(
+        config=config,
+        definitions=definitions,
+        first_index=0,
+        size=config.users,
+        password_hash='hash',
+        rng=random.Random(config.seed),
+    )
+    assert len(batch.users) == config.users
+    assert len({user[1] for user in batch.users}) == config.users
+    assert len(batch.profiles) == len(batch.userdynamics) == config.users
+    assert len(batch.packs) == config.users
+    assert len(batch.personal_values) == (
+        config.users * CFG.PERSONAL_VALUE_MAX_ORDER
+    )
+    personal_values = {(pv[0], pv[1]): pv for pv in batch.personal_values}
+    included_aspects = {(pa[0], pa[2]): pa[3] for pa in batch.personal_aspects}
+    for pack_record in batch.packs:
+        user_id = pack_record[0]
+        pack = cnt.PersonalValuesPack(
+            attitude_id=pack_record[1],
+            value_ids=tuple(pack_record[2]),
+            unique_value_ids=tuple(pack_record[3]),
+            positive_count=pack_record[4],
+            neutral_count=pack_record[5],
+            aspect_mask=pack_record[6],
+        )
+        for value_link in unpack_personal_values(
+            pack=pack, definitions=definitions
+        ):
+            personal_value = personal_values[(user_id, value_link.value_id)]
+            assert personal_value[3] == value_link.polarity
+            assert personal_value[4] == value_link.user_order
+            for aspect in value_link.aspects:
+                assert (
+                    included_aspects[(user_id, aspect.aspect_id)]
+                    == aspect.included
+                )
+    contact_pairs = {(c[0], c[1]) for c in batch.contacts}
+    assert all((b, a) in contact_pairs for a, b in contact_pairs)
+    assert all(a != b for a, b in contact_pairs)
+
+
+async def test_copy_population_batch(asession_fixture):
+    definitions = await crud.read_cached_definitions(asession=asession_fixture)
+    config = cnt.PopulationConfig(
+        users=5,
+        contacts_per_user=2,
+        email_prefix=f'population{uuid4().hex[:8]}',
+        seed=1,
+    )
+    batch = generate_population_batch(
+        config=config,
+        definitions=definitions,
+        first_index=0,
+        size=config.users,
+        password_hash='hash',
+        rng=random.Random(config.seed),
+    )
+    user_ids = [user[0] for user in batch.users]
+    try:
+        await crud.copy_population_batch(
+            batch=batch, asession=asession_fixture
+        )
+        await asession_fixture.commit()
+        for user_id_column, expected in (
+            (db.User.id, config.users),
+            (db.Profile.user_id, config.users),
+            (db.UserDynamic.user_id, config.users),
+            (db.PersonalValue.user_id, len(batch.personal_values)),
+            (db.PersonalAspect.user_id, len(batch.personal_aspects)),
+            (db.PersonalValuesPack.user_id, config.users),
+            (db.Contact.my_user_id, len(batch.contacts)),
+        ):
+            count = await asession_fixture.scalar(
+                select(func.count()).where(user_id_column.in_(user_ids))
+            )
+            assert count == expected, user_id_column
+    finally:
+        await asession_fixture.rollback()
+        await asession_fixture.execute(
+            delete(db.User).where(db.User.id.in_(user_ids))
+        )
+        await asession_fixture.commit()
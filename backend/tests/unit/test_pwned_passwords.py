@@ -0,0 +1,66 @@
+import hashlib
+
+import pytest
+
+from src.pwned_passwords import (
+    PwnedPasswordsIndex,
+    build_pwned_passwords_index,
+)
+
+
+def _sha1(password: str) -> bytes:
+    return hashlib.sha1(password.encode('utf-8')).digest()
+
+
+def test_pwned_passwords_index(tmp_path):
+    counts = {f'password{i}': i % 3 + 1 for i in range(100)}
+    source = tmp_path / 'pwned.txt'
+    source.write_text(
+        '\r\n'.join(
+            f'{_sha1(password).hex().upper()}:{count}'
+            for password, count in sorted(
+                counts.items(), key=lambda item: _sha1(item[0])
+            )
+        )
+    )
+    target = tmp_path / 'pwned.bin'
+    written = build_pwned_passwords_index(
+        source=source, target=target, min_count=2
+    )
+    assert written == sum(count >= 2 for count in counts.values())
+    index = PwnedPasswordsIndex(target)
+    try:
+        assert index.size == written
+        for password, count in counts.items():
+            assert (_sha1(password) in index) == (count >= 2)
+        assert _sha1('not-pwned') not in index
+        assert b'\x00' * 20 not in index
+        assert b'\xff' * 20 not in index
+    finally:
+        index.close()
+
+
+def test_pwned_passwords_index_unsorted(tmp_path):
+    source = tmp_path / 'pwned.txt'
+    source.write_text(
+        '\n'.join(
+            f'{_sha1(password).hex().upper()}:1'
+            for password in sorted(('a', 'b', 'c'), key=_sha1, reverse=True)
+        )
+    )
+    with pytest.raises(ValueError):
+        build_pwned_passwords_index(
+            source=source, target=tmp_path / 'pwned.bin'
+        )
+
+
+def test_pwned_passwords_index_empty(tmp_path):
+    source = tmp_path / 'pwned.txt'
+    source.write_text(f'{_sha1("password").hex().upper()}:1')
+    target = tmp_path / 'pwned.bin'
+    with pytest.raises(ValueError):
+        build_pwned_passwords_index(source=source, target=target, min_count=2)
+    assert not target.exists()
+    target.touch()
+    with pytest.raises(ValueError):
+        PwnedPasswordsIndex(target)
@@ -0,0 +1,70 @@
+from uuid import uuid4
+
+import pytest
+
+from src.config.config import CFG
+from src.sessions import ReplicaRouter, replica_router
+
+PRIMARY, REPLICA = 'primary', 'replica'  # factories are only returned
+
+
+async def test_replica_router_lag(monkeypatch):
+    router = ReplicaRouter(
+        replica_factory=REPLICA,  # type: ignore
+        primary_factory=PRIMARY,  # type: ignore
+        max_lag_seconds=5,
+        check_every_seconds=0,
+    )
+    lags = iter((1.0, 10.0, ConnectionError()))
+
+    async def read_lag():
+        lag = next(lags)
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+    monkeypatch.setattr(router, '_read_lag', read_lag)
+    assert await router.choose() == REPLICA
+    assert await router.choose() == PRIMARY
+    assert await router.choose() == PRIMARY
+    assert router.lag_seconds is None
+
+
+async def test_replica_router_without_replica():
+    router = ReplicaRouter(
+        replica_factory=None,
+        primary_factory=PRIMARY,  # type: ignore
+        max_lag_seconds=5,
+        check_every_seconds=0,
+    )
+    assert await router.choose() == PRIMARY
+
+
+async def test_replica_router_read_your_writes(monkeypatch):
+    router = ReplicaRouter(
+        replica_factory=REPLICA,  # type: ignore
+        primary_factory=PRIMARY,  # type: ignore
+        max_lag_seconds=5,
+        check_every_seconds=0,
+    )
+
+    async def read_lag():
+        return 0.0
+
+    monkeypatch.setattr(router, '_read_lag', read_lag)
+    user_id, contact_id, other_user_id = uuid4(), uuid4(), uuid4()
+    assert await router.choose(user_id) == REPLICA
+    await router.mark_users_wrote(user_id, contact_id)
+    assert await router.choose(user_id) == PRIMARY
+    assert await router.choose(contact_id) == PRIMARY
+    assert await router.choose(other_user_id) == REPLICA
+    assert await router.choose() == REPLICA
+
+
+@pytest.mark.skipif(
+    CFG.ASYNC_REPLICA_DATABASE_URL is None,
+    reason='POSTGRES_REPLICA_HOST not set.',
+)
+async def test_replica_lag_check():
+    assert await replica_router.replica_usable()
+    assert 0 <= replica_router.lag_seconds <= CFG.REPLICA_MAX_LAG_SECONDS
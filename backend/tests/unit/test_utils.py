@@ -1,8 +1,24 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
 from sqlalchemy import select
 
+from src import containers as cnt
+from src.config import ENM
 from src.config.config import CFG
 from src.db.core import Attitude, Value
 from src.services.utils.other import generate_random_personal_values
+from src.services.utils import user as user_utils
+from src.services.utils.cache import (
+    get_or_cache_response,
+    invalidate_cached_responses,
+)
+from src.services.utils.user import (
+    create_access_token,
+    create_refresh_token,
+    decode_access_token_principal,
+    hash_refresh_token,
+)
 
 
 async def test_random_pv_input_generation(asession_fixture):
@@ -50,3 +66,66 @@ async def test_random_pv_input_generation(asession_fixture):
         assert input_personal_value_orders == set(
             range(1, CFG.PERSONAL_VALUE_MAX_ORDER + 1)
         )
+
+
+def test_access_token_principal_claims():
+    user_id = uuid4()
+    token = create_access_token(user_id, is_active=True, is_verified=False)
+    assert decode_access_token_principal(token) == (
+        user_id,
+        cnt.Principal(id=user_id, is_active=True, is_verified=False),
+    )
+    assert decode_access_token_principal(create_access_token(user_id)) == (
+        user_id,
+        None,
+    )
+
+
+def test_refresh_token_hash():
+    token, db_token = create_refresh_token(
+        user_id=uuid4(), now=datetime.now(timezone.utc)
+    )
+    assert db_token.token_hash == hash_refresh_token(token)
+    assert len(db_token.token_hash) == 64
+    assert hash_refresh_token(token + 'x') != db_token.token_hash
+
+
+async def test_password_strength_cached(monkeypatch):
+    scored = []
+
+    def score_password(password, email):
+        scored.append(password)
+        return 4, []
+
+    monkeypatch.setattr(user_utils, '_score_password', score_password)
+    for _ in range(2):
+        assert await user_utils._get_password_strength(
+            password='correct horse battery staple', email='a@example.com'
+        ) == (4, [])
+    assert len(scored) == 1
+    assert not any(
+        b'correct horse' in key for key in user_utils._password_strength_cache
+    )
+
+
+async def test_response_invalidated_while_building_not_cached():
+    user_id = uuid4()
+    kind = ENM.CachedResponse.BOOTSTRAP
+
+    async def build_invalidated() -> bytes:
+        await invalidate_cached_responses(user_id)
+        return b'stale'
+
+    async def build() -> bytes:
+        return b'fresh'
+
+    assert await get_or_cache_response(
+        user_id=user_id, kind=kind, build=build_invalidated
+    ) == (b'stale', False)
+    assert await get_or_cache_response(
+        user_id=user_id, kind=kind, build=build
+    ) == (b'fresh', False)
+    assert await get_or_cache_response(
+        user_id=user_id, kind=kind, build=build
+    ) == (b'fresh', True)
+    await invalidate_cached_responses(user_id)